@@ -3,6 +3,7 @@
 Public surface kept small:
 - __version__
 - a convenience `phase()` wrapper around svphaser.phasing.io.phase_vcf()
+- in-memory `phase_records()` / `iter_phase_records()` returning pandas frames
 
 Versioning:
 - Primary: installed package metadata (works for wheels and PEP 660 editables).
@@ -14,7 +15,12 @@ file at runtime.
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 try:
     # Python 3.8+: preferred source for installed distributions
@@ -88,8 +94,11 @@ def phase(
     (out_vcf_path, out_csv_path)
     """
     # Local import avoids heavy deps at import-time
+    from .phasing._options import EvidenceOptions
     from .phasing.io import phase_vcf
 
+    evidence = EvidenceOptions.pick(locals())
+
     out_dir_p = Path(out_dir)
     out_dir_p.mkdir(parents=True, exist_ok=True)
 
@@ -106,26 +115,85 @@ def phase(
         Path(sv_vcf),
         Path(bam),
         out_dir=out_dir_p,
-        min_support=min_support,
-        min_tagged_support=min_tagged_support,
-        major_delta=major_delta,
-        equal_delta=equal_delta,
-        gq_bins=gq_bins,
-        support_mode=support_mode,
-        bp_window=bp_window,
-        dynamic_window=dynamic_window,
-        tie_to_hom_alt=tie_to_hom_alt,
+        evidence=evidence,
         svp_info=svp_info,
         threads=threads,
-        size_match_required=size_match_required,
-        size_tol_abs=size_tol_abs,
-        size_tol_frac=size_tol_frac,
     )
     return out_vcf, out_csv
 
 
+def iter_phase_records(
+    sv_vcf: Path | str,
+    bam: Path | str,
+    /,
+    *,
+    min_support: int = DEFAULT_MIN_SUPPORT,
+    min_tagged_support: int = DEFAULT_MIN_TAGGED_SUPPORT,
+    major_delta: float = DEFAULT_MAJOR_DELTA,
+    equal_delta: float = DEFAULT_EQUAL_DELTA,
+    gq_bins: str = DEFAULT_GQ_BINS,
+    support_mode: str = DEFAULT_SUPPORT_MODE,
+    bp_window: int = DEFAULT_BP_WINDOW,
+    dynamic_window: bool = DEFAULT_DYNAMIC_WINDOW,
+    tie_to_hom_alt: bool = DEFAULT_TIE_TO_HOM_ALT,
+    threads: int | None = None,
+    size_match_required: bool = True,
+    size_tol_abs: int = 10,
+    size_tol_frac: float = 0.0,
+    ordered: bool = True,
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """Phase *sv_vcf* in memory, yielding ``(contig, frame)`` as contigs finish.
+
+    No files are written.  Frames have the columns of ``<stem>_phased.csv``
+    plus a boolean ``kept`` column (False: below ``min_support``, i.e. what
+    `phase()` writes to ``_dropped_svs.csv``).  Frames come in VCF header
+    order; pass ``ordered=False`` to get each contig the moment it completes.
+    """
+    from .phasing._options import EvidenceOptions
+    from .phasing.io import iter_phase_records as _iter_phase_records
+
+    evidence = EvidenceOptions.pick(locals())
+    return _iter_phase_records(
+        Path(sv_vcf), Path(bam), evidence=evidence, threads=threads, ordered=ordered
+    )
+
+
+def phase_records(
+    sv_vcf: Path | str,
+    bam: Path | str,
+    /,
+    *,
+    min_support: int = DEFAULT_MIN_SUPPORT,
+    min_tagged_support: int = DEFAULT_MIN_TAGGED_SUPPORT,
+    major_delta: float = DEFAULT_MAJOR_DELTA,
+    equal_delta: float = DEFAULT_EQUAL_DELTA,
+    gq_bins: str = DEFAULT_GQ_BINS,
+    support_mode: str = DEFAULT_SUPPORT_MODE,
+    bp_window: int = DEFAULT_BP_WINDOW,
+    dynamic_window: bool = DEFAULT_DYNAMIC_WINDOW,
+    tie_to_hom_alt: bool = DEFAULT_TIE_TO_HOM_ALT,
+    threads: int | None = None,
+    size_match_required: bool = True,
+    size_tol_abs: int = 10,
+    size_tol_frac: float = 0.0,
+) -> pd.DataFrame:
+    """Phase *sv_vcf* in memory and return the full result table.
+
+    Same rows and columns as `iter_phase_records()`, concatenated in VCF
+    order; ``df[df.kept]`` matches what `phase()` writes to
+    ``<stem>_phased.csv``.
+    """
+    from .phasing._options import EvidenceOptions
+    from .phasing.io import phase_records as _phase_records
+
+    evidence = EvidenceOptions.pick(locals())
+    return _phase_records(Path(sv_vcf), Path(bam), evidence=evidence, threads=threads)
+
+
 __all__ = [
     "phase",
+    "phase_records",
+    "iter_phase_records",
     "__version__",
     "DEFAULT_MIN_SUPPORT",
     "DEFAULT_MIN_TAGGED_SUPPORT",
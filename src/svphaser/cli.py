@@ -18,7 +18,7 @@ Patched to expose stricter DEL/INS size-consistency controls:
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Any
 
 import typer
 
@@ -55,6 +55,79 @@ def main(
     return
 
 
+def _check_record_selection(
+    shard_plan: Path | None,
+    regions: str | None,
+    exclude_regions: str | None,
+    chrom: list[str] | None,
+    include: str | None,
+    filtered: str,
+    *,
+    cohort: bool = False,
+) -> list[str] | None:
+    """Validate region/contig/filter options; return the --chrom list, split on commas."""
+    if shard_plan is not None and (regions or exclude_regions or chrom):
+        raise typer.BadParameter(
+            "--regions/--exclude-regions/--chrom cannot be combined with --shard-plan."
+        )
+    if filtered not in {"drop", "pass"}:
+        raise typer.BadParameter(f"--filtered must be 'drop' or 'pass', got '{filtered}'.")
+    if include is not None:
+        from svphaser.phasing._filters import RecordFilter
+
+        try:
+            record_filter = RecordFilter(include)
+            if cohort:
+                record_filter.check_cohort()
+        except ValueError as err:
+            raise typer.BadParameter(str(err)) from err
+    return [c for arg in chrom for c in arg.split(",") if c] if chrom else None
+
+
+def _check_cohort(bam: Path | None, sample_bams: Path | None, **single_only: object) -> None:
+    """Cohort mode needs --sample-bams instead of BAM and no single-sample-only options."""
+    if (bam is None) == (sample_bams is None):
+        raise typer.BadParameter("Give either a BAM or --sample-bams.")
+    if sample_bams is not None:
+        used = [name for name, value in single_only.items() if value not in (None, False)]
+        if used:
+            flags = ", ".join("--" + name.replace("_", "-") for name in used)
+            raise typer.BadParameter(f"{flags} cannot be combined with --sample-bams.")
+
+
+def _check_dependent_options(
+    work_dir: Path | None, resume: bool, adaptive: bool, min_threads: int | None
+) -> None:
+    """Options that only make sense together with another one."""
+    if resume and work_dir is None:
+        raise typer.BadParameter("--resume needs --work-dir.")
+    if min_threads is not None and not adaptive:
+        raise typer.BadParameter("--min-threads needs --adaptive.")
+
+
+def _vcf_stem(vcf: Path) -> str:
+    return vcf.name.removesuffix(".vcf.gz").removesuffix(".vcf")
+
+
+def _check_also_vcf(also_vcf: list[Path] | None, **single_only: object) -> None:
+    """--also-vcf shares one read scan, so it takes only the options every VCF shares."""
+    if also_vcf:
+        used = [name for name, value in single_only.items() if value not in (None, False)]
+        if used:
+            flags = ", ".join("--" + name.replace("_", "-") for name in used)
+            raise typer.BadParameter(f"{flags} cannot be combined with --also-vcf.")
+
+
+def _check_preview(sample_fraction: float | None, sample_n: int | None, **options: object) -> None:
+    """A preview run writes only its report; refuse *options* that act on full runs."""
+    if sample_fraction is not None and sample_n:
+        raise typer.BadParameter("Use one of --sample-fraction/--sample-n.")
+    used = [name for name, value in options.items() if value not in (None, False)]
+    if used:
+        flags = ", ".join("--" + name.replace("_", "-") for name in used)
+        raise typer.BadParameter(f"{flags} cannot be combined with --sample-fraction/--sample-n.")
+
+
 @app.command("phase")
 def phase_cmd(
     sv_vcf: Annotated[
@@ -65,12 +138,12 @@ def phase_cmd(
         ),
     ],
     bam: Annotated[
-        Path,
+        Path | None,
         typer.Argument(
             exists=True,
-            help="Long-read BAM/CRAM with HP tags",
+            help="Long-read BAM/CRAM with HP tags (omit with --sample-bams)",
         ),
-    ],
+    ] = None,
     out_dir: Annotated[
         Path,
         typer.Option(
@@ -227,20 +300,233 @@ def phase_cmd(
             show_default=True,
         ),
     ] = DEFAULT_GQ_BINS,
+    # ---------- region selection ------------------------------------------
+    regions: Annotated[
+        str | None,
+        typer.Option(
+            "--regions",
+            help=(
+                "Phase only SVs overlapping these regions: a BED file or a list like "
+                "'chr1:1000-2000,chr2'. Uses the VCF index when present."
+            ),
+        ),
+    ] = None,
+    exclude_regions: Annotated[
+        str | None,
+        typer.Option(
+            "--exclude-regions",
+            help="Skip SVs with a breakpoint in these regions (BED file or region list).",
+        ),
+    ] = None,
+    chrom: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--chrom",
+            help="Phase only these contigs (repeatable or comma-separated).",
+        ),
+    ] = None,
+    include: Annotated[
+        str | None,
+        typer.Option(
+            "--include",
+            help=(
+                "Phase only records matching this expression, checked before any BAM "
+                "work, e.g. \"FILTER=='PASS' && abs(SVLEN)>=50 && GT!='0/0'\"."
+            ),
+        ),
+    ] = None,
+    filtered: Annotated[
+        str,
+        typer.Option(
+            "--filtered",
+            help="Records failing --include: 'drop' them, or 'pass' them through unphased.",
+            show_default=True,
+        ),
+    ] = "drop",
+    # ---------- preview ---------------------------------------------------
+    sample_fraction: Annotated[
+        float | None,
+        typer.Option(
+            "--sample-fraction",
+            min=0.0,
+            max=1.0,
+            help=(
+                "Preview: phase a deterministic, stratified fraction of SVs and write "
+                "<stem>_preview.json (reason codes, tag_frac, estimated full-run cost)."
+            ),
+        ),
+    ] = None,
+    sample_n: Annotated[
+        int | None,
+        typer.Option(
+            "--sample-n",
+            min=1,
+            help="Preview on this many SVs instead of a fraction.",
+        ),
+    ] = None,
+    # ---------- several call sets -----------------------------------------
+    also_vcf: Annotated[
+        list[Path] | None,
+        typer.Option(
+            "--also-vcf",
+            exists=True,
+            dir_okay=False,
+            help=(
+                "Another SV VCF to phase against the same BAM (repeatable). All VCFs share "
+                "one read scan; each gets its own <stem>_phased.* outputs."
+            ),
+        ),
+    ] = None,
+    # ---------- cohort ----------------------------------------------------
+    sample_bams: Annotated[
+        Path | None,
+        typer.Option(
+            "--sample-bams",
+            exists=True,
+            dir_okay=False,
+            help=(
+                "Cohort mode: TSV of 'sample<TAB>bam' lines. Phases every mapped sample of "
+                "a multi-sample VCF (only where its genotype is non-reference) in one run."
+            ),
+        ),
+    ] = None,
     # ---------- multiprocessing -------------------------------------------
     threads: Annotated[
         int | None,
         typer.Option(
             "-t",
             "--threads",
-            help="Worker processes to use (defaults to all CPU cores).",
+            help="Worker processes to use (default: usable CPUs within cgroup limits).",
+            show_default=True,
+        ),
+    ] = None,
+    adaptive: Annotated[
+        bool,
+        typer.Option(
+            "--adaptive",
+            is_flag=True,
+            help=(
+                "Run contigs as row shards and tune how many run at once (up to "
+                "--threads) from throughput and I/O wait as shards complete."
+            ),
+        ),
+    ] = False,
+    min_threads: Annotated[
+        int | None,
+        typer.Option(
+            "--min-threads",
+            min=1,
+            help="Lower bound for --adaptive (default 1).",
+        ),
+    ] = None,
+    # ---------- scheduling ------------------------------------------------
+    metrics: Annotated[
+        Path | None,
+        typer.Option(
+            "--metrics",
+            dir_okay=False,
+            help="Write per-task timings and cost features (TSV) to this path.",
+        ),
+    ] = None,
+    cost_model: Annotated[
+        Path | None,
+        typer.Option(
+            "--cost-model",
+            exists=True,
+            dir_okay=False,
+            help=(
+                "Metrics TSV from an earlier --metrics run; per-SVTYPE cost "
+                "coefficients are learned from it to order tasks longest-first."
+            ),
+        ),
+    ] = None,
+    max_memory: Annotated[
+        str | None,
+        typer.Option(
+            "--max-memory",
+            help=(
+                "Bound the parent's working set (e.g. 4G): spill pending results "
+                "to disk and stream outputs in chunks."
+            ),
+        ),
+    ] = None,
+    # ---------- checkpointing ---------------------------------------------
+    work_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--work-dir",
+            file_okay=False,
+            help="Checkpoint each finished task here so an interrupted run can --resume.",
+        ),
+    ] = None,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            is_flag=True,
+            help="Reuse checkpoints in --work-dir from an earlier run with the same inputs.",
+        ),
+    ] = False,
+    retries: Annotated[
+        int,
+        typer.Option(
+            "--retries",
+            min=0,
+            help="Retry a failed task this many times before aborting the run.",
             show_default=True,
         ),
+    ] = 0,
+    previous: Annotated[
+        Path | None,
+        typer.Option(
+            "--previous",
+            exists=True,
+            dir_okay=False,
+            help=(
+                "<stem>_phased.csv of an earlier run with the same BAM and options: "
+                "reuse its results and phase only new or changed SVs. The earlier run "
+                "needs --write-manifest."
+            ),
+        ),
+    ] = None,
+    write_manifest: Annotated[
+        bool,
+        typer.Option(
+            "--write-manifest",
+            is_flag=True,
+            help=(
+                "Also write <stem>_run.json (parameter hash, BAM fingerprint, per-record "
+                "evidence digests) so a later run can use this one as --previous."
+            ),
+        ),
+    ] = False,
+    # ---------- multi-node ------------------------------------------------
+    shard_plan: Annotated[
+        Path | None,
+        typer.Option(
+            "--shard-plan",
+            exists=True,
+            dir_okay=False,
+            help="Shard plan written by `svphaser scatter` (use with --shard).",
+        ),
+    ] = None,
+    shard: Annotated[
+        int | None,
+        typer.Option(
+            "--shard",
+            min=0,
+            help=(
+                "Phase only this shard (0-based) of --shard-plan into partial "
+                "outputs for `svphaser gather`."
+            ),
+        ),
     ] = None,
 ) -> None:
     """Phase structural variants using SV-type-aware ALT-support evidence."""
     from svphaser.logging import init as _init_logging
+    from svphaser.phasing._options import EvidenceOptions
 
+    evidence = EvidenceOptions.pick(locals())
     _init_logging("INFO")
 
     # Fail fast on invalid support mode instead of letting it drift downstream.
@@ -255,43 +541,414 @@ def phase_cmd(
         raise typer.BadParameter("--size-tol-abs must be >= 0.")
     if size_tol_frac < 0:
         raise typer.BadParameter("--size-tol-frac must be >= 0.")
+    if (shard_plan is None) != (shard is None):
+        raise typer.BadParameter("--shard and --shard-plan must be given together.")
+    _check_dependent_options(work_dir, resume, adaptive, min_threads)
+    chroms = _check_record_selection(
+        shard_plan,
+        regions,
+        exclude_regions,
+        chrom,
+        include,
+        filtered,
+        cohort=sample_bams is not None,
+    )
+    single_only: dict[str, Any] = dict(
+        shard_plan=shard_plan,
+        work_dir=work_dir,
+        max_memory=max_memory,
+        metrics=metrics,
+        cost_model=cost_model,
+        sample_fraction=sample_fraction,
+        sample_n=sample_n,
+        previous=previous,
+        write_manifest=write_manifest,
+        adaptive=adaptive,
+        min_threads=min_threads,
+    )
+    _check_cohort(bam, sample_bams, also_vcf=also_vcf or None, **single_only)
+    _check_also_vcf(also_vcf, **single_only)
+    preview = sample_fraction is not None or sample_n is not None
+    if preview:
+        _check_preview(
+            sample_fraction,
+            sample_n,
+            shard_plan=shard_plan,
+            work_dir=work_dir,
+            resume=resume,
+            previous=previous,
+            max_memory=max_memory,
+            write_manifest=write_manifest,
+        )
 
     if not out_dir.exists():
         out_dir.mkdir(parents=True)
 
-    stem = sv_vcf.name
-    if stem.endswith(".vcf.gz"):
-        stem = stem[:-7]
-    elif stem.endswith(".vcf"):
-        stem = stem[:-4]
-
-    out_vcf = out_dir / f"{stem}_phased.vcf"
-    out_csv = out_dir / f"{stem}_phased.csv"
+    stem = _vcf_stem(sv_vcf)
 
-    from svphaser.phasing.io import phase_vcf
+    if shard is not None:
+        stem = f"{stem}.shard-{shard:04d}"
 
+    common: dict[str, Any] = dict(
+        out_dir=out_dir,
+        evidence=evidence,
+        svp_info=svp_info,
+        threads=threads,
+        retries=retries,
+        regions=regions,
+        exclude_regions=exclude_regions,
+        chroms=chroms,
+        include=include,
+        filtered=filtered,
+    )
+    single_only["metrics_tsv"] = single_only.pop("metrics")
+    single_only["min_threads"] = min_threads or 1
     try:
-        phase_vcf(
-            sv_vcf,
-            bam,
-            out_dir=out_dir,
-            min_support=min_support,
-            min_tagged_support=min_tagged_support,
-            major_delta=major_delta,
-            equal_delta=equal_delta,
-            gq_bins=gq_bins,
-            support_mode=support_mode,
-            bp_window=bp_window,
-            dynamic_window=dynamic_window,
-            tie_to_hom_alt=tie_to_hom_alt,
-            svp_info=svp_info,
-            threads=threads,
-            size_match_required=size_match_required,
-            size_tol_abs=size_tol_abs,
-            size_tol_frac=size_tol_frac,
+        _run_phase(
+            sv_vcf, bam, sample_bams, also_vcf, common, shard=shard, resume=resume, **single_only
         )
-        typer.secho(f"✔ Phased VCF → {out_vcf}", fg=typer.colors.GREEN)
-        typer.secho(f"✔ Phased CSV → {out_csv}", fg=typer.colors.GREEN)
+        if preview:
+            typer.secho(
+                f"✔ Preview report → {out_dir / f'{stem}_preview.json'}", fg=typer.colors.GREEN
+            )
+        else:
+            for out_stem in [stem, *map(_vcf_stem, also_vcf or [])]:
+                typer.secho(
+                    f"✔ Phased VCF → {out_dir / f'{out_stem}_phased.vcf'}", fg=typer.colors.GREEN
+                )
+                typer.secho(
+                    f"✔ Phased CSV → {out_dir / f'{out_stem}_phased.csv'}", fg=typer.colors.GREEN
+                )
     except Exception:
         typer.secho("[SvPhaser] 💥  Unhandled error during phasing", fg=typer.colors.RED)
         raise
+
+
+def _run_phase(
+    sv_vcf: Path,
+    bam: Path | None,
+    sample_bams: Path | None,
+    also_vcf: list[Path] | None,
+    common: dict[str, Any],
+    **single: Any,
+) -> None:
+    """Dispatch to cohort, multi-VCF or single-VCF phasing."""
+    from svphaser.phasing.io import phase_cohort, phase_vcf, phase_vcfs
+
+    if sample_bams is not None:
+        phase_cohort(sv_vcf, sample_bams, **common)
+        return
+    assert bam is not None
+    if also_vcf:
+        phase_vcfs([sv_vcf, *also_vcf], bam, **common)
+    else:
+        phase_vcf(sv_vcf, bam, **single, **common)
+
+
+@app.command("batch")
+def batch_cmd(
+    manifest: Annotated[
+        Path,
+        typer.Argument(
+            exists=True,
+            dir_okay=False,
+            help=(
+                "TSV with a header: vcf, bam, out_dir, optional name and per-row option "
+                "columns (e.g. min_support, include)."
+            ),
+        ),
+    ],
+    threads: Annotated[
+        int | None,
+        typer.Option(
+            "-t",
+            "--threads",
+            help="Worker processes shared by all rows (default: usable CPUs within cgroup limits).",
+        ),
+    ] = None,
+    retries: Annotated[
+        int,
+        typer.Option(
+            "--retries",
+            min=0,
+            help="Retry a failed task this many times before aborting the batch.",
+            show_default=True,
+        ),
+    ] = 0,
+) -> None:
+    """Phase many (VCF, BAM) pairs from a manifest on one shared worker pool."""
+    from svphaser.logging import init as _init_logging
+    from svphaser.phasing._options import EvidenceOptions
+    from svphaser.phasing.io import phase_batch
+
+    _init_logging("INFO")
+
+    try:
+        # Rows get the same defaults as `svphaser phase`.
+        evidence = EvidenceOptions(gq_bins=DEFAULT_GQ_BINS)
+        phase_batch(manifest, evidence=evidence, threads=threads, retries=retries)
+    except Exception:
+        typer.secho("[SvPhaser] 💥  Unhandled error during batch phasing", fg=typer.colors.RED)
+        raise
+    typer.secho(f"✔ Batch {manifest} done", fg=typer.colors.GREEN)
+
+
+@app.command("plan")
+def plan_cmd(
+    sv_vcf: Annotated[
+        Path,
+        typer.Argument(exists=True, help="Input SV VCF (.vcf or .vcf.gz)."),
+    ],
+    bam: Annotated[
+        Path,
+        typer.Argument(exists=True, help="Indexed BAM/CRAM (only its index statistics are read)."),
+    ],
+    threads: Annotated[
+        int | None,
+        typer.Option(
+            "-t",
+            "--threads",
+            min=1,
+            help="Worker processes to plan for (default: usable CPUs within cgroup limits).",
+        ),
+    ] = None,
+    cost_model: Annotated[
+        Path | None,
+        typer.Option(
+            "--cost-model",
+            exists=True,
+            dir_okay=False,
+            help="Metrics TSV from an earlier `phase --metrics` run to calibrate the estimates.",
+        ),
+    ] = None,
+    json_out: Annotated[
+        Path | None,
+        typer.Option("--json", dir_okay=False, help="Also write the full plan as JSON here."),
+    ] = None,
+    bp_window: Annotated[
+        int,
+        typer.Option("--bp-window", help="As for `phase`.", show_default=True),
+    ] = 100,
+    dynamic_window: Annotated[
+        bool,
+        typer.Option("--dynamic-window/--fixed-window", help="As for `phase`.", show_default=True),
+    ] = True,
+    regions: Annotated[
+        str | None,
+        typer.Option("--regions", help="As for `phase`."),
+    ] = None,
+    exclude_regions: Annotated[
+        str | None,
+        typer.Option("--exclude-regions", help="As for `phase`."),
+    ] = None,
+    chrom: Annotated[
+        list[str] | None,
+        typer.Option("--chrom", help="As for `phase` (repeatable or comma-separated)."),
+    ] = None,
+    include: Annotated[
+        str | None,
+        typer.Option("--include", help="As for `phase`."),
+    ] = None,
+) -> None:
+    """Estimate run time, memory and worker count without phasing anything."""
+    from svphaser.logging import init as _init_logging
+    from svphaser.phasing._plan import format_plan, make_plan, write_plan
+    from svphaser.phasing._resources import default_threads
+
+    _init_logging("INFO")
+
+    chroms = _check_record_selection(None, regions, exclude_regions, chrom, include, "drop")
+    plan = make_plan(
+        sv_vcf,
+        bam,
+        threads=threads or default_threads(),
+        cost_model=cost_model,
+        bp_window=bp_window,
+        dynamic_window=dynamic_window,
+        regions=regions,
+        exclude_regions=exclude_regions,
+        chroms=chroms,
+        include=include,
+    )
+    typer.echo(format_plan(plan))
+    if json_out is not None:
+        write_plan(json_out, plan)
+
+
+def _parse_bam_specs(specs: list[str]) -> dict[str, Path]:
+    """``NAME=PATH`` (or a bare PATH, named after its stem) → registered BAMs."""
+    bams: dict[str, Path] = {}
+    for spec in specs:
+        name, sep, path = spec.partition("=")
+        bam = Path(path if sep else spec)
+        name = name if sep else bam.stem
+        if not bam.exists():
+            raise typer.BadParameter(f"--bam {spec}: {bam} does not exist.")
+        if name in bams:
+            raise typer.BadParameter(f"--bam name {name!r} is given twice.")
+        bams[name] = bam
+    return bams
+
+
+@app.command("serve")
+def serve_cmd(
+    bam: Annotated[
+        list[str],
+        typer.Option(
+            "--bam",
+            help="BAM/CRAM to keep open, as NAME=PATH or PATH (named after its stem); repeatable.",
+        ),
+    ],
+    host: Annotated[
+        str,
+        typer.Option("--host", help="Interface to listen on.", show_default=True),
+    ] = "127.0.0.1",
+    port: Annotated[
+        int,
+        typer.Option("--port", min=0, help="TCP port to listen on.", show_default=True),
+    ] = 8765,
+    socket_path: Annotated[
+        Path | None,
+        typer.Option(
+            "--socket",
+            dir_okay=False,
+            help="Serve HTTP on this Unix socket instead of a TCP port.",
+        ),
+    ] = None,
+    min_support: Annotated[
+        int, typer.Option(help="As for `phase`.", show_default=True)
+    ] = DEFAULT_MIN_SUPPORT,
+    min_tagged_support: Annotated[int, typer.Option(help="As for `phase`.", show_default=True)] = 3,
+    major_delta: Annotated[
+        float, typer.Option(help="As for `phase`.", show_default=True)
+    ] = DEFAULT_MAJOR_DELTA,
+    equal_delta: Annotated[
+        float, typer.Option(help="As for `phase`.", show_default=True)
+    ] = DEFAULT_EQUAL_DELTA,
+    support_mode: Annotated[
+        str, typer.Option("--support-mode", help="As for `phase`.", show_default=True)
+    ] = "hybrid",
+    bp_window: Annotated[
+        int, typer.Option("--bp-window", help="As for `phase`.", show_default=True)
+    ] = 100,
+    dynamic_window: Annotated[
+        bool,
+        typer.Option("--dynamic-window/--fixed-window", help="As for `phase`.", show_default=True),
+    ] = True,
+    tie_to_hom_alt: Annotated[
+        bool,
+        typer.Option("--tie-to-hom-alt/--tie-to-ambig", help="As for `phase`.", show_default=True),
+    ] = True,
+    size_match_required: Annotated[
+        bool,
+        typer.Option(
+            "--size-match-required/--no-size-match-required",
+            help="As for `phase`.",
+            show_default=True,
+        ),
+    ] = True,
+    size_tol_abs: Annotated[
+        int, typer.Option("--size-tol-abs", min=0, help="As for `phase`.", show_default=True)
+    ] = 10,
+    size_tol_frac: Annotated[
+        float, typer.Option("--size-tol-frac", min=0.0, help="As for `phase`.", show_default=True)
+    ] = 0.0,
+    gq_bins: Annotated[
+        str, typer.Option(help="As for `phase`.", show_default=True)
+    ] = DEFAULT_GQ_BINS,
+) -> None:
+    """Serve single-locus phasing over HTTP with warm BAM handles."""
+    import signal
+
+    from svphaser.logging import init as _init_logging
+    from svphaser.phasing._options import EvidenceOptions
+    from svphaser.phasing._serve import PhasingService, make_server
+
+    opts = EvidenceOptions.pick(locals()).worker_opts()
+    _init_logging("INFO")
+
+    service = PhasingService(_parse_bam_specs(bam), opts)
+    server = make_server(service, host=host, port=port, socket_path=socket_path)
+    where = f"unix:{socket_path}" if socket_path is not None else f"http://{host}:{port}"
+    typer.secho(f"✔ Serving {len(service.bams)} BAM(s) on {where}", fg=typer.colors.GREEN)
+    # Stop on SIGTERM as on Ctrl-C, so the socket file is removed.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+@app.command("scatter")
+def scatter_cmd(
+    sv_vcf: Annotated[
+        Path,
+        typer.Argument(exists=True, help="Input SV VCF (.vcf or .vcf.gz) to split."),
+    ],
+    shards: Annotated[
+        int,
+        typer.Option("--shards", "-n", min=1, help="Number of shards to emit."),
+    ],
+    out: Annotated[
+        Path,
+        typer.Option(
+            "--out",
+            "-o",
+            dir_okay=False,
+            help="Where to write the shard plan (JSON).",
+            show_default=True,
+        ),
+    ] = Path("shards.json"),
+) -> None:
+    """Write a deterministic shard plan for multi-node `phase --shard` runs."""
+    from svphaser.logging import init as _init_logging
+    from svphaser.phasing._shards import make_shard_plan
+
+    _init_logging("INFO")
+
+    plan = make_shard_plan(sv_vcf, shards)
+    out.write_text(plan.to_json())
+    typer.secho(
+        f"✔ Shard plan ({plan.n_shards} shards, {plan.n_records} SVs) → {out}",
+        fg=typer.colors.GREEN,
+    )
+
+
+@app.command("gather")
+def gather_cmd(
+    plan: Annotated[
+        Path,
+        typer.Argument(exists=True, dir_okay=False, help="Shard plan from `svphaser scatter`."),
+    ],
+    out_dir: Annotated[
+        Path,
+        typer.Option(
+            "--out-dir",
+            "-o",
+            file_okay=False,
+            help="Directory for the merged outputs.",
+            show_default=True,
+        ),
+    ] = Path("."),
+    partials: Annotated[
+        list[Path] | None,
+        typer.Option(
+            "--partials",
+            "-p",
+            exists=True,
+            file_okay=False,
+            help="Directories holding partial shard outputs (default: --out-dir).",
+        ),
+    ] = None,
+) -> None:
+    """Merge partial shard outputs into the single-node CSV/VCF files."""
+    from svphaser.logging import init as _init_logging
+    from svphaser.phasing._shards import gather_shards
+
+    _init_logging("INFO")
+
+    gather_shards(plan, out_dir, partials or [])
+    typer.secho(f"✔ Gathered shards → {out_dir}", fg=typer.colors.GREEN)
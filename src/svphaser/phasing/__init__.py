@@ -5,14 +5,27 @@ from __future__ import annotations
 
 import logging
 
+from ._async import aiter_phase_records, aphase_records
+from ._locus import LocusCall, LocusEvaluator, evaluate_locus
+from ._options import EvidenceOptions
 from .algorithms import classify_haplotype, phasing_gq
-from .io import phase_vcf
+from .io import iter_phase_records, phase_cohort, phase_records, phase_vcf, phase_vcfs
 from .types import WorkerOpts
 
 __all__ = [
     "phase_vcf",
+    "phase_vcfs",
+    "phase_records",
+    "iter_phase_records",
+    "aphase_records",
+    "aiter_phase_records",
+    "phase_cohort",
+    "evaluate_locus",
+    "LocusEvaluator",
+    "LocusCall",
     "classify_haplotype",
     "phasing_gq",
+    "EvidenceOptions",
     "WorkerOpts",
 ]
 
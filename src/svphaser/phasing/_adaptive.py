@@ -0,0 +1,166 @@
+"""svphaser.phasing._adaptive
+==========================
+Adaptive worker concurrency (``--adaptive``).
+
+Whether a run is I/O-bound (BAMs on NFS, CRAM) or CPU-bound (dense SVs,
+HiFi depth) depends on the dataset, so a fixed ``--threads`` is often wrong
+in one direction or the other.  In adaptive mode each contig task is split
+into shards of consecutive SV rows (rows are independent, so the shards'
+batches concatenate to the contig's batch) and a pool of ``max_workers``
+processes is started, but only :attr:`ConcurrencyController.target` shards
+are in flight at a time.
+
+After every round (``target`` finished shards) the controller looks at the
+round's throughput (SVs/s, and reads/s from the cost model's estimate) and
+at the shards' CPU fraction (process CPU time over task wall time; the rest
+is I/O wait):
+
+- throughput fell after the last change: undo it, then hold for a round;
+- shards mostly wait on I/O: one more shard in flight;
+- shards are CPU-bound: one step towards one shard per usable core.
+
+Cores that the in-flight shards leave idle go to htslib as BAM
+decompression threads, split evenly between the shards.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ._results import ResultBatch
+from ._svtable import SVTable, SVTableRef, _phase_table_task
+from ._workers import open_worker_bam
+from .types import WorkerOpts
+
+__all__ = ["ConcurrencyController", "shard_rows", "split_shards"]
+
+logger = logging.getLogger(__name__)
+
+# Shard size bounds (SV rows); within them, about this many shards per worker.
+MIN_SHARD_SVS = 64
+MAX_SHARD_SVS = 2_000
+SHARDS_PER_WORKER = 8
+# Below this CPU fraction a shard is treated as waiting on I/O.
+IO_BOUND_CPU_FRACTION = 0.5
+# A change is undone when the next round's throughput falls below this factor.
+_DROP_TOLERANCE = 0.95
+MAX_HTS_THREADS = 4
+
+
+def shard_rows(n_svs: int, max_workers: int) -> int:
+    """Rows per shard for *n_svs* SVs on up to *max_workers* workers."""
+    per_shard = -(-n_svs // (max_workers * SHARDS_PER_WORKER))
+    return min(MAX_SHARD_SVS, max(MIN_SHARD_SVS, per_shard))
+
+
+def split_shards(
+    tasks: Sequence[tuple[str, int, int]], size: int
+) -> list[tuple[str, int, int, int]]:
+    """``(chrom, lo, hi, k)`` shards of at most *size* rows, *k* counting within a contig."""
+    return [
+        (chrom, start, min(start + size, hi), k)
+        for chrom, lo, hi in tasks
+        for k, start in enumerate(range(lo, max(hi, lo + 1), size))
+    ]
+
+
+@dataclass(slots=True)
+class ConcurrencyController:
+    """Shards in flight, adjusted from per-round throughput and CPU fraction."""
+
+    min_workers: int
+    max_workers: int
+    cores: int
+    target: int = 0
+    # (target, SVs/s, reads/s, CPU fraction) per finished round.
+    history: list[tuple[int, float, float, float]] = field(default_factory=list)
+    _started: float = field(default_factory=time.perf_counter)
+    _done: int = 0
+    _svs: int = 0
+    _reads: float = 0.0
+    _task_seconds: float = 0.0
+    _cpu_seconds: float = 0.0
+    _last_rate: float | None = None
+    _last_step: int = 0
+    _hold: bool = False
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.min_workers <= self.max_workers:
+            raise ValueError(
+                f"Adaptive bounds must satisfy 1 <= min ({self.min_workers}) "
+                f"<= max ({self.max_workers})."
+            )
+        if not self.target:
+            self.target = min(self.max_workers, max(self.min_workers, self.cores))
+
+    @property
+    def hts_threads(self) -> int:
+        """htslib threads per BAM handle (1 means none beyond the worker's own)."""
+        spare = max(0, self.cores - self.target) // self.target
+        return 1 + min(MAX_HTS_THREADS, spare)
+
+    def observe(
+        self, n_svs: int, reads: float, seconds: float, cpu_seconds: float, now: float | None = None
+    ) -> None:
+        """Record one finished shard; adjust :attr:`target` when a round is complete."""
+        self._done += 1
+        self._svs += n_svs
+        self._reads += reads
+        self._task_seconds += seconds
+        self._cpu_seconds += cpu_seconds
+        if self._done >= max(2, self.target):
+            self._adjust(time.perf_counter() if now is None else now)
+
+    def _step(self, rate: float, cpu_fraction: float) -> int:
+        if self._hold:
+            self._hold = False
+            return 0
+        if self._last_step and self._last_rate and rate < self._last_rate * _DROP_TOLERANCE:
+            self._hold = True
+            return -self._last_step
+        if cpu_fraction < IO_BOUND_CPU_FRACTION:
+            return 1
+        return int(self.target < self.cores) - int(self.target > self.cores)
+
+    def _adjust(self, now: float) -> None:
+        elapsed = max(now - self._started, 1e-9)
+        rate = self._svs / elapsed
+        cpu_fraction = self._cpu_seconds / self._task_seconds if self._task_seconds else 1.0
+        self.history.append((self.target, rate, self._reads / elapsed, cpu_fraction))
+        step = self._step(rate, cpu_fraction)
+        target = min(self.max_workers, max(self.min_workers, self.target + step))
+        if target != self.target:
+            logger.info(
+                "Adaptive: %d → %d shards in flight (%.0f SVs/s, ~%.0f reads/s, CPU %.0f%%)",
+                self.target,
+                target,
+                rate,
+                self._reads / elapsed,
+                100 * cpu_fraction,
+            )
+        self._last_step = target - self.target
+        self._last_rate = rate
+        self.target = target
+        self._started = now
+        self._done = self._svs = 0
+        self._reads = self._task_seconds = self._cpu_seconds = 0.0
+
+
+def _adaptive_task(
+    hts_threads: int,
+    chrom: str,
+    lo: int,
+    hi: int,
+    table: SVTable | SVTableRef,
+    bam_path: Path,
+    opts: WorkerOpts,
+) -> tuple[str, ResultBatch, float, float]:
+    """Worker entry: :func:`_phase_table_task` plus the process CPU seconds it used."""
+    cpu0 = time.process_time()
+    open_worker_bam(bam_path, threads=hts_threads)
+    chrom, batch, seconds = _phase_table_task(chrom, lo, hi, table, bam_path, opts)
+    return chrom, batch, seconds, time.process_time() - cpu0
@@ -0,0 +1,85 @@
+"""svphaser.phasing._async
+=======================
+asyncio entry points for services that embed SvPhaser.
+
+The engine runs unchanged on a helper thread (which drives the usual worker
+pool), so the event loop is never blocked.  Per-contig frames are handed to
+the loop through a queue as they are produced.  Closing or cancelling the
+consumer sets the run's cancel event: the pool is terminated within
+:data:`~svphaser.phasing.io._CANCEL_POLL_S` (serial runs stop after the
+contig in progress) and the helper thread is joined before control returns.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from .io import _records_table, iter_phase_records
+
+__all__ = ["aiter_phase_records", "aphase_records"]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _Failed:
+    error: BaseException
+
+
+_DONE = object()
+
+
+async def aiter_phase_records(
+    sv_vcf: Path, bam: Path, **options: Any
+) -> AsyncIterator[tuple[str, pd.DataFrame]]:
+    """Async version of :func:`~svphaser.phasing.io.iter_phase_records`.
+
+    Yields ``(contig, frame)`` pairs without blocking the event loop; takes
+    the same *options*.  Errors from the run are re-raised here.  Leaving
+    the ``async for`` early, ``aclose()`` or task cancellation terminates
+    the workers.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[Any] = asyncio.Queue()
+    cancel = threading.Event()
+
+    def run() -> None:
+        try:
+            for item in iter_phase_records(sv_vcf, bam, cancel=cancel, **options):
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+                if cancel.is_set():
+                    break
+        except BaseException as err:  # handed to the consumer
+            loop.call_soon_threadsafe(queue.put_nowait, _Failed(err))
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+    thread = threading.Thread(target=run, name="svphaser-engine", daemon=True)
+    thread.start()
+    item = None
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+    finally:
+        if item is not _DONE and not isinstance(item, _Failed):
+            cancel.set()
+            logger.info("SvPhaser ▶ cancelling run")
+        await asyncio.to_thread(thread.join)
+
+
+async def aphase_records(sv_vcf: Path, bam: Path, **options: Any) -> pd.DataFrame:
+    """Async version of :func:`~svphaser.phasing.io.phase_records`."""
+    return _records_table([df async for _chrom, df in aiter_phase_records(sv_vcf, bam, **options)])
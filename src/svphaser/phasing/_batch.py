@@ -0,0 +1,250 @@
+"""svphaser.phasing._batch
+=======================
+Batch manifests (``svphaser batch``): many (VCF, BAM) pairs, one worker pool.
+
+A manifest is a TSV whose first non-comment line is a header.  Required
+columns are ``vcf``, ``bam`` and ``out_dir``; ``name`` optionally labels a
+row (default: the VCF stem; names must be unique).  Any other column
+overrides one phasing option for that row and is named after the
+:func:`~svphaser.phasing.io.phase_vcf` keyword (``min_support`` or
+``min-support``); empty cells keep the default.  Relative paths are resolved
+against the manifest's directory.
+
+:class:`_BatchJob` holds one row's parsed SV table and finished contig
+batches, and writes that row's outputs once its last contig is phased.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from cyvcf2 import Reader
+
+from ._filters import RecordFilter
+from ._incremental import evidence_digests, write_run_manifest
+from ._options import EvidenceOptions, evidence_options
+from ._outputs import _lookup_sources, _PhasedOutputs
+from ._regions import RecordSelection
+from ._results import ResultBatch
+from ._shards import run_params
+from ._svtable import SVTable, _phase_table_task, build_sv_table
+from .types import WorkerOpts
+
+__all__ = ["BatchEntry", "load_batch_manifest"]
+
+logger = logging.getLogger(__name__)
+
+_REQUIRED = ("vcf", "bam", "out_dir")
+_TRUE = {"1", "true", "yes", "y", "on"}
+_FALSE = {"0", "false", "no", "n", "off"}
+
+
+def _to_bool(value: str) -> bool:
+    low = value.lower()
+    if low in _TRUE | _FALSE:
+        return low in _TRUE
+    raise ValueError(f"expected a boolean, got {value!r}")
+
+
+def _to_list(value: str) -> list[str]:
+    return [v for v in value.split(",") if v]
+
+
+# Options a manifest row may override, with their parsers.
+OPTION_PARSERS: dict[str, Callable[[str], Any]] = {
+    "min_support": int,
+    "min_tagged_support": int,
+    "major_delta": float,
+    "equal_delta": float,
+    "gq_bins": str,
+    "support_mode": str,
+    "bp_window": int,
+    "dynamic_window": _to_bool,
+    "tie_to_hom_alt": _to_bool,
+    "svp_info": _to_bool,
+    "size_match_required": _to_bool,
+    "size_tol_abs": int,
+    "size_tol_frac": float,
+    "regions": str,
+    "exclude_regions": str,
+    "chroms": _to_list,
+    "include": str,
+    "filtered": str,
+    "write_manifest": _to_bool,
+}
+
+
+@dataclass(slots=True)
+class BatchEntry:
+    """One manifest row: inputs, output directory and option overrides."""
+
+    name: str
+    vcf: Path
+    bam: Path
+    out_dir: Path
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+def _resolve(base: Path, value: str) -> Path:
+    path = Path(value)
+    return path if path.is_absolute() else base / path
+
+
+def _read_header(path: Path, row: list[str]) -> list[str]:
+    header = [h.strip().replace("-", "_") for h in row]
+    missing = [c for c in _REQUIRED if c not in header]
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+    unknown = sorted(set(header) - set(_REQUIRED) - {"name"} - set(OPTION_PARSERS))
+    if unknown:
+        raise ValueError(f"{path}: unknown column(s) {', '.join(unknown)}")
+    return header
+
+
+def _parse_row(path: Path, n: int, header: list[str], fields: list[str]) -> BatchEntry:
+    if len(fields) > len(header):
+        raise ValueError(f"{path}: row {n} has {len(fields)} fields, header has {len(header)}")
+    cells = {h: v.strip() for h, v in zip(header, fields) if v.strip()}
+    if any(c not in cells for c in _REQUIRED):
+        raise ValueError(f"{path}: row {n} needs vcf, bam and out_dir")
+    options: dict[str, Any] = {}
+    for key, value in cells.items():
+        parse = OPTION_PARSERS.get(key)
+        if parse is None:
+            continue
+        try:
+            options[key] = parse(value)
+        except ValueError as err:
+            raise ValueError(f"{path}: row {n}, column {key}: {err}") from err
+    vcf = _resolve(path.parent, cells["vcf"])
+    return BatchEntry(
+        name=cells.get("name", vcf.name.removesuffix(".gz").removesuffix(".vcf")),
+        vcf=vcf,
+        bam=_resolve(path.parent, cells["bam"]),
+        out_dir=_resolve(path.parent, cells["out_dir"]),
+        options=options,
+    )
+
+
+def load_batch_manifest(path: Path) -> list[BatchEntry]:
+    """Parse and validate a batch manifest."""
+    path = Path(path)
+    rows = [
+        ln.split("\t")
+        for ln in path.read_text().splitlines()
+        if ln.strip() and not ln.startswith("#")
+    ]
+    if not rows:
+        raise ValueError(f"{path}: empty manifest")
+    header = _read_header(path, rows[0])
+    entries = [_parse_row(path, n, header, fields) for n, fields in enumerate(rows[1:], start=2)]
+
+    duplicated = sorted(n for n, k in Counter(e.name for e in entries).items() if k > 1)
+    if duplicated:
+        raise ValueError(f"{path}: duplicate row names {', '.join(duplicated)}; add a name column")
+    for entry in entries:
+        for label, file in (("VCF", entry.vcf), ("BAM", entry.bam)):
+            if not file.exists():
+                raise ValueError(f"{path}: {label} of {entry.name!r} not found: {file}")
+    return entries
+
+
+def _phase_job_task(key: str, *args: Any) -> tuple[str, ResultBatch, float]:
+    """Worker entry: a contig task of one batch row, reported under *key*."""
+    _chrom, batch, seconds = _phase_table_task(*args)
+    return key, batch, seconds
+
+
+@dataclass(slots=True)
+class _BatchJob:
+    """One manifest row: its parsed table, options and finished contig batches."""
+
+    entry: BatchEntry
+    opts: WorkerOpts
+    svp_info: bool
+    record_filter: RecordFilter | None
+    write_manifest: bool
+    selection: RecordSelection
+    contigs: tuple[str, ...]
+    table: SVTable
+    out_chroms: list[str]
+    batches: dict[str, ResultBatch]
+    remaining: int
+
+    @classmethod
+    def prepare(
+        cls, entry: BatchEntry, evidence: EvidenceOptions | None, options: dict[str, Any]
+    ) -> _BatchJob:
+        """Parse *entry*'s VCF; *options* override *evidence* and set the run options."""
+        options = dict(options)
+        selection = RecordSelection.from_options(
+            options.pop("regions", None),
+            options.pop("exclude_regions", None),
+            options.pop("chroms", None),
+        )
+        include = options.pop("include", None)
+        record_filter = (
+            None
+            if include is None
+            else RecordFilter(include, action=options.pop("filtered", "drop"))
+        )
+        options.pop("filtered", None)
+        svp_info = options.pop("svp_info", True)
+        write_manifest = options.pop("write_manifest", False)
+        opts = evidence_options(evidence, **options).worker_opts()
+
+        rdr = Reader(str(entry.vcf))
+        contigs = selection.filter_contigs(rdr.seqnames)
+        rdr.close()
+        table = build_sv_table(
+            entry.vcf, contigs, opts, selection=selection, record_filter=record_filter
+        )
+        out_chroms = [chrom for chrom in contigs if chrom in table.contig_ranges]
+        return cls(
+            entry=entry,
+            opts=opts,
+            svp_info=svp_info,
+            record_filter=record_filter,
+            write_manifest=write_manifest,
+            selection=selection,
+            contigs=contigs,
+            table=table,
+            out_chroms=out_chroms,
+            batches={},
+            remaining=len(out_chroms),
+        )
+
+    def finish(self) -> None:
+        """Write this row's outputs (all of its contigs are done)."""
+        entry = self.entry
+        entry.out_dir.mkdir(parents=True, exist_ok=True)
+        stem = entry.vcf.name.removesuffix(".vcf.gz").removesuffix(".vcf")
+        outputs = _PhasedOutputs(
+            out_dir=entry.out_dir,
+            stem=stem,
+            in_vcf=entry.vcf,
+            bins=self.opts.gq_bins,
+            min_support=self.opts.min_support,
+            svp_info=self.svp_info,
+            passthrough_filtered=self.record_filter is not None and self.record_filter.passthrough,
+            **_lookup_sources(entry.vcf, self.contigs, self.selection),
+        )
+        with outputs:
+            for chrom in self.out_chroms:
+                for df in self.batches.pop(chrom).iter_frames():
+                    outputs.write(df)
+        outputs.log_summary()
+        if self.write_manifest:
+            write_run_manifest(
+                entry.out_dir,
+                stem,
+                params=run_params(self.opts, self.svp_info, self.record_filter),
+                bam=entry.bam,
+                evidence=evidence_digests(self.table),
+            )
+        logger.info("%s: outputs written", entry.name)
@@ -0,0 +1,95 @@
+"""svphaser.phasing._checkpoint
+===========================
+Per-task checkpoints for resumable runs.
+
+With a work directory, every finished task's :class:`ResultBatch` is written
+to ``<work_dir>/tasks/`` atomically (temp file + ``os.replace``) as soon as it
+arrives in the parent.  ``manifest.json`` records what the checkpoints were
+computed from (input file identities, the phasing-parameter hash and the
+shard, if any).  A rerun with ``resume=True`` loads matching checkpoints
+instead of dispatching those tasks again; a manifest that does not match
+the current run is refused rather than silently mixed in.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+from pathlib import Path
+from typing import Any
+
+from ._results import ResultBatch
+
+__all__ = ["CheckpointStore", "file_identity"]
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def file_identity(path: Path) -> dict[str, Any]:
+    """Cheap identity of an input file (name, size, mtime)."""
+    st = Path(path).stat()
+    return {"name": Path(path).name, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+class CheckpointStore:
+    """Task results of one run, keyed by ``chrom:lo-hi`` table row ranges."""
+
+    def __init__(self, work_dir: Path, fingerprint: dict[str, Any], *, resume: bool) -> None:
+        self.work_dir = Path(work_dir)
+        self.tasks_dir = self.work_dir / "tasks"
+        self.manifest = self.work_dir / "manifest.json"
+        self.fingerprint = {"version": MANIFEST_VERSION, **fingerprint}
+
+        if resume and self.manifest.exists():
+            previous = json.loads(self.manifest.read_text())
+            if previous != json.loads(json.dumps(self.fingerprint)):
+                raise ValueError(
+                    f"Work directory {self.work_dir} holds checkpoints for different inputs "
+                    "or parameters; use a fresh --work-dir or drop --resume."
+                )
+        else:
+            shutil.rmtree(self.tasks_dir, ignore_errors=True)
+
+        self.tasks_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self.manifest, (json.dumps(self.fingerprint, indent=2) + "\n").encode())
+
+    @staticmethod
+    def task_key(chrom: str, lo: int, hi: int) -> str:
+        return f"{chrom}:{lo}-{hi}"
+
+    def _path(self, key: str) -> Path:
+        return self.tasks_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.pkl"
+
+    def has(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def load(self, key: str) -> tuple[ResultBatch, float] | None:
+        """Checkpointed (batch, seconds) for *key*, or None if absent/unreadable."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as fh:
+                stored_key, batch, seconds = pickle.load(fh)
+        except Exception as err:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", path, err)
+            return None
+        return (batch, seconds) if stored_key == key else None
+
+    def save(self, key: str, batch: ResultBatch, seconds: float) -> None:
+        _atomic_write(self._path(key), pickle.dumps((key, batch, seconds), protocol=5))
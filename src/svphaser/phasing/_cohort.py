@@ -0,0 +1,407 @@
+"""svphaser.phasing._cohort
+========================
+Cohort mode: one multi-sample SV VCF, one BAM per sample, one run.
+
+The sample map is a two-column TSV (``sample<TAB>bam``; ``#`` comments,
+relative BAM paths resolved against the map's directory).  The VCF is
+parsed once into the shared SV table, which then also carries the input
+genotypes of every VCF sample (``sample_gt``).  Work is split into
+(sample, contig) tasks for the mapped samples, scheduled on a single pool;
+a task evaluates only the records where its sample's input genotype carries
+an ALT allele, so hom-ref and missing genotypes cost nothing.  Samples
+without a BAM are written through with their input genotype.
+
+:class:`_CohortOutputs` writes a cohort run's CSVs and multi-sample VCF.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from cyvcf2 import Variant
+
+from ._outputs import (
+    _EMPTY_RESULT_COLUMNS,
+    ContigRecords,
+    _compose_info_str,
+    _ensure_required_columns,
+    _is_missing_scalar,
+    _normalize_vcf_id,
+    _PhasedVcfWriter,
+    _select_info_record,
+    _support_mask,
+    _write_meta_headers,
+)
+from ._results import ResultBatch, ResultBuilder
+from ._svtable import SVTable, SVTableRef, attach_table
+from ._workers import (
+    FILTERED_REASON,
+    SVSite,
+    _append_filtered_result,
+    _append_site_result,
+    _count_site_support,
+    worker_bam,
+)
+from .types import GQBin, WorkerOpts
+
+__all__ = ["load_sample_bams", "nonref_rows", "sample_columns", "task_key"]
+
+logger = logging.getLogger(__name__)
+
+
+def load_sample_bams(spec: Path | Mapping[str, str | Path]) -> dict[str, Path]:
+    """Sample → BAM mapping from a TSV file or a mapping; every BAM must exist."""
+    if isinstance(spec, Mapping):
+        pairs = [(str(s), Path(b)) for s, b in spec.items()]
+    else:
+        path = Path(spec)
+        pairs = []
+        for n, line in enumerate(path.read_text().splitlines(), start=1):
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.split("\t") if "\t" in line else line.split()
+            if len(fields) != 2:
+                raise ValueError(f"{path}:{n}: expected 'sample<TAB>bam', got {line!r}")
+            bam = Path(fields[1].strip())
+            pairs.append((fields[0].strip(), bam if bam.is_absolute() else path.parent / bam))
+
+    sample_bams: dict[str, Path] = {}
+    for sample, bam in pairs:
+        if sample in sample_bams:
+            raise ValueError(f"Sample {sample!r} is mapped twice.")
+        if not bam.exists():
+            raise ValueError(f"BAM for sample {sample!r} not found: {bam}")
+        sample_bams[sample] = bam
+    if not sample_bams:
+        raise ValueError("The sample map is empty.")
+    return sample_bams
+
+
+def sample_columns(vcf_samples: Sequence[str], sample_bams: Mapping[str, Path]) -> list[int]:
+    """VCF column indices of the mapped samples, in VCF order.
+
+    Every mapped sample must be in the VCF; VCF samples without a BAM are
+    allowed and keep their input genotype in the phased VCF.
+    """
+    missing = sorted(set(sample_bams) - set(vcf_samples))
+    if missing:
+        raise ValueError(f"Samples not in the VCF: {', '.join(missing)}")
+    columns = [i for i, name in enumerate(vcf_samples) if name in sample_bams]
+    if len(columns) < len(vcf_samples):
+        logger.warning(
+            "Cohort: %d of %d VCF samples have no BAM; they keep their input genotypes",
+            len(vcf_samples) - len(columns),
+            len(vcf_samples),
+        )
+    return columns
+
+
+def task_key(sample: str, chrom: str) -> str:
+    return f"{sample}:{chrom}"
+
+
+def nonref_rows(table: SVTable, j: int, lo: int, hi: int) -> np.ndarray:
+    """Rows in [lo, hi) where cohort sample *j* has an ALT allele."""
+    alleles = table.arrays["sample_gt"][lo:hi, j]
+    return lo + np.flatnonzero((alleles > 0).any(axis=1))
+
+
+def input_gt(alleles: np.ndarray) -> str:
+    """Input genotype as the single-sample engine reports it (``a1/a2``)."""
+    a1, a2 = int(alleles[0]), int(alleles[1])
+    return f"{a1}" if a2 == -2 else f"{a1}/{a2}"
+
+
+def vcf_gt(alleles: np.ndarray) -> str:
+    """Input genotype as written back to VCF (missing alleles as ``.``)."""
+    return "/".join("." if a < 0 else str(a) for a in alleles.tolist() if a != -2)
+
+
+def _phase_sample_task(
+    key: str,
+    j: int,
+    chrom: str,
+    lo: int,
+    hi: int,
+    table: SVTable | SVTableRef,
+    bam_path: Path,
+    opts: WorkerOpts,
+) -> tuple[str, ResultBatch, float]:
+    """Worker entry: phase sample *j*'s ALT-carrying rows of [lo, hi) against its BAM."""
+    t0 = time.perf_counter()
+    tbl = table if isinstance(table, SVTable) else attach_table(table)
+    debug_locus = os.environ.get("SVPHASER_DEBUG_LOCUS")
+    rows = nonref_rows(tbl, j, lo, hi)
+    gts = tbl.arrays["sample_gt"]
+    out = ResultBuilder(len(rows))
+    with worker_bam(bam_path) as bam:
+        for i in rows.tolist():
+            site = tbl.site(i)._replace(in_gt=input_gt(gts[i, j]))
+            if site.filtered:
+                _append_filtered_result(out, chrom, site)
+                continue
+            sup = _count_site_support(bam, chrom, site, opts=opts, debug_locus=debug_locus)
+            _append_site_result(out, chrom, site, sup, opts=opts)
+    return key, out.finish(), time.perf_counter() - t0
+
+
+class _CohortOutputs:
+    """Incremental writer for a cohort run's kept/dropped CSVs and multi-sample VCF.
+
+    Each contig arrives with one batch per sample holding that sample's
+    ALT-carrying rows.  CSV rows get a leading ``sample`` column and are
+    ordered by record, then sample.  A record goes to the VCF when at least
+    one sample's call is kept; the other samples keep their input genotype
+    with missing GQ and evidence fields.
+    """
+
+    def __init__(
+        self,
+        *,
+        out_dir: Path,
+        stem: str,
+        in_vcf: Path,
+        samples: Sequence[str],
+        bins: list[GQBin],
+        min_support: int,
+        svp_info: bool,
+        passthrough_filtered: bool = False,
+        records: Iterable[Variant] | None = None,
+        contig_records: ContigRecords | None = None,
+    ) -> None:
+        self.samples = list(samples)
+        self.bins = bins
+        self.min_support = min_support
+        self.passthrough_filtered = passthrough_filtered
+        self.dropped_csv = out_dir / f"{stem}_dropped_svs.csv"
+        self.out_csv = out_dir / f"{stem}_phased.csv"
+        self.out_vcf = out_dir / f"{stem}_phased.vcf"
+
+        self.n_kept = 0
+        self.n_dropped = 0
+        self.n_filtered = 0
+        self.n_sites = 0
+        self._header_written = False
+
+        self._kept_fh = open(self.out_csv, "w", newline="")
+        self._dropped_fh = open(self.dropped_csv, "w", newline="")
+        self._vcf = _CohortVcfWriter(
+            self.out_vcf,
+            in_vcf,
+            samples=self.samples,
+            bins=bins,
+            svp_info=svp_info,
+            records=records,
+            contig_records=contig_records,
+        )
+
+    def write(
+        self, chrom: str, table: SVTable, lo: int, hi: int, batches: Sequence[ResultBatch]
+    ) -> None:
+        """Write table rows [lo, hi) of *chrom* from each sample's batch."""
+        kept: list[tuple[np.ndarray, pd.DataFrame]] = []
+        dropped: list[tuple[np.ndarray, pd.DataFrame]] = []
+        cells: dict[int, dict[int, str]] = {}
+        for j, batch in enumerate(batches):
+            if not len(batch):
+                continue
+            out = _ensure_required_columns(batch.to_frame(), bins=self.bins, warn=False, copy=False)
+            out.insert(0, "sample", self.samples[j])
+            rows = nonref_rows(table, j, lo, hi)
+            keep = _support_mask(out, self.min_support).to_numpy(copy=True)
+            listed = np.ones(len(out), dtype=bool)
+            filtered = (out["reason"] == FILTERED_REASON).to_numpy()
+            if filtered.any():
+                self.n_filtered += int(filtered.sum())
+                if self.passthrough_filtered:
+                    keep |= filtered
+                else:
+                    listed = ~filtered
+            kept_rows, kept_df = rows[keep & listed], out.loc[keep & listed]
+            kept.append((kept_rows, kept_df))
+            dropped.append((rows[~keep & listed], out.loc[~keep & listed]))
+            for i, row in zip(kept_rows.tolist(), kept_df.itertuples(index=False)):
+                cells.setdefault(i, {})[j] = self._vcf.cell(row)
+
+        header = not self._header_written
+        for parts, fh in ((kept, self._kept_fh), (dropped, self._dropped_fh)):
+            if parts:
+                _write_by_record(parts, fh, header=header)
+                self._header_written = True
+        self.n_kept += sum(len(df) for _rows, df in kept)
+        self.n_dropped += sum(len(df) for _rows, df in dropped)
+
+        gts = table.arrays["sample_gt"]
+        for i in sorted(cells):
+            called = cells[i]
+            self._vcf.write_site(
+                chrom,
+                table.site(i),
+                [
+                    called.get(j) or self._vcf.unphased_cell(vcf_gt(gts[i, j]))
+                    for j in range(len(self.samples))
+                ],
+            )
+        self.n_sites += len(cells)
+
+    def close(self) -> None:
+        if not self._header_written:
+            empty = pd.DataFrame(columns=["sample", *_EMPTY_RESULT_COLUMNS])
+            empty.to_csv(self._dropped_fh, index=False)
+            empty.to_csv(self._kept_fh, index=False)
+        self._kept_fh.close()
+        self._dropped_fh.close()
+        self._vcf.close()
+
+    def __enter__(self) -> _CohortOutputs:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def log_summary(self) -> None:
+        if self.n_filtered:
+            logger.info(
+                "Record filter: %d sample calls %s",
+                self.n_filtered,
+                "passed through unphased" if self.passthrough_filtered else "excluded",
+            )
+        logger.info("Dropped calls → %s (%d calls)", self.dropped_csv, self.n_dropped)
+        logger.info("CSV → %s (%d calls)", self.out_csv, self.n_kept)
+        logger.info(
+            "VCF → %s (%d sites, %d samples)", self.out_vcf, self.n_sites, len(self.samples)
+        )
+
+
+def _write_by_record(
+    parts: list[tuple[np.ndarray, pd.DataFrame]], fh: Any, *, header: bool
+) -> None:
+    """Append per-sample frames to *fh* in record order (sample order within a record)."""
+    merged = pd.concat([df for _rows, df in parts], ignore_index=True)
+    order = np.argsort(np.concatenate([rows for rows, _df in parts]), kind="stable")
+    merged.iloc[order].to_csv(fh, index=False, header=header)
+
+
+# Per-sample SvPhaser fields of a cohort VCF (FORMAT, since INFO is per site).
+_COHORT_SVP_FORMAT = (
+    ("SVP_HP1", "Integer", "SvPhaser: HP=1 supporting reads"),
+    ("SVP_HP2", "Integer", "SvPhaser: HP=2 supporting reads"),
+    ("SVP_NOHP", "Integer", "SvPhaser: supporting reads without HP tag"),
+    ("SVP_REASON", "String", "SvPhaser: decision reason code"),
+)
+
+
+class _CohortVcfWriter(_PhasedVcfWriter):
+    """Multi-sample phased VCF: input sites with one FORMAT column per cohort sample.
+
+    FORMAT is ``GT:GQ``, plus ``GQBIN`` with GQ bins and the per-sample
+    SvPhaser evidence fields with *svp_info*.
+    """
+
+    def __init__(
+        self,
+        out_vcf: Path,
+        in_vcf: Path,
+        *,
+        samples: Sequence[str],
+        bins: list[GQBin],
+        svp_info: bool,
+        records: Iterable[Variant] | None = None,
+        contig_records: ContigRecords | None = None,
+    ) -> None:
+        self.samples = list(samples)
+        self.format_ids = ["GT", "GQ"]
+        if bins:
+            self.format_ids.append("GQBIN")
+        if svp_info:
+            self.format_ids.extend(info_id for info_id, _t, _d in _COHORT_SVP_FORMAT)
+        super().__init__(
+            out_vcf,
+            in_vcf,
+            gqbin_in_header=bool(bins),
+            svp_info_in_header=svp_info,
+            svp_info=svp_info,
+            records=records,
+            contig_records=contig_records,
+        )
+
+    def _write_header(
+        self,
+        raw_header_lines: list[str],
+        sample_name: str,
+        *,
+        gqbin_in_header: bool,
+        svp_info_in_header: bool,
+    ) -> None:
+        out = self._fh
+        _write_meta_headers(out, raw_header_lines, gqbin_in_header=False, svp_info_in_header=False)
+        declared = {ln.split(",")[0] for ln in raw_header_lines if ln.startswith("##FORMAT=")}
+        formats = [("GQBIN", "String", "GQ bin label from SvPhaser")] if gqbin_in_header else []
+        if svp_info_in_header:
+            formats.extend(_COHORT_SVP_FORMAT)
+        for fmt_id, fmt_type, desc in formats:
+            if f"##FORMAT=<ID={fmt_id}" not in declared:
+                out.write(f'##FORMAT=<ID={fmt_id},Number=1,Type={fmt_type},Description="{desc}">\n')
+        out.write(
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\t"
+            + "\t".join(self.samples)
+            + "\n"
+        )
+
+    def cell(self, row: Any) -> str:
+        """FORMAT values of one phased result row."""
+        values = [str(row.gt), str(row.gq)]
+        if "GQBIN" in self.format_ids:
+            label = getattr(row, "gq_label", None)
+            values.append("." if _is_missing_scalar(label) else str(label))
+        if self.svp_info:
+            values += [str(row.n1), str(row.n2), str(row.nohp), str(row.reason)]
+        return ":".join(values)
+
+    def unphased_cell(self, gt: str) -> str:
+        """FORMAT values of a sample left at its input genotype."""
+        return ":".join([gt] + ["."] * (len(self.format_ids) - 1))
+
+    def write_site(self, chrom: str, site: SVSite, cells: list[str]) -> None:
+        """Write one input record with the given per-sample FORMAT values."""
+        self._load_contig(chrom)
+        vid = _normalize_vcf_id(site.vid)
+        info = _select_info_record(
+            self.full_lookup,
+            self.legacy_index,
+            chrom=chrom,
+            pos=site.pos1,
+            vid=vid,
+            end=site.sv_end,
+            alt=site.alt,
+        )
+        if info is None:
+            logger.warning(
+                "Could not uniquely match VCF record for %s:%s id=%s end=%s alt=%s",
+                chrom,
+                site.pos1,
+                vid,
+                site.sv_end,
+                site.alt,
+            )
+            return
+        fields = [
+            chrom,
+            str(site.pos1),
+            vid,
+            str(info["REF"]),
+            str(info["ALT"]),
+            str(info["QUAL"]),
+            str(info["FILTER"]),
+            _compose_info_str(info["INFO"], site.svtype, None, None),
+            ":".join(self.format_ids),
+            *cells,
+        ]
+        self._fh.write("\t".join(fields) + "\n")
@@ -0,0 +1,172 @@
+"""svphaser.phasing._filters
+=========================
+Record filter expressions (``--include``), evaluated in the parent while the
+SV table is built, before any BAM work.
+
+Expressions use bcftools-like syntax on a small, safe subset of Python::
+
+    FILTER=='PASS' && abs(SVLEN)>=50 && GT!='0/0'
+
+Names:
+- ``CHROM``, ``POS``, ``END``, ``ID``, ``ALT``, ``QUAL``
+- ``FILTER`` (``'PASS'`` when the column is ``PASS`` or ``.``)
+- ``SVTYPE``; ``SVLEN`` (INFO/SVLEN as written, else the derived length)
+- ``GT``: first sample's genotype, unphased form (``'0/1'``, ``'./.'``);
+  rejected in cohort runs, where each sample has its own genotype
+- any other name is looked up in INFO (missing → ``None``)
+
+Operators: ``&&``/``and``, ``||``/``or``, ``!``/``not``, comparisons (``=``
+is accepted for ``==``), ``in``, ``+ - * / %`` and the functions ``abs``,
+``len``, ``min``, ``max``.  Anything else is rejected when parsing.
+A comparison that fails on a missing value, or ``min``/``max`` of an empty
+sequence, makes the record not match.
+
+Records that do not match are flagged in the table; workers skip evidence
+counting for them and the outputs either drop them or pass them through
+unphased (``gt=./.``, ``reason=FILTERED``).
+"""
+
+from __future__ import annotations
+
+import ast
+import re
+from collections.abc import Callable
+from typing import Any
+
+from cyvcf2 import Variant
+
+from ._workers import FILTERED_REASON, SVSite
+
+__all__ = ["FILTERED_REASON", "RecordFilter"]
+
+FILTERED_ACTIONS = ("drop", "pass")
+
+_FUNCTIONS: dict[str, Any] = {"abs": abs, "len": len, "min": min, "max": max}
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.And,
+    ast.Or,
+    ast.UnaryOp,
+    ast.Not,
+    ast.USub,
+    ast.UAdd,
+    ast.BinOp,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Mod,
+    ast.Compare,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.In,
+    ast.NotIn,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Tuple,
+    ast.List,
+    ast.Call,
+)
+# Strings are copied verbatim; &&, ||, ! and a lone = are translated.
+_TOKEN_RE = re.compile(r"""('[^']*'|"[^"]*")|&&|\|\||!(?!=)|(?<![=!<>])=(?!=)""")
+_TRANSLATE = {"&&": " and ", "||": " or ", "!": " not ", "=": "=="}
+
+
+def _translate(expression: str) -> str:
+    return _TOKEN_RE.sub(lambda m: m.group(1) or _TRANSLATE[m.group(0)], expression)
+
+
+def _validate(tree: ast.AST, expression: str) -> set[str]:
+    """Reject unsupported syntax; return the record fields the expression uses."""
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax in filter {expression!r}: {type(node).__name__}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS:
+                raise ValueError(f"Only {sorted(_FUNCTIONS)} may be called in {expression!r}.")
+            if node.keywords:
+                raise ValueError(f"Keyword arguments are not allowed in {expression!r}.")
+        elif isinstance(node, ast.Name) and node.id not in _FUNCTIONS:
+            names.add(node.id)
+    return names
+
+
+def _gt_string(rec: Variant) -> str | None:
+    if not rec.genotypes:
+        return None
+    alleles = rec.genotypes[0][:-1] or [-1]
+    return "/".join("." if a < 0 else str(a) for a in alleles)
+
+
+def _svlen(rec: Variant, site: SVSite) -> Any:
+    value = rec.INFO.get("SVLEN")
+    if isinstance(value, tuple):
+        value = value[0] if value else None
+    return site.svlen if value is None else value
+
+
+_FIELDS: dict[str, Callable[[Variant, SVSite], Any]] = {
+    "CHROM": lambda rec, site: rec.CHROM,
+    "POS": lambda rec, site: site.pos1,
+    "END": lambda rec, site: site.sv_end,
+    "ID": lambda rec, site: rec.ID,
+    "ALT": lambda rec, site: site.alt,
+    "QUAL": lambda rec, site: rec.QUAL,
+    "FILTER": lambda rec, site: rec.FILTER or "PASS",
+    "SVTYPE": lambda rec, site: site.svtype,
+    "SVLEN": _svlen,
+    "GT": lambda rec, site: _gt_string(rec),
+}
+
+
+def _field(rec: Variant, site: SVSite, name: str) -> Any:
+    getter = _FIELDS.get(name)
+    return rec.INFO.get(name) if getter is None else getter(rec, site)
+
+
+class RecordFilter:
+    """Compiled ``--include`` expression plus what to do with non-matching records."""
+
+    def __init__(self, expression: str, *, action: str = "drop") -> None:
+        if action not in FILTERED_ACTIONS:
+            raise ValueError(f"Filtered-record action must be one of {FILTERED_ACTIONS}.")
+        self.expression = expression
+        self.action = action
+        try:
+            tree = ast.parse(_translate(expression).strip(), mode="eval")
+        except SyntaxError as err:
+            raise ValueError(f"Invalid filter expression {expression!r}: {err.msg}") from err
+        self._names = sorted(_validate(tree, expression))
+        self._code = compile(tree, "<include>", "eval")
+
+    @property
+    def passthrough(self) -> bool:
+        return self.action == "pass"
+
+    def check_cohort(self) -> None:
+        """Raise ValueError if the expression cannot apply to every cohort sample."""
+        if "GT" in self._names:
+            raise ValueError(
+                f"Filter {self.expression!r} uses GT, which differs per sample; it cannot be "
+                "combined with --sample-bams (each sample is already evaluated only where "
+                "its own GT carries an ALT allele)."
+            )
+
+    def describe(self) -> list[str]:
+        """JSON-able identity for fingerprints and parameter hashes."""
+        return [self.expression, self.action]
+
+    def __call__(self, rec: Variant, site: SVSite) -> bool:
+        """True if the record should be phased."""
+        env = {name: _field(rec, site, name) for name in self._names}
+        try:
+            return bool(eval(self._code, {"__builtins__": _FUNCTIONS}, env))
+        except (TypeError, ValueError, ZeroDivisionError):
+            return False
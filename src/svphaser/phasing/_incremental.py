@@ -0,0 +1,202 @@
+"""svphaser.phasing._incremental
+============================
+Incremental re-phasing against a previous run (``--previous``).
+
+A run with ``--write-manifest`` (or ``--previous``) writes ``<stem>_run.json``
+next to its CSVs: the hash of the phasing parameters, a fingerprint of the
+BAM and a digest of every record's evidence inputs (SVTYPE, SVLEN, input
+GT, fetch window, breakpoint tolerance, sorted RNAMES, BND partner and the
+``--include`` filtered flag).
+A later run given the old ``<stem>_phased.csv`` reuses the old result of
+every record whose SV key (chrom, pos, id, end, alt) and evidence digest are
+unchanged; only new or changed records are evaluated against the BAM.
+Nothing is reused when the parameters differ or the BAM fingerprint does not
+match.
+
+The BAM fingerprint is its size plus a hash of its first and last MiB
+(header, first and last blocks), so it survives copies but not rewrites.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ._results import RESULT_COLUMNS, ResultBatch
+from ._svtable import SVTable
+
+__all__ = ["PreviousRun", "Reuse", "bam_fingerprint", "evidence_digests", "write_run_manifest"]
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 2
+_FINGERPRINT_BYTES = 1 << 20
+_STRING_COLUMNS = ("chrom", "id", "svtype", "alt", "in_gt", "gt", "reason", "mode")
+
+SiteKey = tuple[str, int, str, int, str]
+
+
+def bam_fingerprint(path: Path) -> str:
+    """Size plus a hash of the first and last MiB of *path*."""
+    size = Path(path).stat().st_size
+    digest = hashlib.sha256(str(size).encode())
+    with open(path, "rb") as fh:
+        digest.update(fh.read(_FINGERPRINT_BYTES))
+        fh.seek(max(0, size - _FINGERPRINT_BYTES))
+        digest.update(fh.read(_FINGERPRINT_BYTES))
+    return f"{size}:{digest.hexdigest()}"
+
+
+def run_manifest_path(out_dir: Path, stem: str) -> Path:
+    return out_dir / f"{stem}_run.json"
+
+
+def _key_string(key: SiteKey) -> str:
+    return "\t".join(str(part) for part in key)
+
+
+def _site_key(table: SVTable, i: int, chrom: str) -> SiteKey:
+    return (
+        chrom,
+        int(table.arrays["pos"][i]),
+        table.str_at("id", i) or "",
+        int(table.arrays["end"][i]),
+        table.str_at("alt", i) or "<N>",
+    )
+
+
+def _evidence_digest(table: SVTable, i: int) -> str:
+    site = table.site(i)
+    inputs = (
+        site.svtype,
+        site.svlen,
+        site.in_gt,
+        site.fetch_w,
+        site.bp_tol,
+        sorted(site.rnames),
+        site.chr2,
+        site.pos2,
+        site.filtered,
+    )
+    return hashlib.blake2b(json.dumps(inputs).encode(), digest_size=8).hexdigest()
+
+
+def evidence_digests(table: SVTable) -> dict[str, str | None]:
+    """Evidence digest per SV key of *table*; None where duplicate keys disagree."""
+    digests: dict[str, str | None] = {}
+    for chrom, (lo, hi) in table.contig_ranges.items():
+        for i in range(lo, hi):
+            key = _key_string(_site_key(table, i, chrom))
+            digest = _evidence_digest(table, i)
+            digests[key] = digest if digests.get(key, digest) == digest else None
+    return digests
+
+
+def write_run_manifest(
+    out_dir: Path, stem: str, *, params: str, bam: Path, evidence: dict[str, str | None]
+) -> Path:
+    path = run_manifest_path(out_dir, stem)
+    doc = {
+        "version": MANIFEST_VERSION,
+        "params_hash": params,
+        "bam": bam_fingerprint(bam),
+        "evidence": evidence,
+    }
+    path.write_text(json.dumps(doc, indent=2) + "\n")
+    return path
+
+
+def _read_results(path: Path) -> pd.DataFrame:
+    # Empty fields are missing values; floats round-trip exactly.
+    return pd.read_csv(
+        path,
+        dtype={c: str for c in _STRING_COLUMNS},
+        keep_default_na=False,
+        na_values=[""],
+        float_precision="round_trip",
+    )
+
+
+@dataclass(slots=True)
+class Reuse:
+    """Previous results for one contig: ``from_previous[i]`` marks reused rows."""
+
+    batch: ResultBatch
+    from_previous: np.ndarray
+
+
+class PreviousRun:
+    """Results of an earlier run, indexed by SV key."""
+
+    def __init__(self, frame: pd.DataFrame, evidence: dict[str, str | None]) -> None:
+        self.batch = ResultBatch.from_frame(frame)
+        self._evidence = evidence
+        self._rows: dict[SiteKey, deque[int]] = {}
+        ids = frame["id"].fillna("")
+        for i, key in enumerate(
+            zip(frame["chrom"], frame["pos"].tolist(), ids, frame["end"].tolist(), frame["alt"])
+        ):
+            self._rows.setdefault(key, deque()).append(i)
+
+    @classmethod
+    def load(cls, phased_csv: Path, *, params: str, bam: Path) -> PreviousRun | None:
+        """Previous results next to *phased_csv*, or None if they cannot be reused."""
+        phased_csv = Path(phased_csv)
+        stem = phased_csv.name.removesuffix("_phased.csv")
+        manifest = run_manifest_path(phased_csv.parent, stem)
+        if stem == phased_csv.name or not manifest.exists():
+            raise ValueError(
+                f"{phased_csv} has no run manifest ({manifest.name}); pass the "
+                "<stem>_phased.csv of a run made with --write-manifest."
+            )
+        doc = json.loads(manifest.read_text())
+        if doc.get("version") != MANIFEST_VERSION:
+            logger.warning("Previous run predates evidence digests; re-phasing everything")
+            return None
+        if doc.get("params_hash") != params:
+            logger.warning("Previous run used different parameters; re-phasing everything")
+            return None
+        if doc.get("bam") != bam_fingerprint(bam):
+            logger.warning("BAM differs from the previous run's; re-phasing everything")
+            return None
+
+        parts = [_read_results(phased_csv)]
+        dropped = phased_csv.parent / f"{stem}_dropped_svs.csv"
+        if dropped.exists():
+            parts.append(_read_results(dropped))
+        frame = pd.concat(parts, ignore_index=True)[list(RESULT_COLUMNS)]
+        return cls(frame, doc["evidence"])
+
+    def _match(self, table: SVTable, i: int, chrom: str) -> int | None:
+        key = _site_key(table, i, chrom)
+        rows = self._rows.get(key)
+        if not rows:
+            return None
+        previous = self._evidence.get(_key_string(key))
+        if previous is None or previous != _evidence_digest(table, i):
+            return None
+        return rows.popleft()
+
+    def split(self, table: SVTable) -> tuple[SVTable, dict[str, Reuse]]:
+        """Table of rows still to phase, plus the reused results per contig."""
+        todo: list[np.ndarray] = []
+        reuse: dict[str, Reuse] = {}
+        for chrom, (lo, hi) in table.contig_ranges.items():
+            matches = [self._match(table, i, chrom) for i in range(lo, hi)]
+            from_previous = np.array([m is not None for m in matches], dtype=bool)
+            todo.append(np.arange(lo, hi)[~from_previous])
+            if from_previous.any():
+                rows = np.array([m for m in matches if m is not None], dtype=np.int64)
+                reuse[chrom] = Reuse(self.batch.take(rows), from_previous)
+        n_reused = sum(int(r.from_previous.sum()) for r in reuse.values())
+        n_total = sum(hi - lo for lo, hi in table.contig_ranges.values())
+        logger.info("Previous run: reusing %d of %d SVs", n_reused, n_total)
+        rows = np.concatenate(todo) if todo else np.empty(0, dtype=np.int64)
+        return table.take(rows), reuse
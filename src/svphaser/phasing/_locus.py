@@ -0,0 +1,297 @@
+"""svphaser.phasing._locus
+=======================
+Evaluate SV loci given as plain fields, without a VCF.
+
+A locus is wrapped in a minimal stand-in for a cyvcf2 record, so
+:func:`~svphaser.phasing._workers._site_from_record` derives its fetch
+window, breakpoint tolerance, SVLEN and RNAMES exactly as it would for the
+equivalent VCF line.  Evidence is then counted and classified by the same
+worker code as a phasing run, and rows come back with the columns of
+``<stem>_phased.csv`` plus ``kept`` (as from ``phase_records``).
+
+Locus fields: ``chrom``, ``pos`` (1-based) and ``svtype`` are required;
+``end`` (default ``pos``, as for a record without END), ``svlen``, ``alt``
+(default ``<SVTYPE>``), ``id``, ``gt`` (input genotype, e.g. ``"0/1"``),
+``rnames`` (list or comma-separated supporting read names) and ``info``
+(further INFO keys such as ``CIPOS``, ``STDEV_POS`` or ``CHR2``) are optional.
+
+:func:`evaluate_locus` and :class:`LocusEvaluator` are the public, per-call
+form: no DataFrame is built, and the result is a :class:`LocusCall`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import re
+import threading
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pysam
+
+from svphaser import DEFAULT_GQ_BINS
+
+from ._options import EvidenceOptions
+from ._outputs import _ensure_required_columns, _gq_label_from_bins, _support_mask
+from ._results import ResultBuilder
+from ._workers import (
+    ReadSource,
+    _append_site_result,
+    _classify_support,
+    _count_site_support,
+    _site_from_record,
+)
+from .types import WorkerOpts
+
+__all__ = [
+    "LocusCall",
+    "LocusEvaluator",
+    "LocusRecord",
+    "evaluate_locus",
+    "evaluate_records",
+    "locus_record",
+]
+
+logger = logging.getLogger(__name__)
+
+_GT_SPLIT = re.compile(r"[/|]")
+
+
+@dataclass(slots=True)
+class LocusRecord:
+    """The cyvcf2 ``Variant`` attributes that site extraction reads."""
+
+    CHROM: str
+    POS: int
+    end: int
+    ID: str | None
+    ALT: list[str]
+    INFO: dict[str, Any] = field(default_factory=dict)
+    genotypes: list[list[Any]] = field(default_factory=list)
+
+
+def _genotypes(gt: str | None) -> list[list[Any]]:
+    if gt is None:
+        return []
+    alleles = [-1 if a in {".", ""} else int(a) for a in _GT_SPLIT.split(str(gt))]
+    if len(alleles) != 2:
+        raise ValueError(f"Genotype {gt!r} is not diploid.")
+    return [[*alleles, "|" in str(gt)]]
+
+
+def locus_record(fields: Mapping[str, Any]) -> LocusRecord:
+    """Record for one locus given as plain fields (see the module docstring)."""
+    missing = [k for k in ("chrom", "pos", "svtype") if fields.get(k) is None]
+    if missing:
+        raise ValueError(f"Locus is missing {', '.join(missing)}.")
+    pos = int(fields["pos"])
+    svtype = str(fields["svtype"])
+    info: dict[str, Any] = dict(fields.get("info") or {})
+    info["SVTYPE"] = svtype
+    if fields.get("svlen") is not None:
+        info["SVLEN"] = int(fields["svlen"])
+    rnames = fields.get("rnames")
+    if rnames:
+        info["RNAMES"] = rnames if isinstance(rnames, str) else ",".join(map(str, rnames))
+    end = int(fields["end"]) if fields.get("end") is not None else pos
+    alt = fields.get("alt") or f"<{svtype}>"
+    return LocusRecord(
+        CHROM=str(fields["chrom"]),
+        POS=pos,
+        end=end,
+        ID=None if fields.get("id") is None else str(fields["id"]),
+        ALT=[str(alt)],
+        INFO=info,
+        genotypes=_genotypes(fields.get("gt")),
+    )
+
+
+def evaluate_records(
+    bam: ReadSource, records: Sequence[LocusRecord], opts: WorkerOpts
+) -> pd.DataFrame:
+    """Count, classify and label *records*; one output row per record, in order."""
+    out = ResultBuilder(len(records))
+    for rec in records:
+        site = _site_from_record(rec, opts=opts)
+        sup = _count_site_support(bam, rec.CHROM, site, opts=opts)
+        _append_site_result(out, rec.CHROM, site, sup, opts=opts)
+    df = _ensure_required_columns(out.finish().to_frame(), bins=opts.gq_bins, warn=False)
+    return df.assign(kept=_support_mask(df, opts.min_support).to_numpy())
+
+
+@dataclass(slots=True, frozen=True)
+class LocusCall:
+    """Evidence counts and phasing call for one locus (a ``phase_records`` row)."""
+
+    chrom: str
+    pos: int
+    end: int
+    svtype: str
+    svlen: int
+    hp1: int
+    hp2: int
+    nohp: int
+    tagged_total: int
+    support_total: int
+    gt: str
+    gq: int
+    gq_label: str | None
+    reason: str
+    delta: float
+    tag_frac: float
+    mode: str | None
+    kept: bool
+
+
+def _call_record(bam: ReadSource, rec: LocusRecord, opts: WorkerOpts) -> LocusCall:
+    site = _site_from_record(rec, opts=opts)
+    sup = _count_site_support(bam, rec.CHROM, site, opts=opts)
+    gt, gq, reason, delta = _classify_support(sup, opts=opts)
+    support_total = int(sup["support_total"])
+    return LocusCall(
+        chrom=rec.CHROM,
+        pos=site.pos1,
+        end=int(sup.get("sv_end") or site.pos1),
+        svtype=str(sup.get("svtype", "NA")),
+        svlen=int(sup.get("svlen") or 0),
+        hp1=int(sup["hp1"]),
+        hp2=int(sup["hp2"]),
+        nohp=int(sup["nohp"]),
+        tagged_total=int(sup["tagged_total"]),
+        support_total=support_total,
+        gt=gt,
+        gq=int(gq),
+        gq_label=_gq_label_from_bins(gq, opts.gq_bins),
+        reason=reason,
+        delta=float(delta),
+        tag_frac=int(sup["tagged_total"]) / support_total if support_total else 0.0,
+        mode=sup.get("mode"),
+        kept=support_total >= opts.min_support,
+    )
+
+
+def _record(
+    chrom: str,
+    pos: int,
+    end: int | None,
+    svtype: str,
+    svlen: int | None,
+    rnames: Sequence[str] | str | None,
+    info: Mapping[str, Any] | None,
+) -> LocusRecord:
+    fields = {"chrom": chrom, "pos": pos, "end": end, "svtype": svtype, "svlen": svlen}
+    return locus_record({**fields, "rnames": rnames, "info": info})
+
+
+# Same evidence defaults as ``svphaser.phase``.
+_DEFAULT_OPTS = EvidenceOptions(gq_bins=DEFAULT_GQ_BINS).worker_opts()
+
+
+def evaluate_locus(
+    bam: ReadSource | Path | str,
+    chrom: str,
+    pos: int,
+    end: int | None,
+    svtype: str,
+    svlen: int | None,
+    rnames: Sequence[str] | str | None = None,
+    *,
+    info: Mapping[str, Any] | None = None,
+    opts: WorkerOpts | None = None,
+) -> LocusCall:
+    """Count HP-tagged support for one SV and classify it.
+
+    *pos*/*end* are 1-based and *svlen* is signed as in the VCF (negative
+    for DEL); *rnames* are the caller's supporting reads, and *info* holds
+    further INFO keys (``CIPOS``, ``CHR2``, ...).  *bam* is an open
+    ``pysam.AlignmentFile`` or a path; a path is opened for this call only,
+    so repeated calls should go through a :class:`LocusEvaluator`.
+    """
+    rec = _record(chrom, pos, end, svtype, svlen, rnames, info)
+    opts = opts or _DEFAULT_OPTS
+    if not isinstance(bam, (Path, str)):
+        return _call_record(bam, rec, opts)
+    with pysam.AlignmentFile(str(bam), "rb") as handle:
+        return _call_record(handle, rec, opts)
+
+
+@dataclass(slots=True)
+class _HandlePool:
+    """Open handles of one BAM; a handle is used by one thread at a time."""
+
+    path: str
+    slots: threading.BoundedSemaphore
+    idle: list[pysam.AlignmentFile] = field(default_factory=list)
+
+    @contextlib.contextmanager
+    def handle(self) -> Iterator[pysam.AlignmentFile]:
+        with self.slots:
+            try:
+                bam = self.idle.pop()
+            except IndexError:
+                bam = pysam.AlignmentFile(self.path, "rb")
+            try:
+                yield bam
+            finally:
+                self.idle.append(bam)
+
+
+class LocusEvaluator:
+    """:func:`evaluate_locus` with pooled, index-loaded BAM handles.
+
+    Handles are opened on first use of a BAM and kept until :meth:`close`;
+    up to *max_handles* threads evaluate the same BAM concurrently (pysam
+    handles are not thread-safe, so each thread borrows its own).
+    """
+
+    def __init__(self, opts: WorkerOpts | None = None, *, max_handles: int = 4) -> None:
+        if max_handles < 1:
+            raise ValueError("max_handles must be >= 1.")
+        self.opts = opts or _DEFAULT_OPTS
+        self.max_handles = max_handles
+        self._pools: dict[str, _HandlePool] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, bam: Path | str) -> _HandlePool:
+        key = str(bam)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.setdefault(
+                    key, _HandlePool(key, threading.BoundedSemaphore(self.max_handles))
+                )
+        return pool
+
+    def evaluate(
+        self,
+        bam: Path | str,
+        chrom: str,
+        pos: int,
+        end: int | None,
+        svtype: str,
+        svlen: int | None,
+        rnames: Sequence[str] | str | None = None,
+        *,
+        info: Mapping[str, Any] | None = None,
+    ) -> LocusCall:
+        """As :func:`evaluate_locus`, on a pooled handle of *bam*."""
+        rec = _record(chrom, pos, end, svtype, svlen, rnames, info)
+        with self._pool(bam).handle() as handle:
+            return _call_record(handle, rec, self.opts)
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            while pool.idle:
+                pool.idle.pop().close()
+
+    def __enter__(self) -> LocusEvaluator:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
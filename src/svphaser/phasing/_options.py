@@ -0,0 +1,81 @@
+"""svphaser.phasing._options
+=========================
+Evidence options: the phasing parameters every entry point shares.
+
+They are gathered once into an :class:`EvidenceOptions` (from keywords,
+CLI options or a batch manifest row) and passed through
+:func:`~svphaser.phasing.io.phase_vcf` and its siblings as one object;
+:meth:`EvidenceOptions.worker_opts` resolves them into the
+:class:`~svphaser.phasing.types.WorkerOpts` the workers receive.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .types import GQBin, WorkerOpts
+
+__all__ = ["EVIDENCE_FIELDS", "EvidenceOptions", "evidence_options", "parse_gq_bins"]
+
+
+def parse_gq_bins(gq_bins: str) -> list[GQBin]:
+    """Parse '30:High,10:Moderate' into bins sorted by descending threshold."""
+    bins: list[GQBin] = []
+    if gq_bins.strip():
+        for part in gq_bins.split(","):
+            thr_lbl = part.strip()
+            if not thr_lbl:
+                continue
+            try:
+                thr_s, lbl = thr_lbl.split(":")
+            except ValueError as err:
+                raise ValueError(
+                    f"Invalid gq-bin specifier: '{thr_lbl}'. " "Use '30:High,10:Moderate'."
+                ) from err
+            bins.append((int(thr_s), lbl))
+        bins.sort(key=lambda x: x[0], reverse=True)
+    return bins
+
+
+@dataclass(slots=True, frozen=True)
+class EvidenceOptions:
+    """Evidence and genotyping options of a run (see ``svphaser phase --help``)."""
+
+    min_support: int = 10
+    min_tagged_support: int = 3
+    major_delta: float = 0.60
+    equal_delta: float = 0.10
+    gq_bins: str = "0:LOW,20:MED,50:HIGH"
+    support_mode: str = "hybrid"
+    bp_window: int = 100
+    dynamic_window: bool = True
+    tie_to_hom_alt: bool = True
+    size_match_required: bool = True
+    size_tol_abs: int = 10
+    size_tol_frac: float = 0.0
+
+    @classmethod
+    def pick(cls, values: Mapping[str, Any]) -> EvidenceOptions:
+        """Options from the evidence keys of *values*; other keys are ignored."""
+        return cls(**{name: values[name] for name in EVIDENCE_FIELDS if name in values})
+
+    def worker_opts(self) -> WorkerOpts:
+        """The worker options, with *gq_bins* parsed."""
+        values = dataclasses.asdict(self)
+        values["gq_bins"] = parse_gq_bins(self.gq_bins)
+        return WorkerOpts(**values)
+
+
+EVIDENCE_FIELDS: tuple[str, ...] = tuple(f.name for f in dataclasses.fields(EvidenceOptions))
+
+
+def evidence_options(evidence: EvidenceOptions | None = None, **overrides: Any) -> EvidenceOptions:
+    """*evidence* (default: all defaults) with evidence keyword *overrides* applied."""
+    unknown = sorted(set(overrides) - set(EVIDENCE_FIELDS))
+    if unknown:
+        raise TypeError(f"Unknown options: {', '.join(unknown)}")
+    base = EvidenceOptions() if evidence is None else evidence
+    return dataclasses.replace(base, **overrides) if overrides else base
@@ -0,0 +1,863 @@
+"""svphaser.phasing._outputs
+==========================
+Output writers of a phasing run: ``<stem>_phased.csv``,
+``<stem>_dropped_svs.csv`` and ``<stem>_phased.vcf``.
+
+Result chunks arrive in output order and are normalized, split by the
+global support filter and appended as they come; the phased VCF copies
+each kept record's input fields (looked up by SV key) and adds GT/GQ and
+the SvPhaser INFO annotations.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, TextIO, TypedDict
+
+import numpy as np
+import pandas as pd
+from cyvcf2 import Reader, Variant
+
+from ._regions import RecordSelection
+from ._workers import FILTERED_REASON, _has_tabix_index
+from .types import GQBin, SVKey, SVKeyLegacy
+
+logger = logging.getLogger(__name__)
+
+
+# Input records of one contig, for per-contig INFO lookups.
+ContigRecords = Callable[[str], Iterable[Variant]]
+
+
+class VcfRec(TypedDict):
+    REF: str
+    ALT: str
+    QUAL: object
+    FILTER: str
+    INFO: dict[str, Any]
+
+
+def _is_missing_scalar(x: Any) -> bool:
+    """True for None / NaN / empty string."""
+    if x is None:
+        return True
+    if isinstance(x, float) and math.isnan(x):
+        return True
+    if isinstance(x, str) and x.strip() == "":
+        return True
+    return False
+
+
+def _normalize_vcf_id(value: Any) -> str:
+    """Normalize a VCF ID, mapping missing/blank values to '.'."""
+    if _is_missing_scalar(value):
+        return "."
+    return str(value).strip()
+
+
+def _normalize_optional_int(value: Any) -> int | None:
+    """Normalize optional integer-like values from pandas/CSV."""
+    if _is_missing_scalar(value):
+        return None
+    return int(value)
+
+
+def _normalize_optional_str(value: Any) -> str | None:
+    """Normalize optional string-like values from pandas/CSV."""
+    if _is_missing_scalar(value):
+        return None
+    return str(value).strip()
+
+
+def _gq_label_from_bins(gq: Any, bins: list[GQBin]) -> str | None:
+    """Return label for first threshold satisfied (bins sorted desc)."""
+    if not bins:
+        return None
+    try:
+        gq_i = int(gq)
+    except Exception:
+        return None
+    for thr, lbl in bins:
+        if gq_i >= int(thr):
+            return str(lbl)
+    return None
+
+
+def _backfill_n1_n2(out: pd.DataFrame) -> None:
+    """n1/n2 are what the VCF writer uses (SVP_HP1/HP2)."""
+    if "n1" not in out.columns and "hp1" in out.columns:
+        out["n1"] = out["hp1"]
+    if "n2" not in out.columns and "hp2" in out.columns:
+        out["n2"] = out["hp2"]
+
+
+def _backfill_tag_frac(out: pd.DataFrame) -> None:
+    """tag_frac is used in SVP_TAGFRAC; derive if totals exist."""
+    if "tag_frac" in out.columns:
+        return
+    if "tagged_total" not in out.columns or "support_total" not in out.columns:
+        return
+
+    denom = pd.to_numeric(out["support_total"], errors="coerce").astype(float)
+    denom = denom.where(denom != 0.0, other=float("nan"))
+    numer = pd.to_numeric(out["tagged_total"], errors="coerce").astype(float)
+    out["tag_frac"] = numer / denom
+
+
+def _backfill_gq_label(out: pd.DataFrame, *, bins: list[GQBin]) -> None:
+    """gq_label is optional but CLI advertises it; compute if missing."""
+    if not bins:
+        return
+    if "gq_label" in out.columns:
+        return
+    if "gq" not in out.columns:
+        return
+    # Vectorized _gq_label_from_bins: first (descending) threshold satisfied.
+    gq = np.trunc(pd.to_numeric(out["gq"], errors="coerce").to_numpy(dtype=float))
+    labels = list(dict.fromkeys(str(lbl) for _thr, lbl in bins))
+    codes = np.select(
+        [gq >= int(thr) for thr, _lbl in bins],
+        [labels.index(str(lbl)) for _thr, lbl in bins],
+        default=-1,
+    )
+    out["gq_label"] = pd.Categorical.from_codes(codes, categories=labels)
+
+
+def _validate_required_columns(out: pd.DataFrame) -> None:
+    required = ["chrom", "pos", "id", "end", "svtype", "gt", "gq"]
+    missing = [c for c in required if c not in out.columns]
+    if missing:
+        raise RuntimeError(
+            "SvPhaser internal error: worker output is missing required columns "
+            f"{missing}. Refusing to write phased VCF/CSV because it would silently "
+            "degrade to './.' genotypes. Fix worker to emit gt/gq "
+            "(and ideally reason/delta)."
+        )
+
+
+def _normalize_gt_gq(out: pd.DataFrame) -> None:
+    """Normalize GT/GQ to safe writable types (categorical GT stays categorical)."""
+    gt = out["gt"]
+    if isinstance(gt.dtype, pd.CategoricalDtype):
+        if gt.isna().any():
+            if "./." not in gt.cat.categories:
+                gt = gt.cat.add_categories(["./."])
+            out["gt"] = gt.fillna("./.")
+    else:
+        out["gt"] = gt.fillna("./.").astype(str)
+    if not pd.api.types.is_integer_dtype(out["gq"].dtype):
+        out["gq"] = pd.to_numeric(out["gq"], errors="coerce").fillna(0).astype(int)
+
+
+def _warn_if_suspicious(out: pd.DataFrame) -> None:
+    """Warn loudly if output looks obviously wrong."""
+    if "tagged_total" not in out.columns:
+        return
+    try:
+        frac_ambig = float((out["gt"] == "./.").mean())
+        med_tagged = float(pd.to_numeric(out["tagged_total"], errors="coerce").fillna(0).median())
+        _warn_if_suspicious_stats(frac_ambig, med_tagged)
+    except Exception:
+        return
+
+
+def _warn_if_suspicious_stats(frac_ambig: float, med_tagged: float) -> None:
+    if frac_ambig >= 0.95 and med_tagged >= 5:
+        logger.warning(
+            "Suspicious output: %.1f%% genotypes are './.' despite "
+            "median tagged_total=%.1f. This usually indicates a gt/gq "
+            "propagation bug or thresholds too strict.",
+            100.0 * frac_ambig,
+            med_tagged,
+        )
+
+
+def _ensure_required_columns(
+    df: pd.DataFrame, *, bins: list[GQBin], warn: bool = True, copy: bool = True
+) -> pd.DataFrame:
+    """Backfill columns the writer expects; then validate.
+
+    With ``copy=False`` the frame is normalized in place (columns replaced,
+    never written through), which the engine uses for its private chunks.
+    """
+    if df.empty:
+        return df
+
+    out = df.copy() if copy else df
+
+    _backfill_n1_n2(out)
+    _backfill_tag_frac(out)
+    _backfill_gq_label(out, bins=bins)
+
+    _validate_required_columns(out)
+    _normalize_gt_gq(out)
+    if warn:
+        _warn_if_suspicious(out)
+
+    return out
+
+
+def _support_mask(df: pd.DataFrame, min_support: int) -> pd.Series:
+    """Rows passing the global support filter (support_total, else n1+n2)."""
+    if "support_total" in df.columns and pd.api.types.is_integer_dtype(df["support_total"]):
+        return df["support_total"] >= int(min_support)
+    if "support_total" in df.columns:
+        total_support = pd.to_numeric(df["support_total"], errors="coerce").fillna(0).astype(int)
+    else:
+        n1 = pd.to_numeric(df["n1"], errors="coerce").fillna(0).astype(int)
+        n2 = pd.to_numeric(df["n2"], errors="coerce").fillna(0).astype(int)
+        total_support = n1 + n2
+    return total_support >= int(min_support)
+
+
+def _split_kept(
+    out: pd.DataFrame, min_support: int, passthrough_filtered: bool
+) -> tuple[pd.DataFrame, pd.Series, pd.DataFrame]:
+    """Rows to output, their keep mask, and the rows that were phased (not FILTERED)."""
+    keep = _support_mask(out, min_support)
+    filtered = (out["reason"] == FILTERED_REASON).to_numpy()
+    if not filtered.any():
+        return out, keep, out
+    phased = out.loc[~filtered]
+    if passthrough_filtered:
+        return out, keep | filtered, phased
+    return phased, keep.loc[~filtered], phased
+
+
+# Column header written when no SV produced any row.
+_EMPTY_RESULT_COLUMNS = [
+    "chrom",
+    "pos",
+    "end",
+    "id",
+    "alt",
+    "svtype",
+    "n1",
+    "n2",
+    "gt",
+    "gq",
+    "gq_label",
+]
+
+
+class _PhasedOutputs:
+    """Incremental writer for the kept CSV, dropped CSV and phased VCF.
+
+    Chunks must arrive in output order; each one is normalized, split by the
+    support filter and appended, so no merged frame is ever materialized.
+    Rows that failed the ``--include`` filter are dropped, or with
+    *passthrough_filtered* kept unphased regardless of support.
+    """
+
+    def __init__(
+        self,
+        *,
+        out_dir: Path,
+        stem: str,
+        in_vcf: Path,
+        bins: list[GQBin],
+        min_support: int,
+        svp_info: bool,
+        passthrough_filtered: bool = False,
+        records: Iterable[Variant] | None = None,
+        contig_records: ContigRecords | None = None,
+    ) -> None:
+        self.bins = bins
+        self.min_support = min_support
+        self.passthrough_filtered = passthrough_filtered
+        self.dropped_csv = out_dir / f"{stem}_dropped_svs.csv"
+        self.out_csv = out_dir / f"{stem}_phased.csv"
+        self.out_vcf = out_dir / f"{stem}_phased.vcf"
+
+        self.n_kept = 0
+        self.n_dropped = 0
+        self.n_filtered = 0
+        self._n_phased = 0
+        self._n_ambig = 0
+        self._tagged: list[np.ndarray] = []
+        self._header_written = False
+
+        self._kept_fh = open(self.out_csv, "w", newline="")
+        self._dropped_fh = open(self.dropped_csv, "w", newline="")
+        self._vcf = _PhasedVcfWriter(
+            self.out_vcf,
+            in_vcf,
+            gqbin_in_header=bool(bins),
+            svp_info_in_header=svp_info,
+            svp_info=svp_info,
+            records=records,
+            contig_records=contig_records,
+        )
+
+    def write(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        out = _ensure_required_columns(df, bins=self.bins, warn=False, copy=False)
+        n_rows = len(out)
+        out, keep, phased = _split_kept(out, self.min_support, self.passthrough_filtered)
+        self.n_filtered += n_rows - len(phased)
+
+        header = not self._header_written
+        out.loc[~keep].to_csv(self._dropped_fh, index=False, header=header)
+        kept = out.loc[keep]
+        kept.to_csv(self._kept_fh, index=False, header=header)
+        self._vcf.write(kept)
+        self._header_written = True
+
+        self.n_kept += len(kept)
+        self.n_dropped += int((~keep).sum())
+        self._n_phased += len(phased)
+        self._n_ambig += int((phased["gt"] == "./.").sum())
+        if "tagged_total" in phased.columns:
+            tagged = pd.to_numeric(phased["tagged_total"], errors="coerce").fillna(0)
+            self._tagged.append(tagged.to_numpy())
+
+    def close(self) -> None:
+        if not self._header_written:
+            empty = pd.DataFrame(columns=_EMPTY_RESULT_COLUMNS)
+            empty.to_csv(self._dropped_fh, index=False)
+            empty.to_csv(self._kept_fh, index=False)
+        self._kept_fh.close()
+        self._dropped_fh.close()
+        self._vcf.close()
+
+    def __enter__(self) -> _PhasedOutputs:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def log_summary(self) -> None:
+        if self._tagged and self._n_phased:
+            med_tagged = float(np.median(np.concatenate(self._tagged)))
+            _warn_if_suspicious_stats(self._n_ambig / self._n_phased, med_tagged)
+
+        if self.n_filtered:
+            logger.info(
+                "Record filter: %d SVs %s",
+                self.n_filtered,
+                "passed through unphased" if self.passthrough_filtered else "excluded",
+            )
+        logger.info("Dropped SVs → %s (%d SVs)", self.dropped_csv, self.n_dropped)
+        if self.n_dropped:
+            logger.info("Support filter removed %d SVs", self.n_dropped)
+        logger.info("CSV → %s (%d SVs)", self.out_csv, self.n_kept)
+        logger.info("VCF → %s", self.out_vcf)
+
+
+def _lookup_sources(
+    sv_vcf: Path,
+    contigs: Sequence[str],
+    selection: RecordSelection,
+    contig_records: ContigRecords | None = None,
+) -> dict[str, Any]:
+    """Where the phased-VCF writer reads input INFO fields from."""
+    if contig_records is not None:
+        return {"contig_records": contig_records}
+    if not selection.restricted:
+        return {}
+    if _has_tabix_index(sv_vcf):
+        return {"contig_records": lambda chrom: selection.records(sv_vcf, [chrom])}
+    return {"records": selection.records(sv_vcf, contigs)}
+
+
+def _vcf_header(in_vcf: Path) -> tuple[list[str], str]:
+    """Header lines and first sample name, without reading any records."""
+    rdr = Reader(str(in_vcf))
+    raw_header_lines = rdr.raw_header.strip().splitlines()
+    sample_name = rdr.samples[0] if rdr.samples else "SAMPLE"
+    rdr.close()
+    return raw_header_lines, sample_name
+
+
+def _iter_vcf_records(in_vcf: Path) -> Iterator[Variant]:
+    rdr = Reader(str(in_vcf))
+    try:
+        yield from rdr
+    finally:
+        rdr.close()
+
+
+def _vcf_info_lookup(
+    records: Iterable[Variant],
+) -> tuple[dict[SVKey, VcfRec], dict[SVKeyLegacy, list[SVKey]]]:
+    """Index input records by full and legacy key (one pass)."""
+    full_lookup: dict[SVKey, VcfRec] = {}
+    legacy_index: dict[SVKeyLegacy, list[SVKey]] = {}
+
+    for rec in records:
+        chrom = rec.CHROM
+        pos = int(rec.POS)
+        vid = _normalize_vcf_id(rec.ID)
+        end = int(rec.end) if getattr(rec, "end", None) is not None else int(pos)
+        alt = ",".join(rec.ALT) if rec.ALT else "<N>"
+
+        info_dict: dict[str, Any] = {}
+        for k in rec.INFO:
+            info_key = k[0] if isinstance(k, tuple) else k
+            v = rec.INFO.get(info_key)
+            if v is not None:
+                info_dict[info_key] = v
+
+        fkey: SVKey = (chrom, pos, vid, end, alt)
+        lkey: SVKeyLegacy = (chrom, pos, vid)
+
+        full_lookup[fkey] = {
+            "REF": rec.REF,
+            "ALT": alt,
+            "QUAL": rec.QUAL if rec.QUAL is not None else ".",
+            "FILTER": rec.FILTER if rec.FILTER else "PASS",
+            "INFO": info_dict,
+        }
+        legacy_index.setdefault(lkey, []).append(fkey)
+
+    return full_lookup, legacy_index
+
+
+def _write_headers(
+    out: TextIO,
+    raw_header_lines: list[str],
+    sample_name: str,
+    *,
+    gqbin_in_header: bool,
+    svp_info_in_header: bool,
+) -> None:
+    """Write preserved meta headers + ensure GT/GQ/GQBIN, then column header."""
+    _write_meta_headers(
+        out,
+        raw_header_lines,
+        gqbin_in_header=gqbin_in_header,
+        svp_info_in_header=svp_info_in_header,
+    )
+    out.write("#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\t" + sample_name + "\n")
+
+
+def _write_meta_headers(
+    out: TextIO,
+    raw_header_lines: list[str],
+    *,
+    gqbin_in_header: bool,
+    svp_info_in_header: bool,
+) -> None:
+    """Write preserved ``##`` meta headers + ensure GT/GQ/GQBIN/SVP declarations."""
+    have_gt = any("##FORMAT=<ID=GT" in ln for ln in raw_header_lines)
+    have_gq = any("##FORMAT=<ID=GQ" in ln for ln in raw_header_lines)
+    have_gqbin = any("##INFO=<ID=GQBIN" in ln for ln in raw_header_lines)
+    have_svp_hp1 = any("##INFO=<ID=SVP_HP1" in ln for ln in raw_header_lines)
+
+    for line in raw_header_lines:
+        if line.startswith("##"):
+            out.write(line.rstrip() + "\n")
+
+    if not have_gt:
+        out.write('##FORMAT=<ID=GT,Number=1,Type=String,Description="Phased genotype">\n')
+    if not have_gq:
+        out.write(
+            "##FORMAT=<ID=GQ,Number=1,Type=Integer," 'Description="Genotype Quality (Phred)">\n'
+        )
+    if gqbin_in_header and not have_gqbin:
+        out.write(
+            "##INFO=<ID=GQBIN,Number=1,Type=String," 'Description="GQ bin label from SvPhaser">\n'
+        )
+
+    if svp_info_in_header and not have_svp_hp1:
+        info_lines = [
+            (
+                "SVP_MODE",
+                "String",
+                "SvPhaser: evidence mode used " "(RNAMES_VALIDATED/HEURISTIC/RNAMES)",
+            ),
+            ("SVP_HP1", "Integer", "SvPhaser: HP=1 supporting reads"),
+            ("SVP_HP2", "Integer", "SvPhaser: HP=2 supporting reads"),
+            ("SVP_NOHP", "Integer", "SvPhaser: supporting reads without HP tag"),
+            (
+                "SVP_SUPPORT",
+                "Integer",
+                "SvPhaser: total supporting reads (HP1+HP2+NO_HP)",
+            ),
+            (
+                "SVP_TAGGED",
+                "Integer",
+                "SvPhaser: supporting reads with HP tag (HP1+HP2)",
+            ),
+            (
+                "SVP_TAGFRAC",
+                "Float",
+                "SvPhaser: fraction of supporting reads that are HP-tagged",
+            ),
+            (
+                "SVP_DELTA",
+                "Float",
+                "SvPhaser: |HP1-HP2|/(HP1+HP2) on tagged support",
+            ),
+            ("SVP_REASON", "String", "SvPhaser: decision reason code"),
+            (
+                "SVP_FETCHW",
+                "Integer",
+                "SvPhaser: fetch window (bp) used around breakpoints",
+            ),
+            (
+                "SVP_BPWIN",
+                "Integer",
+                "SvPhaser: breakpoint tolerance window (bp) " "used in evidence checks",
+            ),
+            (
+                "SVP_RNAMES_TOTAL",
+                "Integer",
+                "SvPhaser: RNAMES count in input VCF (if present)",
+            ),
+            (
+                "SVP_RNAMES_FOUND",
+                "Integer",
+                "SvPhaser: RNAMES found in BAM fetch window",
+            ),
+        ]
+        for info_id, info_type, desc in info_lines:
+            out.write(f"##INFO=<ID={info_id},Number=1,Type={info_type}," f'Description="{desc}">\n')
+
+
+def _vcf_safe_value(v: Any) -> str:
+    """Serialize a Python value into a VCF-compliant INFO value string.
+
+    Handles tuples, lists, numpy arrays, floats, and scalars.
+    Sequences are joined with commas (no spaces, no brackets).
+    """
+    if isinstance(v, (tuple, list)):
+        return ",".join(_vcf_safe_value(x) for x in v)
+    if hasattr(v, "tolist"):
+        return ",".join(_vcf_safe_value(x) for x in v.tolist())
+    if isinstance(v, float):
+        return f"{v:g}"
+    return str(v)
+
+
+def _compose_info_str(
+    orig_info: dict[str, Any],
+    svtype: Any,
+    gq_label: Any,
+    svp_fields: dict[str, Any] | None,
+) -> str:
+    """Compose INFO with SVTYPE first, proper FLAG handling, then SvPhaser fields."""
+    items: list[str] = []
+
+    if svtype:
+        items.append(f"SVTYPE={svtype}")
+
+    for k, v in orig_info.items():
+        if k == "SVTYPE":
+            continue
+        if v is None:
+            continue
+        if v is True:
+            items.append(str(k))
+        else:
+            items.append(f"{k}={_vcf_safe_value(v)}")
+
+    if not _is_missing_scalar(gq_label):
+        items.append(f"GQBIN={gq_label}")
+
+    if svp_fields:
+        order = [
+            "SVP_MODE",
+            "SVP_HP1",
+            "SVP_HP2",
+            "SVP_NOHP",
+            "SVP_SUPPORT",
+            "SVP_TAGGED",
+            "SVP_TAGFRAC",
+            "SVP_DELTA",
+            "SVP_REASON",
+            "SVP_FETCHW",
+            "SVP_BPWIN",
+            "SVP_RNAMES_TOTAL",
+            "SVP_RNAMES_FOUND",
+        ]
+        for k in order:
+            if k not in svp_fields:
+                continue
+            v = svp_fields[k]
+            if _is_missing_scalar(v):
+                continue
+            if isinstance(v, float):
+                items.append(f"{k}={v:.6g}")
+            else:
+                items.append(f"{k}={v}")
+
+    return ";".join(items) if items else "."
+
+
+def _match_full_key(
+    full_lookup: dict[SVKey, VcfRec],
+    *,
+    chrom: str,
+    pos: int,
+    vid: str,
+    end: int | None,
+    alt: str | None,
+) -> VcfRec | None:
+    """Try exact full-key lookup."""
+    if end is None or alt is None:
+        return None
+    return full_lookup.get((chrom, pos, vid, end, alt))
+
+
+def _match_legacy_key(
+    full_lookup: dict[SVKey, VcfRec],
+    legacy_index: dict[SVKeyLegacy, list[SVKey]],
+    *,
+    chrom: str,
+    pos: int,
+    vid: str,
+    end: int | None,
+) -> VcfRec | None:
+    """Try legacy lookup by (chrom, pos, vid), optionally narrowing by end."""
+    candidates = legacy_index.get((chrom, pos, vid), [])
+    if not candidates:
+        return None
+
+    if len(candidates) == 1:
+        return full_lookup[candidates[0]]
+
+    if end is None:
+        return None
+
+    end_matches = [key for key in candidates if key[3] == end]
+    if len(end_matches) == 1:
+        return full_lookup[end_matches[0]]
+
+    return None
+
+
+def _match_missing_id_fallback(
+    full_lookup: dict[SVKey, VcfRec],
+    *,
+    chrom: str,
+    pos: int,
+    end: int | None,
+    alt: str | None,
+) -> VcfRec | None:
+    """Fallback for callers that omit IDs: match by chrom/pos/end/alt only."""
+    if end is None or alt is None:
+        return None
+
+    matches = [
+        rec
+        for (f_chrom, f_pos, _f_vid, f_end, f_alt), rec in full_lookup.items()
+        if f_chrom == chrom and f_pos == pos and f_end == end and f_alt == alt
+    ]
+    if len(matches) == 1:
+        return matches[0]
+    return None
+
+
+def _select_info_record(
+    full_lookup: dict[SVKey, VcfRec],
+    legacy_index: dict[SVKeyLegacy, list[SVKey]],
+    *,
+    chrom: str,
+    pos: int,
+    vid: str,
+    end: int | None,
+    alt: str | None,
+) -> VcfRec | None:
+    """Pick the best matching input VCF record for this phased row."""
+    hit = _match_full_key(
+        full_lookup,
+        chrom=chrom,
+        pos=pos,
+        vid=vid,
+        end=end,
+        alt=alt,
+    )
+    if hit is not None:
+        return hit
+
+    hit = _match_legacy_key(
+        full_lookup,
+        legacy_index,
+        chrom=chrom,
+        pos=pos,
+        vid=vid,
+        end=end,
+    )
+    if hit is not None:
+        return hit
+
+    if vid == ".":
+        return _match_missing_id_fallback(
+            full_lookup,
+            chrom=chrom,
+            pos=pos,
+            end=end,
+            alt=alt,
+        )
+
+    return None
+
+
+class _PhasedVcfWriter:
+    """Phased VCF writer that accepts rows chunk by chunk, in output order.
+
+    The INFO lookup covers *records* (default: every input record).  With
+    *contig_records* it is instead built for one contig at a time, from the
+    records that callable yields for it.
+    """
+
+    def __init__(
+        self,
+        out_vcf: Path,
+        in_vcf: Path,
+        *,
+        gqbin_in_header: bool,
+        svp_info_in_header: bool,
+        svp_info: bool,
+        records: Iterable[Variant] | None = None,
+        contig_records: ContigRecords | None = None,
+    ) -> None:
+        self.svp_info = svp_info
+        self.contig_records = contig_records
+        self._lookup_chrom: str | None = None
+        raw_header_lines, sample_name = _vcf_header(in_vcf)
+        if contig_records is None:
+            self.full_lookup, self.legacy_index = _vcf_info_lookup(
+                _iter_vcf_records(in_vcf) if records is None else records
+            )
+        else:
+            self.full_lookup, self.legacy_index = {}, {}
+        self._fh = open(out_vcf, "w", newline="")
+        self._write_header(
+            raw_header_lines,
+            sample_name,
+            gqbin_in_header=gqbin_in_header,
+            svp_info_in_header=svp_info_in_header,
+        )
+
+    def _write_header(
+        self,
+        raw_header_lines: list[str],
+        sample_name: str,
+        *,
+        gqbin_in_header: bool,
+        svp_info_in_header: bool,
+    ) -> None:
+        _write_headers(
+            self._fh,
+            raw_header_lines,
+            sample_name,
+            gqbin_in_header=gqbin_in_header,
+            svp_info_in_header=svp_info_in_header,
+        )
+
+    def _load_contig(self, chrom: str) -> None:
+        """Swap in the INFO lookup of *chrom* (per-contig mode only)."""
+        if self.contig_records is None or chrom == self._lookup_chrom:
+            return
+        self._lookup_chrom = chrom
+        self.full_lookup, self.legacy_index = _vcf_info_lookup(self.contig_records(chrom))
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Write phased rows with ensured GT/GQ and optional SvPhaser INFO."""
+        svp_info = self.svp_info
+        if not df.empty:
+            self._load_contig(str(df["chrom"].iloc[0]))
+
+        for row in df.itertuples(index=False):
+            chrom = str(getattr(row, "chrom", ".")).strip()
+            pos = int(getattr(row, "pos", 0))
+
+            raw_vid = getattr(row, "id", ".")
+            vid = _normalize_vcf_id(raw_vid)
+
+            raw_end = getattr(row, "end", None)
+            end = _normalize_optional_int(raw_end)
+
+            raw_alt = getattr(row, "alt", None)
+            alt = _normalize_optional_str(raw_alt)
+
+            gt = str(getattr(row, "gt", "./."))
+            gq = str(getattr(row, "gq", "0"))
+            svtype = getattr(row, "svtype", None)
+            gq_label = getattr(row, "gq_label", None)
+
+            info = _select_info_record(
+                self.full_lookup,
+                self.legacy_index,
+                chrom=chrom,
+                pos=pos,
+                vid=vid,
+                end=end,
+                alt=alt,
+            )
+            if info is None:
+                logger.warning(
+                    "Could not uniquely match VCF record for " "%s:%s id=%s end=%s alt=%s",
+                    chrom,
+                    pos,
+                    vid,
+                    end,
+                    alt,
+                )
+                continue
+
+            svp_fields = None
+            if svp_info:
+                svp_fields = {
+                    "SVP_MODE": getattr(row, "mode", None),
+                    "SVP_HP1": int(getattr(row, "n1", 0) or 0),
+                    "SVP_HP2": int(getattr(row, "n2", 0) or 0),
+                    "SVP_NOHP": int(getattr(row, "nohp", 0) or 0),
+                    "SVP_SUPPORT": int(getattr(row, "support_total", 0) or 0),
+                    "SVP_TAGGED": int(getattr(row, "tagged_total", 0) or 0),
+                    "SVP_TAGFRAC": float(getattr(row, "tag_frac", 0.0) or 0.0),
+                    "SVP_DELTA": float(getattr(row, "delta", 0.0) or 0.0),
+                    "SVP_REASON": getattr(row, "reason", None),
+                    "SVP_FETCHW": int(getattr(row, "fetch_w", 0) or 0),
+                    "SVP_BPWIN": int(getattr(row, "bp_tol", getattr(row, "bp_window", 0)) or 0),
+                    "SVP_RNAMES_TOTAL": int(getattr(row, "rnames_total", 0) or 0),
+                    "SVP_RNAMES_FOUND": int(getattr(row, "rnames_found", 0) or 0),
+                }
+
+            info_str = _compose_info_str(info["INFO"], svtype, gq_label, svp_fields)
+
+            fields = [
+                chrom,
+                str(pos),
+                vid,
+                str(info["REF"]),
+                str(info["ALT"]),
+                str(info["QUAL"]),
+                str(info["FILTER"]),
+                info_str,
+                "GT:GQ",
+                f"{gt}:{gq}",
+            ]
+            self._fh.write("\t".join(fields) + "\n")
+
+
+def _write_phased_vcf(
+    out_vcf: Path,
+    in_vcf: Path,
+    df: pd.DataFrame,
+    *,
+    gqbin_in_header: bool,
+    svp_info_in_header: bool,
+    svp_info: bool,
+) -> None:
+    """Write a phased VCF with ensured GT/GQ and optional SvPhaser INFO."""
+    writer = _PhasedVcfWriter(
+        out_vcf,
+        in_vcf,
+        gqbin_in_header=gqbin_in_header,
+        svp_info_in_header=svp_info_in_header,
+        svp_info=svp_info,
+    )
+    try:
+        writer.write(df)
+    finally:
+        writer.close()
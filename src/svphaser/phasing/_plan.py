@@ -0,0 +1,228 @@
+"""svphaser.phasing._plan
+======================
+Dry-run planner (``svphaser plan``): workload, run time and memory estimates.
+
+Nothing touches the BAM's reads.  The VCF is parsed into the SV table (the
+same quick, BAM-free scan a real run starts with) and the BAM index
+statistics give mapped reads per contig.  Per contig the plan reports the
+SV count per SVTYPE, fetch windows and their summed span, the reads those
+windows are expected to cover, and the task cost from the scheduler's cost
+model (calibrated from a metrics TSV when one is given).
+
+Wall time is the parent's per-record overhead (parse, INFO lookup, output)
+plus the longest-first makespan of the contig tasks.  Memory is the
+parent's plus one worker's peak per process; the per-SV figures were
+measured on synthetic data and are rough.  The recommended process count
+is the smallest that gets within 5% of the wall time at ``threads``: the
+largest contig bounds a run, so more processes only sit idle, and
+processes beyond the usable cores (affinity mask and cgroup CPU quota)
+only time-share them; it also fits the cgroup memory limit.  BAM decoding
+runs inside each worker, so there is no separate I/O thread pool to size.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import Counter
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from cyvcf2 import Reader
+
+from ._filters import RecordFilter
+from ._options import EvidenceOptions
+from ._regions import RecordSelection
+from ._resources import (
+    PARENT_BYTES_PER_SV,
+    PROCESS_BASE_BYTES,
+    WORKER_BYTES_PER_SV,
+    ResourceLimits,
+    detect_limits,
+)
+from ._schedule import (
+    CostModel,
+    _reads_estimate,
+    bam_read_stats,
+    contig_stats,
+    load_cost_model,
+    makespan,
+)
+from ._svtable import build_sv_table
+
+__all__ = ["format_plan", "make_plan", "write_plan"]
+
+logger = logging.getLogger(__name__)
+
+# Parent time per record outside the tasks (parse, INFO lookup, writing).
+OVERHEAD_SECONDS_PER_SV = 7.5e-5
+# Fewest processes whose wall time is within this factor of the requested count's.
+_RECOMMEND_SLACK = 1.05
+
+
+def _index_bytes(bam: Path) -> int:
+    for index in (Path(f"{bam}.bai"), bam.with_suffix(".bai"), Path(f"{bam}.csi")):
+        if index.exists():
+            return index.stat().st_size
+    return 0
+
+
+def _wall_seconds(costs: list[float], n_svs: int, processes: int, cores: int) -> float:
+    # Processes beyond the usable cores time-share them.
+    return n_svs * OVERHEAD_SECONDS_PER_SV + makespan(costs, min(processes, cores))
+
+
+def make_plan(
+    sv_vcf: Path,
+    bam: Path,
+    *,
+    threads: int,
+    cost_model: Path | None = None,
+    bp_window: int = 100,
+    dynamic_window: bool = True,
+    regions: str | Path | None = None,
+    exclude_regions: str | Path | None = None,
+    chroms: Sequence[str] | None = None,
+    include: str | None = None,
+    limits: ResourceLimits | None = None,
+) -> dict[str, Any]:
+    """Plan report for phasing *sv_vcf* against *bam* on *threads* workers.
+
+    The options are the :func:`~svphaser.phasing.io.phase_vcf` options
+    that change which records are phased or how wide their windows are.
+    The usable cores in *limits* (default: detected, see
+    :mod:`~svphaser.phasing._resources`) cap the effective parallelism, and
+    its memory limit caps the recommended process count.
+    """
+    limits = limits or detect_limits()
+    cores = limits.cores
+    opts = EvidenceOptions(bp_window=bp_window, dynamic_window=dynamic_window).worker_opts()
+    selection = RecordSelection.from_options(regions, exclude_regions, chroms)
+    record_filter = None if include is None else RecordFilter(include)
+    rdr = Reader(str(sv_vcf))
+    contigs = selection.filter_contigs(rdr.seqnames)
+    rdr.close()
+    table = build_sv_table(sv_vcf, contigs, opts, selection=selection, record_filter=record_filter)
+    # Records failing --include cost no BAM work.
+    filtered = table.arrays["filtered"]
+    n_filtered = int(filtered.sum())
+    if n_filtered:
+        table = table.take(np.flatnonzero(~filtered))
+    stats = contig_stats(table)
+    read_stats = bam_read_stats(bam)
+    model = load_cost_model(cost_model) if cost_model is not None else CostModel()
+
+    rows: list[dict[str, Any]] = []
+    for chrom in contigs:
+        st = stats.get(chrom)
+        if st is None:
+            continue
+        mapped, length = read_stats.get(chrom, (0, 0))
+        rows.append(
+            {
+                "chrom": chrom,
+                "n_svs": st.n_svs,
+                "svtypes": dict(sorted(st.svtype_counts.items())),
+                "windows": st.n_windows,
+                "window_bp": st.window_bp,
+                "reads_est": round(_reads_estimate(st, mapped, length)),
+                "est_seconds": round(model.estimate(st, mapped, length), 3),
+            }
+        )
+
+    n_svs = sum(r["n_svs"] for r in rows)
+    costs = [r["est_seconds"] for r in rows]
+    largest = max((r["n_svs"] for r in rows), default=0)
+    parent = PROCESS_BASE_BYTES + table.nbytes + n_svs * PARENT_BYTES_PER_SV
+    worker = PROCESS_BASE_BYTES + _index_bytes(bam) + largest * WORKER_BYTES_PER_SV
+    wall = _wall_seconds(costs, n_svs, threads, cores)
+    # limits.workers() is also capped by the cgroup memory limit.
+    processes = next(
+        p
+        for p in range(1, max(1, min(threads, len(rows), limits.workers(worker, parent))) + 1)
+        if _wall_seconds(costs, n_svs, p, cores) <= wall * _RECOMMEND_SLACK
+    )
+    workers = min(threads, len(rows))
+    svtypes: Counter[str] = Counter()
+    for r in rows:
+        svtypes.update(r["svtypes"])
+
+    return {
+        "inputs": {
+            "vcf": str(sv_vcf),
+            "bam": str(bam),
+            "threads": threads,
+            "cores": cores,
+            "memory_limit_bytes": limits.memory_bytes,
+            "cost_model": None if cost_model is None else str(cost_model),
+            "bam_index_stats": bool(read_stats),
+        },
+        "contigs": rows,
+        "totals": {
+            "n_svs": n_svs,
+            "filtered_svs": n_filtered,
+            "svtypes": dict(sorted(svtypes.items())),
+            "windows": sum(r["windows"] for r in rows),
+            "window_bp": sum(r["window_bp"] for r in rows),
+            "reads_est": sum(r["reads_est"] for r in rows),
+            "est_task_seconds": round(sum(costs), 3),
+        },
+        "estimate": {
+            "wall_seconds": round(wall, 3),
+            "processes": workers,
+            "parent_bytes": parent,
+            "worker_bytes": worker,
+            "peak_memory_bytes": parent + workers * worker,
+        },
+        "recommendation": {
+            "processes": processes,
+            "wall_seconds": round(_wall_seconds(costs, n_svs, processes, cores), 3),
+            "peak_memory_bytes": parent + processes * worker,
+            "spare_cores": max(0, threads - processes),
+        },
+    }
+
+
+def _human(n_bytes: int) -> str:
+    size = float(n_bytes)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def format_plan(plan: dict[str, Any]) -> str:
+    """Human-readable summary of a plan report."""
+    lines = [f"{'contig':<12} {'SVs':>8} {'windows':>8} {'reads_est':>10} {'est_s':>9}  SVTYPEs"]
+    for r in plan["contigs"]:
+        types = ",".join(f"{t}={n}" for t, n in r["svtypes"].items())
+        lines.append(
+            f"{r['chrom']:<12} {r['n_svs']:>8} {r['windows']:>8} {r['reads_est']:>10} "
+            f"{r['est_seconds']:>9.2f}  {types}"
+        )
+    t, est, rec = plan["totals"], plan["estimate"], plan["recommendation"]
+    calibrated = "calibrated" if plan["inputs"]["cost_model"] else "default cost model"
+    lines += [
+        f"{'total':<12} {t['n_svs']:>8} {t['windows']:>8} {t['reads_est']:>10} "
+        f"{t['est_task_seconds']:>9.2f}",
+        "",
+        f"threads={plan['inputs']['threads']} on {plan['inputs']['cores']} usable cores: "
+        f"~{est['wall_seconds']:.1f} s wall, "
+        f"peak ~{_human(est['peak_memory_bytes'])} ({calibrated})",
+        f"recommended: {rec['processes']} processes: ~{rec['wall_seconds']:.1f} s wall, "
+        f"peak ~{_human(rec['peak_memory_bytes'])}, {rec['spare_cores']} spare cores",
+    ]
+    limit = plan["inputs"]["memory_limit_bytes"]
+    if limit is not None and est["peak_memory_bytes"] > limit:
+        lines.append(f"note: peak exceeds the cgroup memory limit ({_human(limit)})")
+    if not plan["inputs"]["bam_index_stats"]:
+        lines.append("note: no BAM index statistics; read counts are unknown")
+    return "\n".join(lines)
+
+
+def write_plan(path: Path, plan: dict[str, Any]) -> None:
+    path.write_text(json.dumps(plan, indent=2) + "\n")
+    logger.info("Plan → %s", path)
@@ -0,0 +1,225 @@
+"""svphaser.phasing._preview
+=========================
+Preview runs (``--sample-fraction`` / ``--sample-n``).
+
+A deterministic subset of the SV table goes through the normal engine and
+the result is summarized instead of written out.  Sampling is stratified by
+(contig, SVTYPE): the sample size is split over strata in proportion to
+their size (largest remainder), and each stratum keeps the rows with the
+smallest hash of their SV key (chrom, pos, id, alt).  The same inputs and
+sample size therefore always select the same SVs, independent of threads.
+
+The report gives the reason-code and genotype distribution, tag_frac
+quantiles and an estimate of the full run's cost: each contig's measured
+task time scaled by its full/sampled SV ratio, plus the wall time those
+tasks would take on the given number of workers (longest-first packing).
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ._results import RESULT_COLUMNS
+from ._schedule import makespan
+from ._svtable import SVTable
+from ._workers import FILTERED_REASON
+
+__all__ = ["PreviewSample", "summarize_preview", "write_preview"]
+
+logger = logging.getLogger(__name__)
+
+_HASH_SCALE = float(2**64)
+
+
+def _row_hash(table: SVTable, i: int, chrom: str) -> float:
+    key = "\t".join(
+        (
+            chrom,
+            str(int(table.arrays["pos"][i])),
+            table.str_at("id", i) or ".",
+            table.str_at("alt", i) or "",
+        )
+    )
+    return (
+        int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big") / _HASH_SCALE
+    )
+
+
+def _hash_order(table: SVTable, chrom: str, i: int) -> tuple[float, int]:
+    return _row_hash(table, i, chrom), i
+
+
+def _allocate(sizes: list[int], target: int) -> list[int]:
+    """Split *target* over strata of *sizes* proportionally (largest remainder)."""
+    total = sum(sizes)
+    if total == 0:
+        return [0] * len(sizes)
+    target = min(target, total)
+    exact = [target * n / total for n in sizes]
+    alloc = [int(x) for x in exact]
+    by_remainder = sorted(range(len(sizes)), key=lambda i: (-(exact[i] - alloc[i]), i))
+    for i in by_remainder[: target - sum(alloc)]:
+        alloc[i] += 1
+    return alloc
+
+
+@dataclass(slots=True)
+class PreviewSample:
+    """Sample size for a preview run, plus what the run measured."""
+
+    fraction: float | None = None
+    n: int | None = None
+    totals: dict[str, int] = field(default_factory=dict)
+    sampled: dict[str, int] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if (self.fraction is None) == (self.n is None):
+            raise ValueError("Give exactly one of a sample fraction or a sample size.")
+        if self.fraction is not None and not 0 < self.fraction <= 1:
+            raise ValueError(f"Sample fraction must be in (0, 1], got {self.fraction}.")
+        if self.n is not None and self.n < 1:
+            raise ValueError(f"Sample size must be positive, got {self.n}.")
+
+    def target(self, n_total: int) -> int:
+        """Number of SVs to sample out of *n_total* (at least one)."""
+        if self.n is not None:
+            return self.n
+        assert self.fraction is not None  # __post_init__: exactly one is set
+        return max(1, round(self.fraction * n_total))
+
+    def rows(self, table: SVTable) -> np.ndarray:
+        """Ascending table rows of the stratified, hash-ordered sample."""
+        strata: dict[tuple[str, int], list[int]] = {}
+        for chrom, (lo, hi) in table.contig_ranges.items():
+            self.totals[chrom] = hi - lo
+            codes = table.arrays["svtype"][lo:hi]
+            for i, code in enumerate(codes.tolist(), start=lo):
+                strata.setdefault((chrom, code), []).append(i)
+
+        keys = list(strata)
+        alloc = _allocate([len(strata[k]) for k in keys], self.target(sum(self.totals.values())))
+
+        chosen: list[int] = []
+        for (chrom, _code), k in zip(keys, alloc):
+            if k == 0:
+                continue
+            members = strata[(chrom, _code)]
+            members.sort(key=functools.partial(_hash_order, table, chrom))
+            chosen.extend(members[:k])
+        chosen.sort()
+        for chrom, (lo, hi) in table.contig_ranges.items():
+            self.sampled[chrom] = int(np.searchsorted(chosen, hi) - np.searchsorted(chosen, lo))
+        return np.asarray(chosen, dtype=np.int64)
+
+    def apply(self, table: SVTable) -> SVTable:
+        sub = table.take(self.rows(table))
+        logger.info(
+            "Preview: phasing %d of %d SVs", sum(self.sampled.values()), sum(self.totals.values())
+        )
+        return sub
+
+
+def _distribution(values: pd.Series) -> dict[str, Any]:
+    counts = values.astype("object").fillna("NA").value_counts()
+    total = int(counts.sum())
+    return {
+        str(k): {"n": int(v), "frac": round(v / total, 4) if total else 0.0}
+        for k, v in counts.sort_index().items()
+    }
+
+
+def _tag_frac_summary(tag_frac: pd.Series) -> dict[str, Any]:
+    if not len(tag_frac):
+        return {"n": 0, "mean": None, "p10": None, "median": None, "p90": None}
+    p10, p50, p90 = tag_frac.quantile([0.1, 0.5, 0.9]).tolist()
+    return {
+        "n": int(len(tag_frac)),
+        "mean": round(float(tag_frac.mean()), 4),
+        "p10": round(p10, 4),
+        "median": round(p50, 4),
+        "p90": round(p90, 4),
+    }
+
+
+def _full_run_estimates(sample: PreviewSample) -> dict[str, float]:
+    """Estimated full-run task seconds per contig.
+
+    Sampled contigs scale their own timing; contigs with no sampled SVs use
+    the overall per-SV rate of the sample.
+    """
+    n_timed = sum(sample.sampled.get(chrom, 0) for chrom in sample.timings)
+    rate = sum(sample.timings.values()) / n_timed if n_timed else 0.0
+    estimates: dict[str, float] = {}
+    for chrom, total in sample.totals.items():
+        n = sample.sampled.get(chrom, 0)
+        seconds = sample.timings.get(chrom)
+        if n and seconds is not None:
+            estimates[chrom] = seconds * total / n
+        elif total:
+            estimates[chrom] = rate * total
+    return estimates
+
+
+def summarize_preview(
+    frames: list[pd.DataFrame], sample: PreviewSample, *, threads: int, min_support: int
+) -> dict[str, Any]:
+    """Report for a preview run from its result frames."""
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=RESULT_COLUMNS)
+    filtered = df["reason"] == FILTERED_REASON
+    phased = df.loc[~filtered]
+
+    support = pd.to_numeric(phased["support_total"], errors="coerce").fillna(0)
+    tag_frac = pd.to_numeric(phased["tag_frac"], errors="coerce")
+    tag_frac = tag_frac[support > 0]
+
+    estimates = _full_run_estimates(sample)
+    return {
+        "sample": {
+            "fraction": sample.fraction,
+            "n": sample.n,
+            "sampled_svs": sum(sample.sampled.values()),
+            "total_svs": sum(sample.totals.values()),
+        },
+        "filtered_svs": int(filtered.sum()),
+        "kept_svs": int((support >= min_support).sum()),
+        "reason": _distribution(phased["reason"]) if len(phased) else {},
+        "gt": _distribution(phased["gt"]) if len(phased) else {},
+        "svtype": _distribution(phased["svtype"]) if len(phased) else {},
+        "tag_frac": _tag_frac_summary(tag_frac),
+        "cost": {
+            "sample_task_seconds": round(sum(sample.timings.values()), 3),
+            "est_full_task_seconds": round(sum(estimates.values()), 3),
+            "est_full_wall_seconds": round(makespan(list(estimates.values()), threads), 3),
+            "threads": threads,
+        },
+    }
+
+
+def write_preview(path: Path, report: dict[str, Any]) -> None:
+    """Write *report* as JSON and log its headline numbers."""
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    reasons = ", ".join(f"{k}={v['frac']:.0%}" for k, v in report["reason"].items())
+    logger.info(
+        "Preview: %d/%d SVs phased; reasons: %s",
+        report["sample"]["sampled_svs"],
+        report["sample"]["total_svs"],
+        reasons or "none",
+    )
+    logger.info("Preview: median tag_frac %s", report["tag_frac"]["median"])
+    logger.info(
+        "Preview: estimated full run %.1f s of task time, ~%.1f s wall on %d workers",
+        report["cost"]["est_full_task_seconds"],
+        report["cost"]["est_full_wall_seconds"],
+        report["cost"]["threads"],
+    )
+    logger.info("Preview report → %s", path)
@@ -0,0 +1,222 @@
+"""svphaser.phasing._regions
+=========================
+Region restriction (``--regions``, ``--exclude-regions``, ``--chrom``).
+
+Selection is pushed down to VCF access: with a tabix/CSI index only the
+records overlapping the requested regions are parsed, and since only those
+records enter the SV table, only their BAM windows are fetched.  Without an
+index the VCF is scanned once and filtered on the fly.
+
+Semantics:
+- include regions keep a record whose reference span ``[POS, END]``
+  overlaps any region (the same records a tabix query returns);
+- exclude regions drop a record with either breakpoint (POS or END) inside
+  a region, the usual way SV blacklists are applied;
+- ``--chrom`` limits phasing to the listed contigs.
+
+Region specs are BED files (optionally gzipped; 0-based half-open) or a
+comma/whitespace separated list of ``chrom`` / ``chrom:start-end`` entries
+(1-based inclusive, samtools style).
+"""
+
+from __future__ import annotations
+
+import bisect
+import gzip
+import hashlib
+import json
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from cyvcf2 import Reader, Variant
+
+from ._workers import _has_tabix_index
+
+__all__ = ["RecordSelection", "RegionSet", "parse_regions"]
+
+_WHOLE_CONTIG = 2**62
+_REGION_RE = re.compile(r"^(?P<chrom>[^:]+?)(?::(?P<start>\d+)(?:-(?P<end>\d+))?)?$")
+
+
+@dataclass(slots=True)
+class RegionSet:
+    """Merged, sorted 0-based half-open intervals per contig."""
+
+    starts: dict[str, list[int]] = field(default_factory=dict)
+    ends: dict[str, list[int]] = field(default_factory=dict)
+
+    @classmethod
+    def from_intervals(cls, intervals: Iterable[tuple[str, int, int]]) -> RegionSet:
+        by_chrom: dict[str, list[tuple[int, int]]] = {}
+        for chrom, start, end in intervals:
+            if end <= start:
+                raise ValueError(f"Empty or inverted region {chrom}:{start}-{end}.")
+            by_chrom.setdefault(chrom, []).append((start, end))
+        out = cls()
+        for chrom, ivs in by_chrom.items():
+            ivs.sort()
+            starts: list[int] = []
+            ends: list[int] = []
+            for s, e in ivs:
+                if ends and s <= ends[-1]:
+                    ends[-1] = max(ends[-1], e)
+                else:
+                    starts.append(s)
+                    ends.append(e)
+            out.starts[chrom] = starts
+            out.ends[chrom] = ends
+        return out
+
+    @property
+    def contigs(self) -> list[str]:
+        return list(self.starts)
+
+    def intervals(self, chrom: str) -> list[tuple[int, int]]:
+        return list(zip(self.starts.get(chrom, []), self.ends.get(chrom, [])))
+
+    def overlaps(self, chrom: str, start: int, end: int) -> bool:
+        """True if half-open [start, end) overlaps a region on *chrom*."""
+        starts = self.starts.get(chrom)
+        if not starts:
+            return False
+        i = bisect.bisect_left(starts, end) - 1
+        return i >= 0 and self.ends[chrom][i] > start
+
+    def contains(self, chrom: str, pos0: int) -> bool:
+        return self.overlaps(chrom, pos0, pos0 + 1)
+
+
+def _read_bed(path: Path) -> Iterator[tuple[str, int, int]]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt") as fh:
+        for n, line in enumerate(fh, start=1):
+            if not line.strip() or line.startswith(("#", "track", "browser")):
+                continue
+            cols = line.rstrip("\n").split("\t")
+            try:
+                yield cols[0], int(cols[1]), int(cols[2])
+            except (IndexError, ValueError) as err:
+                raise ValueError(f"{path}:{n}: not a BED interval: {line.strip()!r}") from err
+
+
+def _parse_region_list(spec: str) -> Iterator[tuple[str, int, int]]:
+    for item in re.split(r"[,\s]+", spec.strip()):
+        if not item:
+            continue
+        m = _REGION_RE.match(item)
+        if m is None:
+            raise ValueError(f"Invalid region {item!r}; use chrom or chrom:start-end.")
+        if m.group("start") is None:
+            yield m.group("chrom"), 0, _WHOLE_CONTIG
+            continue
+        start = int(m.group("start"))
+        end = int(m.group("end")) if m.group("end") else start
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid region {item!r}; coordinates are 1-based inclusive.")
+        yield m.group("chrom"), start - 1, end
+
+
+def parse_regions(spec: str | Path) -> RegionSet:
+    """Parse a BED file path or a ``chrom[:start-end]`` list into a RegionSet."""
+    path = Path(spec)
+    if path.is_file():
+        return RegionSet.from_intervals(_read_bed(path))
+    return RegionSet.from_intervals(_parse_region_list(str(spec)))
+
+
+@dataclass(slots=True, frozen=True)
+class RecordSelection:
+    """Which VCF records to phase; an empty selection keeps everything."""
+
+    chroms: tuple[str, ...] | None = None
+    include: RegionSet | None = None
+    exclude: RegionSet | None = None
+
+    @classmethod
+    def from_options(
+        cls,
+        regions: str | Path | None,
+        exclude_regions: str | Path | None,
+        chroms: Sequence[str] | None,
+    ) -> RecordSelection:
+        """Selection from the ``regions`` / ``exclude_regions`` / ``chroms`` options."""
+        return cls(
+            chroms=None if chroms is None else tuple(chroms),
+            include=None if regions is None else parse_regions(regions),
+            exclude=None if exclude_regions is None else parse_regions(exclude_regions),
+        )
+
+    @property
+    def restricted(self) -> bool:
+        return self.chroms is not None or self.include is not None or self.exclude is not None
+
+    def digest(self) -> str | None:
+        """Stable hash of the selection (None when unrestricted), for fingerprints."""
+        if not self.restricted:
+            return None
+        doc = {
+            "chroms": None if self.chroms is None else sorted(self.chroms),
+            "include": None if self.include is None else [self.include.starts, self.include.ends],
+            "exclude": None if self.exclude is None else [self.exclude.starts, self.exclude.ends],
+        }
+        return hashlib.sha256(json.dumps(doc, sort_keys=True).encode()).hexdigest()
+
+    def filter_contigs(self, header_contigs: Sequence[str]) -> tuple[str, ...]:
+        """Header contigs that can hold selected records, in header order."""
+        keep = list(header_contigs)
+        if self.chroms is not None:
+            unknown = sorted(set(self.chroms) - set(keep))
+            if unknown:
+                raise ValueError(f"Contig(s) not in the VCF header: {', '.join(unknown)}")
+            keep = [c for c in keep if c in set(self.chroms)]
+        if self.include is not None:
+            keep = [c for c in keep if c in self.include.starts]
+        return tuple(keep)
+
+    def _excluded(self, rec: Variant) -> bool:
+        if self.exclude is None:
+            return False
+        chrom = rec.CHROM
+        return self.exclude.contains(chrom, rec.start) or self.exclude.contains(chrom, rec.end - 1)
+
+    def _contig_records(self, rdr: Reader, chrom: str) -> Iterator[Variant]:
+        """Indexed access to *chrom*, one query per merged include region."""
+        if self.include is None:
+            yield from rdr(chrom)
+            return
+        prev_end = -1
+        for start, end in self.include.intervals(chrom):
+            query = chrom if end >= _WHOLE_CONTIG else f"{chrom}:{start + 1}-{end}"
+            for rec in rdr(query):
+                # Reported already by the previous (overlapping) region query.
+                if rec.start < prev_end:
+                    continue
+                yield rec
+            prev_end = end
+
+    def records(self, vcf_path: Path, chroms: Sequence[str]) -> Iterator[Variant]:
+        """Selected records of *chroms*: contig by contig when indexed, else one scan."""
+        rdr = Reader(str(vcf_path))
+        try:
+            if _has_tabix_index(vcf_path):
+                stream: Iterable[Variant] = (
+                    rec for chrom in chroms for rec in self._contig_records(rdr, chrom)
+                )
+            else:
+                wanted = set(chroms)
+                stream = (
+                    rec
+                    for rec in rdr
+                    if rec.CHROM in wanted
+                    and (
+                        self.include is None
+                        or self.include.overlaps(rec.CHROM, rec.start, max(rec.end, rec.start + 1))
+                    )
+                )
+            for rec in stream:
+                if not self._excluded(rec):
+                    yield rec
+        finally:
+            rdr.close()
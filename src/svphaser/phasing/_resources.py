@@ -0,0 +1,182 @@
+"""svphaser.phasing._resources
+==========================
+Default worker count from the CPUs and memory this process may actually use.
+
+``os.cpu_count()`` reports the host's cores, even inside a Kubernetes pod or
+a Slurm allocation that grants a fraction of them.  The default therefore
+takes the smallest of:
+- the CPU affinity mask (``sched_getaffinity``; Slurm/taskset cpusets);
+- the cgroup CPU quota (v2 ``cpu.max``, v1 ``cpu.cfs_quota_us`` /
+  ``cpu.cfs_period_us``), rounded down, at least 1;
+- the cgroup memory limit (v2 ``memory.max``, v1
+  ``memory.limit_in_bytes``) divided by a per-worker estimate, after the
+  parent's share.  Each worker opens its own BAM index and buffers its
+  task's results, so a pool sized for the cores alone can be OOM-killed.
+
+Limits are read for the process's own cgroup and every ancestor (the
+tightest wins).  An explicit ``threads`` is always used as given.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+__all__ = ["ResourceLimits", "default_threads", "detect_limits"]
+
+logger = logging.getLogger(__name__)
+
+_MIB = 1 << 20
+# Interpreter plus numpy/pandas/pysam/cyvcf2 (about 81 MiB measured).
+PROCESS_BASE_BYTES = 96 * _MIB
+# Parent: SV table, INFO lookup, reorder buffer and output formatting.
+PARENT_BYTES_PER_SV = 4096
+# Worker: result rows of its task plus per-site read state.
+WORKER_BYTES_PER_SV = 4096
+# Memory set aside per process when the VCF has not been parsed yet; covers
+# the measured ~130 MiB peak of a worker on a 24k-SV contig.
+PARENT_RESERVE_BYTES = 256 * _MIB
+WORKER_RESERVE_BYTES = 160 * _MIB
+# cgroup v1 reports "no limit" as a page-rounded LONG_MAX.
+_V1_UNLIMITED = 1 << 60
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+PROC_CGROUP = Path("/proc/self/cgroup")
+
+
+@dataclass(slots=True)
+class ResourceLimits:
+    """CPUs and memory available to this process."""
+
+    affinity_cpus: int
+    cpu_quota: float | None = None
+    memory_bytes: int | None = None
+
+    @property
+    def cores(self) -> int:
+        """Usable cores: the affinity mask, capped by the CPU quota."""
+        if self.cpu_quota is None:
+            return self.affinity_cpus
+        return max(1, min(self.affinity_cpus, int(self.cpu_quota)))
+
+    def workers(
+        self,
+        worker_bytes: int = WORKER_RESERVE_BYTES,
+        parent_bytes: int = PARENT_RESERVE_BYTES,
+    ) -> int:
+        """Worker processes that fit both the usable cores and the memory limit."""
+        if self.memory_bytes is None:
+            return self.cores
+        return max(1, min(self.cores, (self.memory_bytes - parent_bytes) // worker_bytes))
+
+
+def _affinity_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not on Linux
+        return os.cpu_count() or 1
+
+
+def _own_cgroups(proc_cgroup: Path) -> dict[str, str]:
+    """Controller → cgroup path of this process (``""`` for the v2 hierarchy)."""
+    try:
+        text = proc_cgroup.read_text()
+    except OSError:
+        return {}
+    paths: dict[str, str] = {}
+    for line in text.splitlines():
+        _hier, controllers, path = line.split(":", 2)
+        for controller in controllers.split(",") if controllers else [""]:
+            paths[controller] = path
+    return paths
+
+
+def _lineage(mount: Path, path: str) -> Iterator[Path]:
+    """The process's cgroup directory under *mount* and its ancestors.
+
+    Inside a cgroup namespace the recorded path may not exist under the
+    mount; the mount itself is then the process's cgroup.
+    """
+    here = mount / path.lstrip("/")
+    if not here.is_dir():
+        here = mount
+    while True:
+        yield here
+        if here == mount or mount not in here.parents:
+            return
+        here = here.parent
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def _v2_cpu(d: Path) -> float | None:
+    text = _read(d / "cpu.max")
+    if text is None or text.startswith("max"):
+        return None
+    quota, _, period = text.partition(" ")
+    return int(quota) / int(period or 100_000)
+
+
+def _v1_cpu(d: Path) -> float | None:
+    quota, period = _read(d / "cpu.cfs_quota_us"), _read(d / "cpu.cfs_period_us")
+    if quota is None or period is None or int(quota) < 0:
+        return None
+    return int(quota) / int(period)
+
+
+def _v2_memory(d: Path) -> int | None:
+    text = _read(d / "memory.max")
+    return None if text is None or text == "max" else int(text)
+
+
+def _v1_memory(d: Path) -> int | None:
+    text = _read(d / "memory.limit_in_bytes")
+    return None if text is None or int(text) >= _V1_UNLIMITED else int(text)
+
+
+def _tightest(values: Iterator[float | None]) -> float | None:
+    found = [v for v in values if v is not None]
+    return min(found) if found else None
+
+
+def detect_limits(
+    cgroup_root: Path = CGROUP_ROOT, proc_cgroup: Path = PROC_CGROUP
+) -> ResourceLimits:
+    """Affinity mask plus cgroup (v2, else v1) CPU quota and memory limit."""
+    own = _own_cgroups(proc_cgroup)
+    if (cgroup_root / "cgroup.controllers").exists():  # unified (v2) hierarchy
+        dirs = list(_lineage(cgroup_root, own.get("", "/")))
+        cpu = _tightest(_v2_cpu(d) for d in dirs)
+        memory = _tightest(_v2_memory(d) for d in dirs)
+    else:
+        cpu = _tightest(_v1_cpu(d) for d in _lineage(cgroup_root / "cpu", own.get("cpu", "/")))
+        memory = _tightest(
+            _v1_memory(d) for d in _lineage(cgroup_root / "memory", own.get("memory", "/"))
+        )
+    return ResourceLimits(
+        affinity_cpus=_affinity_cpus(),
+        cpu_quota=cpu,
+        memory_bytes=None if memory is None else int(memory),
+    )
+
+
+def _describe(limits: ResourceLimits) -> str:
+    quota = "none" if limits.cpu_quota is None else f"{limits.cpu_quota:g} CPUs"
+    memory = "none" if limits.memory_bytes is None else f"{limits.memory_bytes // _MIB} MiB"
+    return f"affinity {limits.affinity_cpus} CPUs, cgroup CPU quota {quota}, memory limit {memory}"
+
+
+def default_threads(limits: ResourceLimits | None = None) -> int:
+    """Worker count used when ``threads`` is not given; logs the limits it saw."""
+    limits = limits or detect_limits()
+    workers = limits.workers()
+    logger.info("Default workers: %d (%s)", workers, _describe(limits))
+    return workers
@@ -0,0 +1,246 @@
+"""svphaser.phasing._results
+=========================
+Typed column buffers for worker results.
+
+Workers used to build one 25-key dict per SV and a ``pd.DataFrame(rows)``
+per task, which was then pickled back to the parent.  Instead each task now
+fills preallocated NumPy columns with a fixed schema and returns a
+:class:`ResultBatch`; the parent assembles the frame without any dtype
+inference.
+
+Schema (column order is the output CSV order):
+- int64: pos, svlen, end (coordinates may exceed 2**31 on large genomes)
+- int32: read counts, gq, windows, RNAMES counters
+- float64: delta, tag_frac (kept at full width so CSV/VCF text is unchanged)
+- categorical codes (int16 + per-batch vocabulary): chrom, svtype, gt,
+  reason, mode, in_gt; alt uses int32 codes since sequence-resolved ALTs
+  can be numerous.  Missing values are stored as code -1.
+- object: id (free text, may be missing)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    "RESULT_COLUMNS",
+    "ResultBatch",
+    "ResultBuilder",
+    "concat_batches",
+    "interleave_batches",
+]
+
+_INT64 = ("pos", "svlen", "end")
+_INT32 = (
+    "hp1",
+    "hp2",
+    "nohp",
+    "tagged_total",
+    "support_total",
+    "n1",
+    "n2",
+    "gq",
+    "fetch_w",
+    "bp_tol",
+    "rnames_total",
+    "rnames_found",
+)
+_FLOAT64 = ("delta", "tag_frac")
+_CATEGORICAL = ("chrom", "svtype", "gt", "reason", "mode", "in_gt", "alt")
+_OBJECT = ("id",)
+_OBJECT_BYTES = 64
+
+RESULT_COLUMNS: tuple[str, ...] = (
+    "chrom",
+    "pos",
+    "id",
+    "svtype",
+    "svlen",
+    "end",
+    "alt",
+    "in_gt",
+    "hp1",
+    "hp2",
+    "nohp",
+    "tagged_total",
+    "support_total",
+    "n1",
+    "n2",
+    "gt",
+    "gq",
+    "reason",
+    "delta",
+    "tag_frac",
+    "mode",
+    "fetch_w",
+    "bp_tol",
+    "rnames_total",
+    "rnames_found",
+)
+
+_DTYPES: dict[str, Any] = {
+    **{c: np.int64 for c in _INT64},
+    **{c: np.int32 for c in _INT32},
+    **{c: np.float64 for c in _FLOAT64},
+    **{c: np.int16 for c in _CATEGORICAL},
+    "alt": np.int32,
+    **{c: object for c in _OBJECT},
+}
+
+
+@dataclass(slots=True, frozen=True)
+class ResultBatch:
+    """One task's results: fixed-schema columns plus categorical vocabularies."""
+
+    columns: dict[str, np.ndarray]
+    categories: dict[str, tuple[str, ...]]
+
+    def __len__(self) -> int:
+        return int(self.columns["pos"].shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate in-memory size (object columns counted per reference)."""
+        return sum(
+            col.nbytes + (_OBJECT_BYTES * col.size if col.dtype == object else 0)
+            for col in self.columns.values()
+        )
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> ResultBatch:
+        """Batch from a frame with the result columns (e.g. a phased CSV read back)."""
+        columns: dict[str, np.ndarray] = {}
+        categories: dict[str, tuple[str, ...]] = {}
+        for name in RESULT_COLUMNS:
+            col = df[name]
+            if name in _CATEGORICAL:
+                codes, uniques = pd.factorize(col.astype("object"), use_na_sentinel=True)
+                columns[name] = codes.astype(_DTYPES[name])
+                categories[name] = tuple(str(v) for v in uniques)
+            elif name in _OBJECT:
+                values = col.to_numpy(dtype=object, copy=True)
+                values[pd.isna(values)] = None
+                columns[name] = values
+            else:
+                columns[name] = col.to_numpy(dtype=_DTYPES[name])
+        return cls(columns, categories)
+
+    def take(self, rows: np.ndarray) -> ResultBatch:
+        """Rows *rows* of this batch (vocabularies are shared)."""
+        return ResultBatch({k: v[rows] for k, v in self.columns.items()}, self.categories)
+
+    def to_frame(self, lo: int = 0, hi: int | None = None) -> pd.DataFrame:
+        """Frame of rows [lo, hi) (all rows by default); numeric columns are views."""
+        data: dict[str, Any] = {}
+        for name in RESULT_COLUMNS:
+            col = self.columns[name][lo:hi]
+            if name in self.categories:
+                data[name] = pd.Categorical.from_codes(col, categories=list(self.categories[name]))
+            else:
+                data[name] = col
+        return pd.DataFrame(data, columns=list(RESULT_COLUMNS), copy=False)
+
+    def iter_frames(self, chunk_rows: int | None = None) -> Iterator[pd.DataFrame]:
+        """Yield the batch as frames of at most *chunk_rows* rows (one frame if None)."""
+        n = len(self)
+        step = chunk_rows or max(n, 1)
+        for lo in range(0, max(n, 1), step):
+            yield self.to_frame(lo, min(lo + step, n))
+
+
+def interleave_batches(a: ResultBatch, b: ResultBatch, from_b: np.ndarray) -> ResultBatch:
+    """Merge two batches: row i comes from *b* where ``from_b[i]``, else from *a*.
+
+    Rows of each input are consumed in order; *b*'s categorical codes are
+    remapped onto the union vocabulary.
+    """
+    from_b = np.asarray(from_b, dtype=bool)
+    columns: dict[str, np.ndarray] = {}
+    categories: dict[str, tuple[str, ...]] = {}
+    for name in RESULT_COLUMNS:
+        col_a, col_b = a.columns[name], b.columns[name]
+        if name in _CATEGORICAL:
+            vocab = {v: i for i, v in enumerate(a.categories[name])}
+            for v in b.categories[name]:
+                vocab.setdefault(v, len(vocab))
+            remap = np.array([vocab[v] for v in b.categories[name]] + [-1], dtype=col_a.dtype)
+            col_b = remap[col_b]  # code -1 indexes the trailing -1
+            categories[name] = tuple(vocab)
+        out = np.empty(from_b.shape[0], dtype=col_a.dtype)
+        out[~from_b] = col_a
+        out[from_b] = col_b
+        columns[name] = out
+    return ResultBatch(columns, categories)
+
+
+def concat_batches(batches: Sequence[ResultBatch]) -> ResultBatch:
+    """Rows of *batches* in order, categorical codes remapped onto the union vocabulary.
+
+    The union lists values in first-seen order, so the shards of a task
+    concatenate to exactly the batch the whole task would have built.
+    """
+    if len(batches) == 1:
+        return batches[0]
+    columns: dict[str, np.ndarray] = {}
+    categories: dict[str, tuple[str, ...]] = {}
+    for name in RESULT_COLUMNS:
+        cols = [b.columns[name] for b in batches]
+        if name in _CATEGORICAL:
+            vocab: dict[str, int] = {}
+            for i, b in enumerate(batches):
+                for v in b.categories[name]:
+                    vocab.setdefault(v, len(vocab))
+                remap = np.array([vocab[v] for v in b.categories[name]] + [-1], dtype=cols[i].dtype)
+                cols[i] = remap[cols[i]]  # code -1 indexes the trailing -1
+            categories[name] = tuple(vocab)
+        columns[name] = np.concatenate(cols)
+    return ResultBatch(columns, categories)
+
+
+class ResultBuilder:
+    """Append-only column buffers; grows geometrically when *capacity* is exceeded."""
+
+    def __init__(self, capacity: int = 0) -> None:
+        self._n = 0
+        self._cap = max(int(capacity), 1)
+        self._cols = {name: np.empty(self._cap, dtype=_DTYPES[name]) for name in RESULT_COLUMNS}
+        self._vocab: dict[str, dict[str, int]] = {name: {} for name in _CATEGORICAL}
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _code(self, name: str, value: Any) -> int:
+        if value is None:
+            return -1
+        vocab = self._vocab[name]
+        return vocab.setdefault(str(value), len(vocab))
+
+    def append(self, **row: Any) -> None:
+        """Append one SV; *row* must provide every column in :data:`RESULT_COLUMNS`."""
+        if self._n == self._cap:
+            self._cap *= 2
+            for name, col in self._cols.items():
+                grown = np.empty(self._cap, dtype=col.dtype)
+                grown[: self._n] = col[: self._n]
+                self._cols[name] = grown
+        i = self._n
+        for name in RESULT_COLUMNS:
+            value = row[name]
+            if name in self._vocab:
+                value = self._code(name, value)
+            self._cols[name][i] = value
+        self._n += 1
+
+    def finish(self) -> ResultBatch:
+        n = self._n
+        return ResultBatch(
+            columns={
+                name: col if n == self._cap else col[:n].copy() for name, col in self._cols.items()
+            },
+            categories={name: tuple(vocab) for name, vocab in self._vocab.items()},
+        )
@@ -0,0 +1,211 @@
+"""svphaser.phasing._scan
+======================
+Shared read scan: several SV call sets phased against one BAM.
+
+The fetch windows of every site on a contig, across all call sets, are
+merged into disjoint intervals.  Each interval is fetched and decoded once
+and its reads are cached; every site then takes its reads from the cache
+instead of querying the BAM again.  Sites are evaluated in window order and
+an interval is dropped after its last site, so only intervals still needed
+stay in memory.  A site sees exactly the reads, in the same order, that a
+direct fetch returns, so results are identical to separate runs.
+
+No interval spans more than :data:`MAX_CACHED_SPAN` bases: on a dense contig
+a window that would stretch the current interval past it starts a new
+(possibly overlapping) one, so the cache never holds a whole chromosome.
+Windows longer than the cap (RNAMES scans of very long SVs) are fetched
+directly rather than cached.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+import pysam
+
+from ._results import ResultBatch, ResultBuilder
+from ._svtable import SVTable, SVTableRef, attach_table
+from ._workers import (
+    SVSite,
+    _append_filtered_result,
+    _append_site_result,
+    _count_site_support,
+    discard_worker_bam,
+    open_worker_bam,
+    site_fetch_windows,
+    worker_bam,
+)
+from .types import WorkerOpts
+
+__all__ = ["MAX_CACHED_SPAN", "ReadScan"]
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_SPAN = 200_000
+
+# One call set's rows on a contig: [lo, hi) of its table, plus its options.
+ScanPart = tuple[int, int, "SVTable | SVTableRef", WorkerOpts]
+
+
+def _merge(windows: Iterable[tuple[int, int]], max_span: int) -> list[tuple[int, int]]:
+    """Merge overlapping windows into intervals of at most *max_span* bases.
+
+    Every window lies inside the last interval starting at or before it.
+    """
+    merged: list[tuple[int, int]] = []
+    for start, stop in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            lo, hi = merged[-1][0], max(merged[-1][1], stop)
+            if hi - lo <= max_span:
+                merged[-1] = (lo, hi)
+                continue
+        merged.append((start, stop))
+    return merged
+
+
+class _Interval:
+    __slots__ = ("reads", "starts", "max_len")
+
+    def __init__(self, reads: list[pysam.AlignedSegment]) -> None:
+        self.reads = reads
+        self.starts = [r.reference_start for r in reads]
+        self.max_len = max((_end(r) - r.reference_start for r in reads), default=0)
+
+
+def _end(read: pysam.AlignedSegment) -> int:
+    # htslib's overlap end: reads without reference-consuming ops span one base.
+    end = read.reference_end
+    return read.reference_start + 1 if end is None else end
+
+
+class ReadScan:
+    """Cached, fetch-compatible view of one contig of a BAM.
+
+    *windows[k]* are the 0-based windows of the k-th site in evaluation
+    order; call :meth:`done` after each site so finished intervals are freed.
+    Only mapped, non-secondary reads are cached — the ones evidence counting
+    keeps.  Cached intervals span at most *max_span* bases.
+    """
+
+    def __init__(
+        self,
+        bam: pysam.AlignmentFile,
+        chrom: str,
+        windows: Sequence[Sequence[tuple[int, int]]],
+        *,
+        max_span: int = MAX_CACHED_SPAN,
+    ) -> None:
+        self._bam = bam
+        self._chrom = chrom
+        spans = _merge((w for site in windows for w in site if w[1] - w[0] <= max_span), max_span)
+        self._starts = [start for start, _stop in spans]
+        self._spans = spans
+        self._cache: dict[int, _Interval] = {}
+        self._last_use: dict[int, int] = {}
+        self._release: dict[int, list[int]] = {}
+        for k, site in enumerate(windows):
+            for start, stop in site:
+                idx = self._interval(start, stop)
+                if idx is not None:
+                    self._last_use[idx] = k
+        for idx, k in self._last_use.items():
+            self._release.setdefault(k, []).append(idx)
+        self.reads_decoded = 0
+
+    def _interval(self, start: int, stop: int) -> int | None:
+        idx = bisect.bisect_right(self._starts, start) - 1
+        if idx < 0 or stop > self._spans[idx][1]:
+            return None
+        return idx
+
+    def _load(self, idx: int) -> _Interval:
+        start, stop = self._spans[idx]
+        reads = [
+            read
+            for read in self._bam.fetch(self._chrom, start, stop)
+            if not (read.is_unmapped or read.is_secondary)
+        ]
+        self.reads_decoded += len(reads)
+        interval = self._cache[idx] = _Interval(reads)
+        return interval
+
+    def fetch(self, contig: str, start: int, stop: int) -> Iterator[pysam.AlignedSegment]:
+        """Reads overlapping [start, stop) of *contig*, as ``AlignmentFile.fetch``."""
+        idx = self._interval(start, stop) if contig == self._chrom else None
+        if idx is None:
+            yield from self._bam.fetch(contig, start, stop)
+            return
+        interval = self._cache.get(idx) or self._load(idx)
+        lo = bisect.bisect_left(interval.starts, start - interval.max_len)
+        hi = bisect.bisect_left(interval.starts, stop)
+        for read in interval.reads[lo:hi]:
+            if _end(read) > start:
+                yield read
+
+    def done(self, k: int) -> None:
+        """Site *k* is finished: drop intervals no later site needs."""
+        for idx in self._release.pop(k, ()):
+            self._cache.pop(idx, None)
+
+
+def _scan_parts(
+    chrom: str,
+    parts: Sequence[tuple[int, int, SVTable, WorkerOpts]],
+    bam_path: Path,
+) -> ResultBatch:
+    debug_locus = os.environ.get("SVPHASER_DEBUG_LOCUS")
+    sites: list[tuple[SVSite, int, int]] = [
+        (tbl.site(i), p, i) for p, (lo, hi, tbl, _opts) in enumerate(parts) for i in range(lo, hi)
+    ]
+    windows = [site_fetch_windows(site, parts[p][3]) for site, p, _i in sites]
+    order = sorted(range(len(sites)), key=lambda s: windows[s][0][0] if windows[s] else -1)
+    support: dict[tuple[int, int], dict[str, Any]] = {}
+    with worker_bam(bam_path) as bam:
+        scan = ReadScan(bam, chrom, [windows[s] for s in order])
+        for k, s in enumerate(order):
+            site, p, i = sites[s]
+            if not site.filtered:
+                support[(p, i)] = _count_site_support(
+                    scan, chrom, site, opts=parts[p][3], debug_locus=debug_locus
+                )
+            scan.done(k)
+    logger.debug("chr %s: %d SVs, %d reads decoded", chrom, len(sites), scan.reads_decoded)
+
+    out = ResultBuilder(len(sites))
+    for site, p, i in sites:
+        if site.filtered:
+            _append_filtered_result(out, chrom, site)
+        else:
+            _append_site_result(out, chrom, site, support[(p, i)], opts=parts[p][3])
+    return out.finish()
+
+
+def _phase_shared_task(
+    chrom: str,
+    parts: Sequence[ScanPart],
+    bam_path: Path,
+) -> tuple[str, ResultBatch, float]:
+    """Worker entry: phase *chrom* for every call set with one read scan.
+
+    The batch holds each part's rows in turn (part order, then row order).
+    """
+    t0 = time.perf_counter()
+    attached = [
+        (lo, hi, tbl if isinstance(tbl, SVTable) else attach_table(tbl), opts)
+        for lo, hi, tbl, opts in parts
+    ]
+    try:
+        batch = _scan_parts(chrom, attached, bam_path)
+    except (OSError, ValueError) as err:
+        if not discard_worker_bam(bam_path):
+            raise
+        logger.warning("BAM handle for %s failed (%s); reopening", bam_path, err)
+        open_worker_bam(bam_path)
+        batch = _scan_parts(chrom, attached, bam_path)
+    return chrom, batch, time.perf_counter() - t0
@@ -0,0 +1,237 @@
+"""svphaser.phasing._schedule
+==========================
+Cost-model-driven task ordering.
+
+Per-chromosome tasks finish in very different times: a large, SV-dense
+chromosome submitted last becomes the straggler that keeps the whole pool
+waiting.  This module estimates the cost of each task up front and hands the
+engine a longest-first submission order.
+
+Cost features per task:
+- SV count per SVTYPE (from the columnar SV table parsed once in the parent)
+- summed fetch-window length around the breakpoints
+- estimated reads to examine, derived from the BAM index statistics
+  (mapped reads per contig scaled by window_bp / contig_length)
+
+The default coefficients only need to rank tasks sensibly.  When a metrics
+TSV from an earlier run is available, per-SVTYPE coefficients are re-learned
+from it (non-negative least squares over the recorded task timings).
+"""
+
+from __future__ import annotations
+
+import csv
+import heapq
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pysam
+
+from ._svtable import SVTable
+
+__all__ = [
+    "ContigStats",
+    "CostModel",
+    "bam_read_stats",
+    "contig_stats",
+    "load_cost_model",
+    "makespan",
+    "order_longest_first",
+    "write_metrics",
+]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SECONDS_PER_SV = 5e-4
+DEFAULT_SECONDS_PER_READ = 5e-5
+DEFAULT_SECONDS_PER_WINDOW_BP = 1e-7
+
+_METRICS_FIXED_COLUMNS = ["task", "chrom", "n_svs", "window_bp", "reads_est", "seconds"]
+
+
+@dataclass(slots=True)
+class ContigStats:
+    """SV workload summary for one contig."""
+
+    chrom: str
+    n_svs: int = 0
+    n_windows: int = 0
+    window_bp: int = 0
+    svtype_counts: dict[str, int] = field(default_factory=dict)
+
+
+def contig_stats(table: SVTable) -> dict[str, ContigStats]:
+    """Per-contig SV workload from the columnar SV table."""
+    a = table.arrays
+    two_region = [code for code, t in enumerate(table.svtypes) if t in {"DEL", "INV"}]
+
+    # Reference span fetched per SV (mirrors the worker's region logic).
+    two = np.isin(a["svtype"], two_region) & (a["end"] != a["pos"])
+    span = 2 * a["fetch_w"].astype(np.int64) + 1
+    span = np.where(two, 2 * span, span)
+
+    stats: dict[str, ContigStats] = {}
+    for chrom, (lo, hi) in table.contig_ranges.items():
+        codes, counts = np.unique(a["svtype"][lo:hi], return_counts=True)
+        stats[chrom] = ContigStats(
+            chrom,
+            n_svs=hi - lo,
+            n_windows=int(hi - lo + two[lo:hi].sum()),
+            window_bp=int(span[lo:hi].sum()),
+            svtype_counts={table.svtypes[int(c)]: int(n) for c, n in zip(codes, counts)},
+        )
+    return stats
+
+
+def bam_read_stats(bam_path: Path) -> dict[str, tuple[int, int]]:
+    """Return ``{contig: (mapped_reads, contig_length)}`` from the BAM index.
+
+    Falls back to an empty mapping when index statistics are unavailable
+    (e.g. CRAM without .crai stats); costs then ignore read depth.
+    """
+    try:
+        with pysam.AlignmentFile(str(bam_path), "rb") as bam:
+            lengths = dict(zip(bam.references, bam.lengths))
+            out: dict[str, tuple[int, int]] = {}
+            for st in bam.get_index_statistics():
+                out[st.contig] = (int(st.mapped), int(lengths.get(st.contig, 0)))
+            return out
+    except Exception as err:
+        logger.debug("BAM index statistics unavailable for %s: %s", bam_path, err)
+        return {}
+
+
+def _reads_estimate(stats: ContigStats, mapped: int, length: int) -> float:
+    """Approximate reads overlapping the task's fetch windows."""
+    if mapped <= 0 or length <= 0:
+        return 0.0
+    return float(mapped) * min(1.0, stats.window_bp / float(length))
+
+
+@dataclass(slots=True, frozen=True)
+class CostModel:
+    """Linear task-cost model (seconds, or arbitrary units when uncalibrated)."""
+
+    per_sv: dict[str, float] = field(default_factory=dict)
+    default_per_sv: float = DEFAULT_SECONDS_PER_SV
+    per_window_bp: float = DEFAULT_SECONDS_PER_WINDOW_BP
+    per_read: float = DEFAULT_SECONDS_PER_READ
+
+    def estimate(self, stats: ContigStats | None, mapped: int = 0, length: int = 0) -> float:
+        if stats is None or stats.n_svs == 0:
+            return 0.0
+        cost = sum(
+            n * self.per_sv.get(svtype, self.default_per_sv)
+            for svtype, n in stats.svtype_counts.items()
+        )
+        cost += self.per_window_bp * stats.window_bp
+        cost += self.per_read * _reads_estimate(stats, mapped, length)
+        return float(cost)
+
+
+def makespan(costs: list[float], workers: int) -> float:
+    """Wall time of *costs* packed longest-first onto *workers*."""
+    loads = [0.0] * max(1, min(workers, len(costs)))
+    for cost in sorted(costs, reverse=True):
+        heapq.heappush(loads, heapq.heappop(loads) + cost)
+    return max(loads, default=0.0)
+
+
+def order_longest_first(tasks: Iterable[str], costs: dict[str, float]) -> list[str]:
+    """Sort *tasks* by descending estimated cost; ties keep input order."""
+    indexed = list(enumerate(tasks))
+    indexed.sort(key=lambda it: (-costs.get(it[1], 0.0), it[0]))
+    return [task for _i, task in indexed]
+
+
+def write_metrics(
+    path: Path,
+    timings: dict[str, float],
+    stats: dict[str, ContigStats],
+    read_stats: dict[str, tuple[int, int]],
+) -> None:
+    """Write per-task timings and cost features as TSV (input to load_cost_model)."""
+    svtypes = sorted({t for st in stats.values() for t in st.svtype_counts})
+    fieldnames = _METRICS_FIXED_COLUMNS + [f"n_{t}" for t in svtypes]
+
+    with open(path, "w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=fieldnames, delimiter="\t")
+        writer.writeheader()
+        for chrom, seconds in timings.items():
+            st = stats.get(chrom) or ContigStats(chrom)
+            mapped, length = read_stats.get(chrom, (0, 0))
+            row: dict[str, object] = {
+                "task": chrom,
+                "chrom": chrom,
+                "n_svs": st.n_svs,
+                "window_bp": st.window_bp,
+                "reads_est": f"{_reads_estimate(st, mapped, length):.1f}",
+                "seconds": f"{seconds:.6f}",
+            }
+            for t in svtypes:
+                row[f"n_{t}"] = st.svtype_counts.get(t, 0)
+            writer.writerow(row)
+
+
+def _nonneg_lstsq(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Least squares with negative coefficients iteratively pinned to zero."""
+    active = list(range(x.shape[1]))
+    coef = np.zeros(x.shape[1])
+    while active:
+        sol, *_ = np.linalg.lstsq(x[:, active], y, rcond=None)
+        if (sol >= 0).all():
+            coef[active] = sol
+            break
+        active.pop(int(np.argmin(sol)))
+    return coef
+
+
+def load_cost_model(metrics_tsv: Path) -> CostModel:
+    """Learn per-SVTYPE and per-read coefficients from an earlier run's metrics TSV.
+
+    Columns that cannot be fitted (too few tasks, all-zero features) keep the
+    default coefficients so the model always ranks every task.
+    """
+    with open(metrics_tsv, newline="") as fh:
+        rows = list(csv.DictReader(fh, delimiter="\t"))
+    if not rows:
+        raise ValueError(f"Metrics file {metrics_tsv} contains no task rows.")
+
+    svtype_cols = [c for c in rows[0] if c.startswith("n_") and c != "n_svs"]
+    features = svtype_cols + ["reads_est"]
+
+    x = np.array([[float(r.get(c) or 0.0) for c in features] for r in rows], dtype=float)
+    y = np.array([float(r["seconds"]) for r in rows], dtype=float)
+
+    if len(rows) < 2:
+        logger.warning(
+            "Metrics file %s has %d task(s); keeping default cost coefficients.",
+            metrics_tsv,
+            len(rows),
+        )
+        return CostModel()
+
+    coef = _nonneg_lstsq(x, y)
+    per_sv = {
+        col[2:]: float(c) for i, (col, c) in enumerate(zip(svtype_cols, coef[:-1])) if x[:, i].any()
+    }
+    per_read = float(coef[-1]) if x[:, -1].any() else DEFAULT_SECONDS_PER_READ
+    fitted = [v for v in per_sv.values() if v > 0]
+    default_per_sv = float(np.mean(fitted)) if fitted else DEFAULT_SECONDS_PER_SV
+
+    logger.info(
+        "Cost model calibrated from %s (%d tasks): %s, per_read=%.3g s",
+        metrics_tsv,
+        len(rows),
+        ", ".join(f"{k}={v:.3g}s" for k, v in sorted(per_sv.items())) or "no SV terms",
+        per_read,
+    )
+    return CostModel(
+        per_sv=per_sv,
+        default_per_sv=default_per_sv,
+        per_window_bp=0.0,
+        per_read=per_read,
+    )
@@ -0,0 +1,204 @@
+"""svphaser.phasing._serve
+=======================
+``svphaser serve``: a local phasing daemon for interactive single-locus queries.
+
+A CLI run pays for imports, BAM index loading and VCF parsing on every
+call.  The daemon pays once: each registered BAM is opened (index
+included) at start-up and the handle stays warm.  Requests are small JSON
+batches of loci (see :mod:`~svphaser.phasing._locus`) answered with the
+same evidence counting and classification as a phasing run.
+
+HTTP API (on ``--host``/``--port``, or HTTP over a Unix socket with
+``--socket``)::
+
+    GET  /health   {"status": "ok", "version": ..., "bams": {name: path}}
+    POST /phase    {"bam": name, "loci": [{"chrom": ..., "pos": ..., ...}]}
+                   -> {"results": [row, ...], "elapsed_ms": ...}
+
+Rows have the ``<stem>_phased.csv`` columns plus ``kept``.  Pysam handles
+are not thread-safe, so requests against the same BAM are serialized;
+different BAMs are served concurrently.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pysam
+
+from svphaser import __version__
+
+from ._locus import evaluate_records, locus_record
+from .types import WorkerOpts
+
+__all__ = ["PhasingService", "make_server"]
+
+logger = logging.getLogger(__name__)
+
+# Larger batches belong in a phasing run.
+MAX_LOCI_PER_REQUEST = 1_000
+_MAX_BODY_BYTES = 8 << 20
+
+
+@dataclass(slots=True)
+class _WarmBam:
+    path: Path
+    handle: pysam.AlignmentFile
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class PhasingService:
+    """Registered BAMs with warm handles, evaluated with fixed worker options."""
+
+    def __init__(self, bams: Mapping[str, Path], opts: WorkerOpts) -> None:
+        self.opts = opts
+        self._bams: dict[str, _WarmBam] = {}
+        for name, path in bams.items():
+            self._bams[name] = _WarmBam(Path(path), pysam.AlignmentFile(str(path), "rb"))
+            logger.info("BAM %s → %s (index loaded)", name, path)
+
+    @property
+    def bams(self) -> dict[str, str]:
+        return {name: str(bam.path) for name, bam in self._bams.items()}
+
+    def phase(self, bam: str, loci: list[Mapping[str, Any]]) -> pd.DataFrame:
+        """Result rows for *loci* against the registered BAM *bam*."""
+        warm = self._bams.get(bam)
+        if warm is None:
+            raise KeyError(f"Unknown BAM {bam!r}; registered: {sorted(self._bams)}.")
+        if len(loci) > MAX_LOCI_PER_REQUEST:
+            raise ValueError(f"At most {MAX_LOCI_PER_REQUEST} loci per request.")
+        records = [locus_record(locus) for locus in loci]
+        with warm.lock:
+            return evaluate_records(warm.handle, records, self.opts)
+
+    def close(self) -> None:
+        for warm in self._bams.values():
+            with warm.lock:
+                warm.handle.close()
+
+
+def _json_rows(df: pd.DataFrame) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = df.astype(object).where(df.notna(), None).to_dict("records")
+    return rows
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "svphaser-serve"
+    protocol_version = "HTTP/1.1"  # keep-alive: no connection setup per query
+
+    @property
+    def service(self) -> PhasingService:
+        return self.server.service  # type: ignore[attr-defined,no-any-return]
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no (host, port) address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug("%s %s", self.address_string(), format % args)
+
+    def _reply(self, status: HTTPStatus, payload: Any) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path != "/health":
+            self._reply(HTTPStatus.NOT_FOUND, {"error": f"No route {self.path}"})
+            return
+        self._reply(
+            HTTPStatus.OK, {"status": "ok", "version": __version__, "bams": self.service.bams}
+        )
+
+    def do_POST(self) -> None:  # noqa: N802
+        if self.path != "/phase":
+            self._reply(HTTPStatus.NOT_FOUND, {"error": f"No route {self.path}"})
+            return
+        t0 = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length > _MAX_BODY_BYTES:
+                raise ValueError("Request body too large.")
+            request = json.loads(self.rfile.read(length) or b"{}")
+            loci = request.get("loci")
+            if not isinstance(loci, list) or not all(isinstance(x, dict) for x in loci):
+                raise ValueError('Expected {"bam": name, "loci": [{...}, ...]}.')
+            df = self.service.phase(str(request.get("bam")), loci)
+        except (KeyError, TypeError, ValueError) as err:
+            message = err.args[0] if isinstance(err, KeyError) and err.args else str(err)
+            self._reply(HTTPStatus.BAD_REQUEST, {"error": message})
+            return
+        self._reply(
+            HTTPStatus.OK,
+            {"results": _json_rows(df), "elapsed_ms": round(1e3 * (time.perf_counter() - t0), 3)},
+        )
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    service: PhasingService
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    service: PhasingService
+
+    def server_close(self) -> None:
+        super().server_close()
+        path = Path(str(self.server_address))
+        if path.is_socket():
+            path.unlink()
+
+
+def _socket_in_use(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def make_server(
+    service: PhasingService,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Path | None = None,
+) -> socketserver.BaseServer:
+    """Bound (not yet serving) server; call ``serve_forever()`` then ``server_close()``."""
+    server: _TCPServer | _UnixServer
+    if socket_path is not None:
+        if socket_path.is_socket():
+            if _socket_in_use(socket_path):
+                raise FileExistsError(f"{socket_path} is in use by a running daemon.")
+            socket_path.unlink()  # stale socket from an earlier daemon
+        elif socket_path.exists():
+            raise FileExistsError(f"{socket_path} exists and is not a socket.")
+        # Created owner-only: no window in which other users can connect.
+        umask = os.umask(0o177)
+        try:
+            server = _UnixServer(str(socket_path), _Handler)
+        finally:
+            os.umask(umask)
+    else:
+        server = _TCPServer((host, port), _Handler)
+    server.service = service
+    return server
@@ -0,0 +1,302 @@
+"""svphaser.phasing._shards
+========================
+Scatter/gather support for multi-node runs.
+
+``scatter`` splits the SV records of one VCF into *N* shards of roughly equal
+record count.  Each shard is a list of ``(chrom, start, end)`` POS ranges
+(1-based, inclusive) that together select a contiguous run of records in
+output order, so concatenating the shard outputs in shard order reproduces
+a single-node run byte for byte.  Records sharing a POS are never split
+across shards, and contigs whose records are not position-sorted are kept
+whole.
+
+The plan carries a ``plan_hash`` over the VCF name, record count and regions.
+Every partial run (``phase --shard``) writes a small JSON manifest next to its
+outputs with that hash plus a ``params_hash`` of the phasing options, and
+``gather`` refuses to merge shards that disagree on either.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import logging
+import shutil
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from cyvcf2 import Reader
+
+from ._filters import RecordFilter
+from .types import WorkerOpts
+
+__all__ = [
+    "ShardPlan",
+    "gather_shards",
+    "load_shard_plan",
+    "make_shard_plan",
+    "params_hash",
+    "run_params",
+    "shard_contig_ranges",
+    "shard_stem",
+    "write_shard_manifest",
+]
+
+logger = logging.getLogger(__name__)
+
+PLAN_VERSION = 1
+
+ShardRegion = tuple[str, int, int]
+
+
+@dataclass(slots=True, frozen=True)
+class ShardPlan:
+    """Deterministic assignment of SV records to shards."""
+
+    vcf: str
+    stem: str
+    n_records: int
+    shards: tuple[tuple[ShardRegion, ...], ...]
+    plan_hash: str
+
+    @property
+    def n_shards(self) -> int:
+        return len(self.shards)
+
+    def to_json(self) -> str:
+        doc = {
+            "version": PLAN_VERSION,
+            "vcf": self.vcf,
+            "stem": self.stem,
+            "n_records": self.n_records,
+            "plan_hash": self.plan_hash,
+            "shards": [[list(r) for r in regions] for regions in self.shards],
+        }
+        return json.dumps(doc, indent=2) + "\n"
+
+
+def _stem(vcf_path: Path) -> str:
+    return vcf_path.name.removesuffix(".vcf.gz").removesuffix(".vcf")
+
+
+def shard_stem(stem: str, shard: int) -> str:
+    """Output stem of one partial run, e.g. ``sample.shard-0003``."""
+    return f"{stem}.shard-{shard:04d}"
+
+
+def _hash_json(doc: Any) -> str:
+    payload = json.dumps(doc, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _plan_hash(vcf: str, n_records: int, shards: Sequence[Sequence[ShardRegion]]) -> str:
+    return _hash_json(
+        {"vcf": vcf, "n_records": n_records, "shards": [[list(r) for r in s] for s in shards]}
+    )
+
+
+def params_hash(opts: WorkerOpts, **extra: Any) -> str:
+    """Stable hash of every option that influences phasing output."""
+    return _hash_json({**dataclasses.asdict(opts), **extra})
+
+
+def run_params(opts: WorkerOpts, svp_info: bool, record_filter: RecordFilter | None) -> str:
+    """:func:`params_hash` of a run's worker options, ``svp_info`` and ``--include``."""
+    extra = {} if record_filter is None else {"include": record_filter.describe()}
+    return params_hash(opts, svp_info=svp_info, **extra)
+
+
+def _scan_positions(vcf_path: Path) -> dict[str, np.ndarray]:
+    """POS of every record per header contig, in header then record order."""
+    rdr = Reader(str(vcf_path))
+    chroms = list(rdr.seqnames)
+    per_chrom: dict[str, list[int]] = {}
+    wanted = set(chroms)
+    for rec in rdr:
+        if rec.CHROM in wanted:
+            per_chrom.setdefault(rec.CHROM, []).append(int(rec.POS))
+    rdr.close()
+    return {c: np.asarray(per_chrom[c], dtype=np.int64) for c in chroms if c in per_chrom}
+
+
+def _atoms(positions: dict[str, np.ndarray]) -> list[tuple[str, int, int, int]]:
+    """Unsplittable record groups as (chrom, start, end, n_records)."""
+    atoms: list[tuple[str, int, int, int]] = []
+    for chrom, pos in positions.items():
+        if np.all(pos[1:] >= pos[:-1]):
+            values, counts = np.unique(pos, return_counts=True)
+            atoms.extend((chrom, int(v), int(v), int(n)) for v, n in zip(values, counts))
+        else:
+            atoms.append((chrom, int(pos.min()), int(pos.max()), int(pos.size)))
+    return atoms
+
+
+def make_shard_plan(vcf_path: Path, n_shards: int) -> ShardPlan:
+    """Split *vcf_path* into *n_shards* shards of balanced record count."""
+    if n_shards < 1:
+        raise ValueError(f"Number of shards must be >= 1, got {n_shards}.")
+
+    atoms = _atoms(_scan_positions(vcf_path))
+    total = sum(a[3] for a in atoms)
+
+    shards: list[list[ShardRegion]] = [[] for _ in range(n_shards)]
+    k = 0
+    done = 0
+    for chrom, start, end, n in atoms:
+        regions = shards[k]
+        if regions and regions[-1][0] == chrom:
+            regions[-1] = (chrom, regions[-1][1], end)
+        else:
+            regions.append((chrom, start, end))
+        done += n
+        while k < n_shards - 1 and done >= round((k + 1) * total / n_shards):
+            k += 1
+
+    frozen = tuple(tuple(regions) for regions in shards)
+    name = vcf_path.name
+    return ShardPlan(
+        vcf=name,
+        stem=_stem(vcf_path),
+        n_records=total,
+        shards=frozen,
+        plan_hash=_plan_hash(name, total, frozen),
+    )
+
+
+def load_shard_plan(path: Path) -> ShardPlan:
+    doc = json.loads(Path(path).read_text())
+    if doc.get("version") != PLAN_VERSION:
+        raise ValueError(f"Unsupported shard plan version in {path}: {doc.get('version')!r}")
+    shards = tuple(
+        tuple((str(c), int(s), int(e)) for c, s, e in regions) for regions in doc["shards"]
+    )
+    plan = ShardPlan(
+        vcf=doc["vcf"],
+        stem=doc["stem"],
+        n_records=int(doc["n_records"]),
+        shards=shards,
+        plan_hash=doc["plan_hash"],
+    )
+    if _plan_hash(plan.vcf, plan.n_records, plan.shards) != plan.plan_hash:
+        raise ValueError(f"Shard plan {path} is corrupt (plan_hash mismatch).")
+    return plan
+
+
+def shard_contig_ranges(
+    pos: np.ndarray,
+    contig_ranges: dict[str, tuple[int, int]],
+    regions: Iterable[ShardRegion],
+) -> dict[str, tuple[int, int]]:
+    """Map shard *regions* onto contiguous table row ranges."""
+    out: dict[str, tuple[int, int]] = {}
+    for chrom, start, end in regions:
+        lo, hi = contig_ranges.get(chrom, (0, 0))
+        idx = np.flatnonzero((pos[lo:hi] >= start) & (pos[lo:hi] <= end))
+        if idx.size == 0:
+            continue
+        if idx[-1] - idx[0] + 1 != idx.size:
+            raise ValueError(
+                f"Shard region {chrom}:{start}-{end} does not select a contiguous run "
+                "of records; was the VCF changed since the shard plan was made?"
+            )
+        out[chrom] = (lo + int(idx[0]), lo + int(idx[-1]) + 1)
+    return out
+
+
+def write_shard_manifest(
+    out_dir: Path,
+    plan: ShardPlan,
+    shard: int,
+    *,
+    params: str,
+    n_kept: int,
+    n_dropped: int,
+) -> Path:
+    path = out_dir / f"{shard_stem(plan.stem, shard)}.json"
+    doc = {
+        "plan_hash": plan.plan_hash,
+        "params_hash": params,
+        "shard": shard,
+        "n_shards": plan.n_shards,
+        "n_kept": n_kept,
+        "n_dropped": n_dropped,
+    }
+    path.write_text(json.dumps(doc, indent=2) + "\n")
+    return path
+
+
+def _find_manifests(plan: ShardPlan, dirs: Sequence[Path]) -> list[tuple[Path, dict[str, Any]]]:
+    found: list[tuple[Path, dict[str, Any]]] = []
+    missing: list[int] = []
+    for shard in range(plan.n_shards):
+        name = f"{shard_stem(plan.stem, shard)}.json"
+        hit = next((d / name for d in dirs if (d / name).exists()), None)
+        if hit is None:
+            missing.append(shard)
+            continue
+        found.append((hit.parent, json.loads(hit.read_text())))
+    if missing:
+        raise FileNotFoundError(f"Missing partial outputs for shard(s) {missing}.")
+
+    for shard, (_d, doc) in enumerate(found):
+        if doc.get("plan_hash") != plan.plan_hash or doc.get("shard") != shard:
+            raise ValueError(f"Partial output for shard {shard} was made from another plan.")
+    if len({doc.get("params_hash") for _d, doc in found}) != 1:
+        raise ValueError("Partial outputs were phased with different parameters.")
+    return found
+
+
+def _concat_csv(parts: Sequence[Path], out: Path, *, header_from: int) -> None:
+    """Write the header line of parts[header_from], then every part's rows."""
+    with open(out, "w", newline="") as dst:
+        for i, part in enumerate(parts):
+            with open(part, newline="") as src:
+                header = src.readline()
+                if i == header_from:
+                    dst.write(header)
+                shutil.copyfileobj(src, dst)
+
+
+def _concat_vcf(parts: Sequence[Path], out: Path) -> None:
+    """Write the header block of the first part, then every part's records."""
+    with open(out, "w", newline="") as dst:
+        for i, part in enumerate(parts):
+            with open(part, newline="") as src:
+                for line in src:
+                    if not line.startswith("#"):
+                        dst.write(line)
+                        break
+                    if i == 0:
+                        dst.write(line)
+                shutil.copyfileobj(src, dst)
+
+
+def gather_shards(plan_path: Path, out_dir: Path, partial_dirs: Sequence[Path] = ()) -> None:
+    """Merge every shard's partial CSV/VCF outputs into single-node outputs."""
+    plan = load_shard_plan(plan_path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    found = _find_manifests(plan, list(partial_dirs) or [out_dir])
+    stems = [d / shard_stem(plan.stem, i) for i, (d, _doc) in enumerate(found)]
+
+    # The first shard that produced rows carries the real CSV header; empty
+    # shards only wrote the placeholder one.
+    header_from = next(
+        (i for i, (_d, doc) in enumerate(found) if doc["n_kept"] + doc["n_dropped"] > 0), 0
+    )
+    for suffix in ("_phased.csv", "_dropped_svs.csv"):
+        parts = [Path(f"{stem}{suffix}") for stem in stems]
+        _concat_csv(parts, out_dir / f"{plan.stem}{suffix}", header_from=header_from)
+
+    out_vcf = out_dir / f"{plan.stem}_phased.vcf"
+    _concat_vcf([Path(f"{stem}_phased.vcf") for stem in stems], out_vcf)
+
+    n_kept = sum(doc["n_kept"] for _d, doc in found)
+    n_dropped = sum(doc["n_dropped"] for _d, doc in found)
+    logger.info("Gathered %d shards of %s", plan.n_shards, plan.vcf)
+    logger.info("Dropped SVs → %s (%d SVs)", out_dir / f"{plan.stem}_dropped_svs.csv", n_dropped)
+    logger.info("CSV → %s (%d SVs)", out_dir / f"{plan.stem}_phased.csv", n_kept)
+    logger.info("VCF → %s", out_vcf)
@@ -0,0 +1,134 @@
+"""svphaser.phasing._spill
+=======================
+Disk spilling for bounded-memory runs (``--max-memory``).
+
+Three structures otherwise grow with the whole VCF:
+- the SV table built by the single VCF parse; with a :class:`ParseSpill`
+  the parse encodes its rows in chunks on disk and the finished table is a
+  file-backed map that workers open directly (see
+  :func:`~svphaser.phasing._svtable.build_sv_table`);
+- the reorder buffer, which holds finished contigs until every earlier
+  contig has been written; :class:`BatchSpill` keeps it under a byte budget
+  by pickling the overflow to disk;
+- the INFO lookup used by the phased-VCF writer; the same parse copies each
+  input record into one small VCF per contig so the writer only ever holds
+  the lookup of the contig it is writing.
+"""
+
+from __future__ import annotations
+
+import logging
+import pickle
+import re
+from pathlib import Path
+from typing import IO, cast
+
+from cyvcf2 import Variant
+
+from ._results import ResultBatch
+
+__all__ = ["BatchSpill", "ParseSpill", "parse_memory_size"]
+
+logger = logging.getLogger(__name__)
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*$", re.IGNORECASE)
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_memory_size(text: str) -> int:
+    """Parse sizes like ``"512M"``, ``"4G"``, ``"1.5GiB"`` or plain bytes."""
+    m = _SIZE_RE.match(str(text))
+    if m is None:
+        raise ValueError(f"Invalid memory size {text!r}; use e.g. 512M or 4G.")
+    size = int(float(m.group(1)) * _UNITS[m.group(2).upper()])
+    if size <= 0:
+        raise ValueError(f"Memory size must be positive, got {text!r}.")
+    return size
+
+
+class BatchSpill:
+    """Mapping of pending result batches that spills to disk over *budget* bytes."""
+
+    def __init__(self, budget: int, spill_dir: Path) -> None:
+        self.budget = budget
+        self.spill_dir = spill_dir
+        self._memory: dict[str, ResultBatch] = {}
+        self._on_disk: dict[str, Path] = {}
+        self._bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or key in self._on_disk
+
+    def __setitem__(self, key: str, batch: ResultBatch) -> None:
+        size = batch.nbytes
+        if self._memory and self._bytes + size > self.budget:
+            path = self.spill_dir / f"pending-{len(self._on_disk):06d}.pkl"
+            with open(path, "wb") as fh:
+                pickle.dump(batch, fh, protocol=5)
+            self._on_disk[key] = path
+            logger.debug("Spilled %s (%d bytes) → %s", key, size, path)
+            return
+        self._memory[key] = batch
+        self._bytes += size
+
+    def pop(self, key: str) -> ResultBatch:
+        if key in self._memory:
+            batch = self._memory.pop(key)
+            self._bytes -= batch.nbytes
+            return batch
+        path = self._on_disk.pop(key)
+        with open(path, "rb") as fh:
+            batch = cast(ResultBatch, pickle.load(fh))
+        path.unlink()
+        return batch
+
+
+class ParseSpill:
+    """Disk side of a bounded-memory VCF parse, under *directory*.
+
+    The parse keeps at most *chunk_rows* SV rows in memory before encoding
+    them to a chunk file, and copies every record it reads (byte for byte,
+    after *header*) into the VCF of its contig, listed in ``contig_vcfs``.
+    """
+
+    def __init__(self, directory: Path, chunk_rows: int, header: str) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.header = header
+        self.contig_vcfs: dict[str, Path] = {}
+        self._n_chunks = 0
+        self._chrom: str | None = None
+        self._out: IO[str] | None = None
+
+    def chunk_path(self) -> Path:
+        """Path for the next encoded chunk of table rows."""
+        self._n_chunks += 1
+        return self.directory / f"table-{self._n_chunks:06d}.pkl"
+
+    @property
+    def table_path(self) -> Path:
+        return self.directory / "table.bin"
+
+    def copy_record(self, rec: Variant) -> None:
+        chrom = rec.CHROM
+        if chrom != self._chrom or self._out is None:
+            self.close()
+            self._out = self._open_contig(chrom)
+            self._chrom = chrom
+        self._out.write(str(rec))
+
+    def _open_contig(self, chrom: str) -> IO[str]:
+        path = self.contig_vcfs.get(chrom)
+        if path is not None:
+            return open(path, "a", newline="")
+        path = self.contig_vcfs[chrom] = self.directory / f"contig-{len(self.contig_vcfs):06d}.vcf"
+        out = open(path, "w", newline="")
+        out.write(self.header)
+        return out
+
+    def close(self) -> None:
+        """Finish the contig VCF being written."""
+        if self._out is not None:
+            self._out.close()
+            self._out = None
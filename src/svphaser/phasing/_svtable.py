@@ -0,0 +1,533 @@
+"""svphaser.phasing._svtable
+=========================
+Columnar SV table extracted once in the parent and shared with workers.
+
+The parent parses the input VCF exactly once, resolving every field evidence
+counting needs (SVTYPE, SVLEN, END, windows, RNAMES, BND partner, input GT)
+into flat NumPy columns grouped by contig in header order.  The columns are
+copied into a single ``multiprocessing.shared_memory`` block; workers attach
+to it by name and read zero-copy views, so no worker touches the VCF.
+
+Layout:
+- numeric columns: pos/end/svlen/pos2 (int64), fetch_w/bp_tol (int32),
+  svtype (int16 code into ``svtypes``), filtered (bool; ``--include`` miss)
+- string columns (id, alt, in_gt, rnames, chr2): an int64 offsets buffer
+  (n + 1), a uint8 UTF-8 data buffer and a bool null mask
+- cohort runs only: ``sample_gt`` (int16, n x samples x 2), the first two
+  GT alleles of every VCF sample (-1 missing, -2 absent in a haploid GT)
+
+With ``--max-memory`` the parse encodes rows in chunks on disk and the
+table is a read-only map of one file with the same layout; workers map that
+file instead of a shared-memory block.
+
+Pool processes run :func:`init_worker` once, which opens the BAM (loading
+its index) and attaches the shared table; every task in that process then
+reuses both instead of reopening them.  Cohort runs have one BAM per sample
+and only attach the table.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import pickle
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from cyvcf2 import Reader, Variant
+
+from ._filters import RecordFilter
+from ._regions import RecordSelection
+from ._results import ResultBatch, ResultBuilder
+from ._spill import ParseSpill
+from ._workers import (
+    SVSite,
+    _append_filtered_result,
+    _append_site_result,
+    _count_site_support,
+    _site_from_record,
+    discard_worker_bam,
+    open_worker_bam,
+    worker_bam,
+)
+from .types import WorkerOpts
+
+__all__ = [
+    "SVTable",
+    "SVTableRef",
+    "attach_table",
+    "build_sv_table",
+    "init_worker",
+    "shared_table",
+]
+
+logger = logging.getLogger(__name__)
+
+_NUMERIC_COLUMNS: dict[str, type[np.generic]] = {
+    "pos": np.int64,
+    "end": np.int64,
+    "svlen": np.int64,
+    "svtype": np.int16,
+    "fetch_w": np.int32,
+    "bp_tol": np.int32,
+    "pos2": np.int64,
+    "filtered": np.bool_,
+}
+_STRING_COLUMNS = ("id", "alt", "in_gt", "rnames", "chr2")
+_ALIGN = 8
+
+Layout = tuple[tuple[str, str, int, tuple[int, ...]], ...]
+
+# Per-process cache of attached tables (keyed by block name or file path).
+_ATTACHED: dict[str, tuple[shared_memory.SharedMemory | np.memmap, SVTable]] = {}
+
+
+@dataclass(slots=True, frozen=True)
+class SVTableRef:
+    """Picklable handle to a table in shared memory (or in a file, with *path*)."""
+
+    shm_name: str
+    layout: Layout
+    svtypes: tuple[str, ...]
+    path: str | None = None
+
+
+class SVTable:
+    """SV records as flat columns; rows of one contig are contiguous."""
+
+    def __init__(
+        self,
+        arrays: dict[str, np.ndarray],
+        *,
+        svtypes: Sequence[str],
+        contig_ranges: dict[str, tuple[int, int]] | None = None,
+        file_ref: SVTableRef | None = None,
+    ) -> None:
+        self.arrays = arrays
+        self.svtypes = tuple(svtypes)
+        self.contig_ranges = dict(contig_ranges or {})
+        # Set when the arrays map a table file; workers then map it too.
+        self.file_ref = file_ref
+
+    def __len__(self) -> int:
+        return int(self.arrays["pos"].shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(_aligned(a.nbytes) for a in self.arrays.values())
+
+    def take(self, rows: np.ndarray) -> SVTable:
+        """Subset of the table with the given (ascending) row indices."""
+        rows = np.asarray(rows, dtype=np.int64)
+        arrays: dict[str, np.ndarray] = {}
+        for name in _NUMERIC_COLUMNS:
+            arrays[name] = self.arrays[name][rows]
+        for name in _STRING_COLUMNS:
+            off = self.arrays[f"{name}_off"]
+            starts = off[:-1][rows]
+            lengths = off[1:][rows] - starts
+            new_off = np.zeros(len(rows) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=new_off[1:])
+            gather = np.repeat(starts - new_off[:-1], lengths) + np.arange(new_off[-1])
+            arrays[f"{name}_off"] = new_off
+            arrays[f"{name}_data"] = self.arrays[f"{name}_data"][gather]
+            arrays[f"{name}_null"] = self.arrays[f"{name}_null"][rows]
+        if "sample_gt" in self.arrays:
+            arrays["sample_gt"] = self.arrays["sample_gt"][rows]
+        contig_ranges = {}
+        for chrom, (lo, hi) in self.contig_ranges.items():
+            new_lo, new_hi = np.searchsorted(rows, [lo, hi])
+            if new_hi > new_lo:
+                contig_ranges[chrom] = (int(new_lo), int(new_hi))
+        return SVTable(arrays, svtypes=self.svtypes, contig_ranges=contig_ranges)
+
+    def str_at(self, name: str, i: int) -> str | None:
+        """Value of string column *name* (``id``, ``alt``, ...) in row *i*."""
+        if self.arrays[f"{name}_null"][i]:
+            return None
+        off = self.arrays[f"{name}_off"]
+        return bytes(self.arrays[f"{name}_data"][off[i] : off[i + 1]]).decode()
+
+    def site(self, i: int) -> SVSite:
+        """Decode row *i* into the worker's per-SV input."""
+        a = self.arrays
+        rnames = self.str_at("rnames", i)
+        pos2 = int(a["pos2"][i])
+        return SVSite(
+            pos1=int(a["pos"][i]),
+            sv_end=int(a["end"][i]),
+            vid=self.str_at("id", i),
+            alt=self.str_at("alt", i) or "<N>",
+            svtype=self.svtypes[int(a["svtype"][i])],
+            svlen=int(a["svlen"][i]),
+            fetch_w=int(a["fetch_w"][i]),
+            bp_tol=int(a["bp_tol"][i]),
+            rnames=set(rnames.split(",")) if rnames else set(),
+            chr2=self.str_at("chr2", i),
+            pos2=pos2 if pos2 >= 0 else None,
+            in_gt=self.str_at("in_gt", i),
+            filtered=bool(a["filtered"][i]),
+        )
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _encode_strings(values: list[str | None]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    encoded = [v.encode() if v is not None else b"" for v in values]
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    null = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+    return offsets, data, null
+
+
+def _sample_alleles(rec: Variant, samples: Sequence[int]) -> np.ndarray:
+    """First two GT alleles of *samples* in *rec* (samples x 2, int16)."""
+    out = np.full((len(samples), 2), -1, dtype=np.int16)
+    gts = rec.genotype.array() if rec.genotype is not None else None
+    if gts is not None:
+        ploidy = min(2, gts.shape[1] - 1)
+        out[:, :ploidy] = gts[samples, :ploidy]
+        if ploidy == 1:
+            out[:, 1] = -2
+    return out
+
+
+def _scan_records(vcf_path: Path, chroms: Sequence[str]) -> Iterator[Variant]:
+    wanted = set(chroms)
+    rdr = Reader(str(vcf_path))
+    try:
+        yield from (rec for rec in rdr if rec.CHROM in wanted)
+    finally:
+        rdr.close()
+
+
+def _encode_sites(
+    sites: Sequence[SVSite],
+    svtypes: dict[str, int],
+    gts: list[np.ndarray] | None,
+    n_samples: int | None,
+) -> dict[str, np.ndarray]:
+    """Table columns for *sites*; new SVTYPEs get the next code in *svtypes*."""
+    n = len(sites)
+    arrays: dict[str, np.ndarray] = {
+        "pos": np.fromiter((s.pos1 for s in sites), np.int64, n),
+        "end": np.fromiter((s.sv_end for s in sites), np.int64, n),
+        "svlen": np.fromiter((s.svlen for s in sites), np.int64, n),
+        "svtype": np.fromiter(
+            (svtypes.setdefault(s.svtype, len(svtypes)) for s in sites), np.int16, n
+        ),
+        "fetch_w": np.fromiter((s.fetch_w for s in sites), np.int32, n),
+        "bp_tol": np.fromiter((s.bp_tol for s in sites), np.int32, n),
+        "pos2": np.fromiter((s.pos2 if s.pos2 is not None else -1 for s in sites), np.int64, n),
+        "filtered": np.fromiter((s.filtered for s in sites), np.bool_, n),
+    }
+    string_values: dict[str, list[str | None]] = {
+        "id": [s.vid for s in sites],
+        "alt": [s.alt for s in sites],
+        "in_gt": [s.in_gt for s in sites],
+        "rnames": [",".join(sorted(s.rnames)) if s.rnames else None for s in sites],
+        "chr2": [s.chr2 for s in sites],
+    }
+    for name in _STRING_COLUMNS:
+        off, data, null = _encode_strings(string_values[name])
+        arrays[f"{name}_off"] = off
+        arrays[f"{name}_data"] = data
+        arrays[f"{name}_null"] = null
+    if n_samples is not None:
+        arrays["sample_gt"] = np.stack(gts) if gts else np.empty((0, n_samples, 2), dtype=np.int16)
+    return arrays
+
+
+def _layout(shapes: dict[str, tuple[np.dtype, tuple[int, ...]]]) -> tuple[Layout, int]:
+    """Aligned offsets of columns packed into one buffer, and its size."""
+    layout: list[tuple[str, str, int, tuple[int, ...]]] = []
+    offset = 0
+    for name, (dtype, shape) in shapes.items():
+        layout.append((name, dtype.str, offset, shape))
+        offset += _aligned(dtype.itemsize * int(np.prod(shape)))
+    return tuple(layout), offset
+
+
+def _views(buffer: Any, layout: Layout) -> dict[str, np.ndarray]:
+    return {
+        name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=buffer, offset=offset)
+        for name, dtype, offset, shape in layout
+    }
+
+
+class _TableBuilder:
+    """Collects every site in memory and encodes the table once."""
+
+    def __init__(self, chroms: Sequence[str], n_samples: int | None) -> None:
+        self.chroms = chroms
+        self.n_samples = n_samples
+        self.sites: dict[str, list[SVSite]] = {}
+        self.gts: dict[str, list[np.ndarray]] = {}
+
+    def add(self, chrom: str, site: SVSite, gts: np.ndarray | None) -> None:
+        self.sites.setdefault(chrom, []).append(site)
+        if gts is not None:
+            self.gts.setdefault(chrom, []).append(gts)
+
+    def finish(self) -> SVTable:
+        sites: list[SVSite] = []
+        gts: list[np.ndarray] = []
+        contig_ranges: dict[str, tuple[int, int]] = {}
+        for chrom in self.chroms:
+            chrom_sites = self.sites.get(chrom)
+            if not chrom_sites:
+                continue
+            contig_ranges[chrom] = (len(sites), len(sites) + len(chrom_sites))
+            sites.extend(chrom_sites)
+            gts.extend(self.gts.get(chrom, ()))
+        svtypes: dict[str, int] = {}
+        arrays = _encode_sites(sites, svtypes, gts, self.n_samples)
+        return SVTable(arrays, svtypes=list(svtypes), contig_ranges=contig_ranges)
+
+
+class _SpilledTableBuilder(_TableBuilder):
+    """Encodes every ``spill.chunk_rows`` sites to a chunk file, then maps one table file."""
+
+    def __init__(self, chroms: Sequence[str], n_samples: int | None, spill: ParseSpill) -> None:
+        super().__init__(chroms, n_samples)
+        self.spill = spill
+        self.svtypes: dict[str, int] = {}
+        self.n_buffered = 0
+        # Contig → its chunks in VCF order: (file, column dtypes and shapes).
+        self.chunks: dict[str, list[tuple[Path, dict[str, tuple[np.dtype, tuple[int, ...]]]]]] = {}
+
+    def add(self, chrom: str, site: SVSite, gts: np.ndarray | None) -> None:
+        super().add(chrom, site, gts)
+        self.n_buffered += 1
+        if self.n_buffered >= self.spill.chunk_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        for chrom, sites in self.sites.items():
+            arrays = _encode_sites(sites, self.svtypes, self.gts.get(chrom), self.n_samples)
+            path = self.spill.chunk_path()
+            with open(path, "wb") as fh:
+                pickle.dump(arrays, fh, protocol=5)
+            shapes = {name: (a.dtype, a.shape) for name, a in arrays.items()}
+            self.chunks.setdefault(chrom, []).append((path, shapes))
+        self.sites.clear()
+        self.gts.clear()
+        self.n_buffered = 0
+
+    def _total_shapes(self) -> dict[str, tuple[np.dtype, tuple[int, ...]]]:
+        chunks = [shapes for parts in self.chunks.values() for _path, shapes in parts]
+        first = _encode_sites([], {}, None, self.n_samples)
+        totals = {name: (a.dtype, a.shape) for name, a in first.items()}
+        for shapes in chunks:
+            for name, (dtype, shape) in shapes.items():
+                # Offsets buffers have one leading zero per chunk; keep one.
+                rows = shape[0] - 1 if name.endswith("_off") else shape[0]
+                total = totals[name][1]
+                totals[name] = (dtype, (total[0] + rows, *shape[1:]))
+        return totals
+
+    def finish(self) -> SVTable:
+        self._flush()
+        layout, size = _layout(self._total_shapes())
+        path = self.spill.table_path
+        out = np.memmap(path, dtype=np.uint8, mode="w+", shape=(max(_ALIGN, size),))
+        contig_ranges = self._write_chunks(_views(out, layout))
+        out.flush()
+        del out
+        table_map = np.memmap(path, dtype=np.uint8, mode="r")
+        ref = SVTableRef(shm_name="", layout=layout, svtypes=tuple(self.svtypes), path=str(path))
+        return SVTable(
+            _views(table_map, layout),
+            svtypes=ref.svtypes,
+            contig_ranges=contig_ranges,
+            file_ref=ref,
+        )
+
+    def _write_chunks(self, views: dict[str, np.ndarray]) -> dict[str, tuple[int, int]]:
+        """Copy the chunks into *views* in contig order; return the contig ranges."""
+        row = 0
+        data = dict.fromkeys(_STRING_COLUMNS, 0)
+        contig_ranges: dict[str, tuple[int, int]] = {}
+        for chrom in self.chroms:
+            start = row
+            for path, _shapes in self.chunks.get(chrom, ()):
+                with open(path, "rb") as fh:
+                    chunk: dict[str, np.ndarray] = pickle.load(fh)
+                path.unlink()
+                n = int(chunk["pos"].shape[0])
+                for name in views:
+                    if not name.endswith(("_off", "_data")):
+                        views[name][row : row + n] = chunk[name]
+                for name in _STRING_COLUMNS:
+                    off, blob = chunk[f"{name}_off"], chunk[f"{name}_data"]
+                    views[f"{name}_off"][row + 1 : row + n + 1] = off[1:] + data[name]
+                    views[f"{name}_data"][data[name] : data[name] + blob.size] = blob
+                    data[name] += int(blob.size)
+                row += n
+            if row > start:
+                contig_ranges[chrom] = (start, row)
+        return contig_ranges
+
+
+def _table_rows(
+    records: Iterable[Variant],
+    opts: WorkerOpts,
+    record_filter: RecordFilter | None,
+    samples: Sequence[int] | None,
+    spill: ParseSpill | None,
+) -> Iterator[tuple[str, SVSite, np.ndarray | None]]:
+    n_filtered = 0
+    for rec in records:
+        site = _site_from_record(rec, opts=opts)
+        if record_filter is not None and not record_filter(rec, site):
+            site = site._replace(filtered=True)
+            n_filtered += 1
+        if spill is not None:
+            spill.copy_record(rec)
+        yield rec.CHROM, site, None if samples is None else _sample_alleles(rec, samples)
+    if record_filter is not None:
+        logger.debug(
+            "Record filter: %d SVs fail %r (%s)",
+            n_filtered,
+            record_filter.expression,
+            "passed through unphased" if record_filter.passthrough else "dropped",
+        )
+
+
+def build_sv_table(
+    vcf_path: Path,
+    chroms: Sequence[str],
+    opts: WorkerOpts,
+    *,
+    selection: RecordSelection | None = None,
+    record_filter: RecordFilter | None = None,
+    samples: Sequence[int] | None = None,
+    spill: ParseSpill | None = None,
+) -> SVTable:
+    """Parse *vcf_path* once into a columnar table ordered by *chroms*.
+
+    Records on contigs outside *chroms* are ignored; within a contig the
+    VCF record order is preserved.  A restricting *selection* is applied
+    while reading (indexed region queries where possible); records failing
+    *record_filter* stay in the table, flagged so workers skip them.  With
+    *samples* (VCF sample indices) their genotypes are kept in ``sample_gt``.
+
+    With *spill*, at most ``spill.chunk_rows`` parsed sites are held at a
+    time, the table maps a file under ``spill.directory`` and every record
+    read is copied into ``spill.contig_vcfs``.
+    """
+    if selection is not None and selection.restricted:
+        records = selection.records(vcf_path, chroms)
+    else:
+        records = _scan_records(vcf_path, chroms)
+    n_samples = None if samples is None else len(samples)
+    builder = (
+        _TableBuilder(chroms, n_samples)
+        if spill is None
+        else _SpilledTableBuilder(chroms, n_samples, spill)
+    )
+    try:
+        for chrom, site, gts in _table_rows(records, opts, record_filter, samples, spill):
+            builder.add(chrom, site, gts)
+    finally:
+        if spill is not None:
+            spill.close()
+    return builder.finish()
+
+
+@contextlib.contextmanager
+def shared_table(table: SVTable) -> Iterator[SVTableRef]:
+    """Copy *table* into one shared-memory block for the lifetime of the block.
+
+    A table that maps a file is shared as that file, without a copy.
+    """
+    if table.file_ref is not None:
+        yield table.file_ref
+        return
+    layout, size = _layout({name: (a.dtype, a.shape) for name, a in table.arrays.items()})
+    shm = shared_memory.SharedMemory(create=True, size=max(_ALIGN, size))
+    try:
+        views = _views(shm.buf, layout)
+        for name, view in views.items():
+            view[...] = table.arrays[name]
+        del views, view
+        yield SVTableRef(shm_name=shm.name, layout=layout, svtypes=table.svtypes)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def attach_table(ref: SVTableRef) -> SVTable:
+    """Attach (once per process) to a shared table and return zero-copy views."""
+    key = ref.path or ref.shm_name
+    hit = _ATTACHED.get(key)
+    if hit is not None:
+        return hit[1]
+    block: shared_memory.SharedMemory | np.memmap
+    if ref.path is not None:
+        block = np.memmap(ref.path, dtype=np.uint8, mode="r")
+        table = SVTable(_views(block, ref.layout), svtypes=ref.svtypes)
+    else:
+        block = shared_memory.SharedMemory(name=ref.shm_name)
+        table = SVTable(_views(block.buf, ref.layout), svtypes=ref.svtypes)
+    _ATTACHED[key] = (block, table)
+    return table
+
+
+def init_worker(bam_path: Path | None, table: SVTable | SVTableRef | None = None) -> None:
+    """Pool initializer: open the BAM (index included) and attach the table once."""
+    if bam_path is not None:
+        open_worker_bam(bam_path)
+    if isinstance(table, SVTableRef):
+        attach_table(table)
+
+
+def _phase_rows(
+    tbl: SVTable, chrom: str, lo: int, hi: int, bam_path: Path, opts: WorkerOpts
+) -> ResultBatch:
+    debug_locus = os.environ.get("SVPHASER_DEBUG_LOCUS")
+    out = ResultBuilder(hi - lo)
+    with worker_bam(bam_path) as bam:
+        for i in range(lo, hi):
+            site = tbl.site(i)
+            if site.filtered:
+                _append_filtered_result(out, chrom, site)
+                continue
+            sup = _count_site_support(bam, chrom, site, opts=opts, debug_locus=debug_locus)
+            _append_site_result(out, chrom, site, sup, opts=opts)
+    return out.finish()
+
+
+def _phase_table_task(
+    chrom: str,
+    lo: int,
+    hi: int,
+    table: SVTable | SVTableRef,
+    bam_path: Path,
+    opts: WorkerOpts,
+) -> tuple[str, ResultBatch, float]:
+    """Worker entry: phase table rows [lo, hi) of *chrom*; report wall time.
+
+    A task that fails on a cached BAM handle is retried once on a fresh one.
+    """
+    t0 = time.perf_counter()
+    tbl = table if isinstance(table, SVTable) else attach_table(table)
+    try:
+        batch = _phase_rows(tbl, chrom, lo, hi, bam_path, opts)
+    except (OSError, ValueError) as err:
+        if not discard_worker_bam(bam_path):
+            raise
+        logger.warning("BAM handle for %s failed (%s); reopening", bam_path, err)
+        open_worker_bam(bam_path)
+        batch = _phase_rows(tbl, chrom, lo, hi, bam_path, opts)
+    return chrom, batch, time.perf_counter() - t0
@@ -11,22 +11,31 @@ Patched for stricter DEL/INS evidence:
 
 from __future__ import annotations
 
+import contextlib
 import csv
 import logging
 import os
 import re
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple, Protocol
 
-import pandas as pd
 import pysam
-from cyvcf2 import Reader, Variant  # type: ignore
+from cyvcf2 import Variant  # type: ignore
 
+from ._results import ResultBuilder
 from .algorithms import classify_haplotype_v211
 from .types import WorkerOpts
 
-__all__ = ["_phase_chrom_worker"]
+__all__ = [
+    "FILTERED_REASON",
+    "ReadSource",
+    "SVSite",
+    "discard_worker_bam",
+    "open_worker_bam",
+    "site_fetch_windows",
+    "worker_bam",
+]
 
 DEFAULT_BP_WINDOW = 100
 MIN_CIGAR_FRACTION = 0.20
@@ -165,8 +174,14 @@ def _parse_sa_tag(read: pysam.AlignedSegment) -> list[tuple[str, int, str]]:
     return out
 
 
+class ReadSource(Protocol):
+    """What evidence counting needs from a BAM: region fetches."""
+
+    def fetch(self, contig: str, start: int, stop: int) -> Iterable[pysam.AlignedSegment]: ...
+
+
 def _iter_candidate_reads(
-    bam: pysam.AlignmentFile,
+    bam: ReadSource,
     chrom: str,
     regions_1based: list[tuple[int, int]],
 ) -> Iterable[pysam.AlignedSegment]:
@@ -412,15 +427,30 @@ def _read_supports_variant(
 
 _debug_logger = logging.getLogger(__name__ + ".debug")
 
+# Result reason of records that failed the ``--include`` filter.
+FILTERED_REASON = "FILTERED"
 
-def _count_hp_sv_support(  # noqa: C901
-    bam: pysam.AlignmentFile,
-    chrom: str,
-    rec: Variant,
-    *,
-    opts: WorkerOpts,
-    debug_locus: str | None = None,
-) -> dict[str, Any]:
+
+class SVSite(NamedTuple):
+    """Everything evidence counting needs about one SV, without a cyvcf2 Variant."""
+
+    pos1: int
+    sv_end: int
+    vid: str | None
+    alt: str
+    svtype: str
+    svlen: int
+    fetch_w: int
+    bp_tol: int
+    rnames: set[str]
+    chr2: str | None
+    pos2: int | None
+    in_gt: str | None
+    filtered: bool = False
+
+
+def _site_from_record(rec: Variant, *, opts: WorkerOpts) -> SVSite:
+    """Extract the evidence-relevant fields of one VCF record."""
     pos1 = int(rec.POS)
     sv_end = int(rec.end) if getattr(rec, "end", None) is not None else pos1
     alt = ",".join(rec.ALT) if rec.ALT else "<N>"
@@ -438,22 +468,74 @@ def _count_hp_sv_support(  # noqa: C901
     if opts.support_mode in {"hybrid", "rnames"}:
         rset = _parse_rnames(rec.INFO.get("RNAMES"))
 
-    pos0 = pos1 - 1
-    end_excl0 = sv_end
-
     chr2 = None
     pos2 = None
     if svtype == "BND":
         chr2, pos2 = _parse_bnd_partner(alt, rec)
 
+    return SVSite(
+        pos1=pos1,
+        sv_end=sv_end,
+        vid=rec.ID,
+        alt=alt,
+        svtype=svtype,
+        svlen=svlen,
+        fetch_w=fetch_w,
+        bp_tol=bp_tol,
+        rnames=rset,
+        chr2=chr2,
+        pos2=pos2,
+        in_gt=in_gt,
+    )
+
+
+def _rnames_window(site: SVSite) -> tuple[int, int]:
+    """0-based window scanned for the RNAMES reads of *site* (both breakpoints)."""
+    pos0 = site.pos1 - 1
+    end0 = max(0, site.sv_end - 1)
+    return max(0, min(pos0, end0) - site.fetch_w), max(pos0, end0) + 1 + site.fetch_w
+
+
+def _heuristic_regions(site: SVSite) -> list[tuple[int, int]]:
+    """1-based windows around the breakpoints searched in heuristic mode."""
+    pos1, sv_end, fetch_w = site.pos1, site.sv_end, site.fetch_w
+    regions = [(max(1, pos1 - fetch_w), pos1 + fetch_w)]
+    if site.svtype in {"DEL", "INV"} and sv_end != pos1:
+        regions.append((max(1, sv_end - fetch_w), sv_end + fetch_w))
+    return regions
+
+
+def site_fetch_windows(site: SVSite, opts: WorkerOpts) -> list[tuple[int, int]]:
+    """0-based half-open BAM windows :func:`_count_site_support` reads for *site*."""
+    if site.filtered:
+        return []
+    if site.rnames:
+        return [_rnames_window(site)]
+    if opts.support_mode == "rnames":
+        return []
+    return [(max(0, start1 - 1), max(0, end1)) for start1, end1 in _heuristic_regions(site)]
+
+
+def _count_site_support(  # noqa: C901
+    bam: ReadSource,
+    chrom: str,
+    site: SVSite,
+    *,
+    opts: WorkerOpts,
+    debug_locus: str | None = None,
+) -> dict[str, Any]:
+    pos1, sv_end, alt, svtype = site.pos1, site.sv_end, site.alt, site.svtype
+    svlen, fetch_w, bp_tol, in_gt = site.svlen, site.fetch_w, site.bp_tol, site.in_gt
+    rset = site.rnames
+    chr2, pos2 = site.chr2, site.pos2
+
+    pos0 = pos1 - 1
+    end_excl0 = sv_end
+
     if rset:
         state: dict[str, dict[str, Any]] = {}
 
-        left0 = min(pos0, max(0, end_excl0 - 1))
-        right0 = max(pos0, max(0, end_excl0 - 1))
-        start0 = max(0, left0 - fetch_w)
-        stop0 = right0 + 1 + fetch_w
-
+        start0, stop0 = _rnames_window(site)
         for read in bam.fetch(chrom, start0, stop0):
             if read.is_unmapped or read.is_secondary:
                 continue
@@ -500,7 +582,7 @@ def _count_hp_sv_support(  # noqa: C901
         support_total = hp1 + hp2 + nohp
 
         # --- Optional per-read debug dump ---
-        vid = rec.ID or "."
+        vid = site.vid or "."
         if debug_locus and vid == debug_locus:
             _dump_debug_tsv(
                 vid,
@@ -550,13 +632,9 @@ def _count_hp_sv_support(  # noqa: C901
             "in_gt": in_gt,
         }
 
-    regions: list[tuple[int, int]] = [(max(1, pos1 - fetch_w), pos1 + fetch_w)]
-    if svtype in {"DEL", "INV"} and sv_end != pos1:
-        regions.append((max(1, sv_end - fetch_w), sv_end + fetch_w))
-
     state: dict[str, dict[str, Any]] = {}
 
-    for read in _iter_candidate_reads(bam, chrom, regions):
+    for read in _iter_candidate_reads(bam, chrom, _heuristic_regions(site)):
         qn = read.query_name
         if qn is None:
             continue
@@ -599,7 +677,7 @@ def _count_hp_sv_support(  # noqa: C901
     support_total = hp1 + hp2 + nohp
 
     # --- Optional per-read debug dump ---
-    vid = rec.ID or "."
+    vid = site.vid or "."
     if debug_locus and vid == debug_locus:
         _dump_debug_tsv(
             vid,
@@ -631,76 +709,141 @@ def _count_hp_sv_support(  # noqa: C901
     }
 
 
-def _phase_chrom_worker(
-    chrom: str,
-    vcf_path: Path,
-    bam_path: Path,
-    opts: WorkerOpts,
-) -> pd.DataFrame:
-    bam = pysam.AlignmentFile(str(bam_path), "rb")
-    rdr = Reader(str(vcf_path))
+# Process-local BAM handles opened once by the pool initializer.  Keyed by
+# (pid, path) so a handle inherited across fork() is never shared.
+_BAM_HANDLES: dict[tuple[int, str], pysam.AlignmentFile] = {}
 
-    debug_locus = os.environ.get("SVPHASER_DEBUG_LOCUS")
 
-    rows: list[dict[str, object]] = []
+def open_worker_bam(bam_path: Path, threads: int | None = None) -> pysam.AlignmentFile:
+    """Open *bam_path* (and load its index) once for the current process.
 
-    use_region_iter = _has_tabix_index(vcf_path)
-    records_iter = rdr(chrom) if use_region_iter else iter(rdr)
+    With *threads*, a cached handle opened with a different number of
+    htslib threads is reopened with *threads*.
+    """
+    key = (os.getpid(), str(bam_path))
+    bam = _BAM_HANDLES.get(key)
+    if threads is not None and bam is not None and bam.is_open and bam.threads != threads:
+        bam.close()
+    if bam is None or not bam.is_open:
+        bam = pysam.AlignmentFile(str(bam_path), "rb", threads=threads or 1)
+        _BAM_HANDLES[key] = bam
+    return bam
+
+
+def discard_worker_bam(bam_path: Path) -> bool:
+    """Close and forget this process's cached handle; True if one existed."""
+    bam = _BAM_HANDLES.pop((os.getpid(), str(bam_path)), None)
+    if bam is None:
+        return False
+    try:
+        bam.close()
+    except Exception:
+        pass
+    return True
 
-    for rec in records_iter:
-        if rec.CHROM != chrom:
-            continue
 
-        sup = _count_hp_sv_support(bam, chrom, rec, opts=opts, debug_locus=debug_locus)
-        hp1 = int(sup["hp1"])
-        hp2 = int(sup["hp2"])
-        nohp = int(sup["nohp"])
-        tagged_total = int(sup["tagged_total"])
-        support_total = int(sup["support_total"])
-
-        gt, gq, reason, delta = classify_haplotype_v211(
-            n1=hp1,
-            n2=hp2,
-            min_support=opts.min_support,
-            min_tagged_support=opts.min_tagged_support,
-            major_delta=opts.major_delta,
-            equal_delta=opts.equal_delta,
-            support_total=support_total,
-            tie_to_hom_alt=opts.tie_to_hom_alt,
-        )
+@contextlib.contextmanager
+def worker_bam(bam_path: Path) -> Iterator[pysam.AlignmentFile]:
+    """Yield the process's cached handle, or a temporary one outside a pool."""
+    key = (os.getpid(), str(bam_path))
+    if key in _BAM_HANDLES:
+        yield open_worker_bam(bam_path)
+        return
+    with pysam.AlignmentFile(str(bam_path), "rb") as bam:
+        yield bam
+
+
+def _classify_support(sup: dict[str, Any], *, opts: WorkerOpts) -> tuple[str, int, str, float]:
+    """``(gt, gq, reason, delta)`` for the support counts of one SV."""
+    return classify_haplotype_v211(
+        n1=int(sup["hp1"]),
+        n2=int(sup["hp2"]),
+        min_support=opts.min_support,
+        min_tagged_support=opts.min_tagged_support,
+        major_delta=opts.major_delta,
+        equal_delta=opts.equal_delta,
+        support_total=int(sup["support_total"]),
+        tie_to_hom_alt=opts.tie_to_hom_alt,
+    )
 
-        tag_frac = (tagged_total / support_total) if support_total else 0.0
-
-        row = {
-            "chrom": chrom,
-            "pos": int(rec.POS),
-            "id": rec.ID,
-            "svtype": str(sup.get("svtype", "NA")),
-            "svlen": int(sup.get("svlen") or 0),
-            "end": int(sup.get("sv_end") or rec.POS),
-            "alt": sup.get("alt"),
-            "in_gt": sup.get("in_gt"),
-            "hp1": hp1,
-            "hp2": hp2,
-            "nohp": nohp,
-            "tagged_total": tagged_total,
-            "support_total": support_total,
-            "n1": hp1,
-            "n2": hp2,
-            "gt": gt,
-            "gq": int(gq),
-            "reason": reason,
-            "delta": float(delta),
-            "tag_frac": float(tag_frac),
-            "mode": sup.get("mode"),
-            "fetch_w": sup.get("fetch_w"),
-            "bp_tol": sup.get("bp_tol"),
-            "rnames_total": sup.get("rnames_total"),
-            "rnames_found": sup.get("rnames_found"),
-        }
-        rows.append(row)
 
-    return pd.DataFrame(rows)
+def _append_site_result(
+    out: ResultBuilder,
+    chrom: str,
+    site: SVSite,
+    sup: dict[str, Any],
+    *,
+    opts: WorkerOpts,
+) -> None:
+    """Classify one SV from its support counts and append its output row to *out*."""
+    hp1 = int(sup["hp1"])
+    hp2 = int(sup["hp2"])
+    nohp = int(sup["nohp"])
+    tagged_total = int(sup["tagged_total"])
+    support_total = int(sup["support_total"])
+
+    gt, gq, reason, delta = _classify_support(sup, opts=opts)
+
+    tag_frac = (tagged_total / support_total) if support_total else 0.0
+
+    out.append(
+        chrom=chrom,
+        pos=site.pos1,
+        id=site.vid,
+        svtype=str(sup.get("svtype", "NA")),
+        svlen=int(sup.get("svlen") or 0),
+        end=int(sup.get("sv_end") or site.pos1),
+        alt=sup.get("alt"),
+        in_gt=sup.get("in_gt"),
+        hp1=hp1,
+        hp2=hp2,
+        nohp=nohp,
+        tagged_total=tagged_total,
+        support_total=support_total,
+        n1=hp1,
+        n2=hp2,
+        gt=gt,
+        gq=int(gq),
+        reason=reason,
+        delta=float(delta),
+        tag_frac=float(tag_frac),
+        mode=sup.get("mode"),
+        fetch_w=sup.get("fetch_w"),
+        bp_tol=sup.get("bp_tol"),
+        rnames_total=sup.get("rnames_total"),
+        rnames_found=sup.get("rnames_found"),
+    )
+
+
+def _append_filtered_result(out: ResultBuilder, chrom: str, site: SVSite) -> None:
+    """Append the unphased row of a record that failed the ``--include`` filter."""
+    out.append(
+        chrom=chrom,
+        pos=site.pos1,
+        id=site.vid,
+        svtype=site.svtype,
+        svlen=site.svlen,
+        end=site.sv_end,
+        alt=site.alt,
+        in_gt=site.in_gt,
+        hp1=0,
+        hp2=0,
+        nohp=0,
+        tagged_total=0,
+        support_total=0,
+        n1=0,
+        n2=0,
+        gt="./.",
+        gq=0,
+        reason=FILTERED_REASON,
+        delta=1.0,
+        tag_frac=0.0,
+        mode=None,
+        fetch_w=site.fetch_w,
+        bp_tol=site.bp_tol,
+        rnames_total=len(site.rnames),
+        rnames_found=0,
+    )
 
 
 def _dump_debug_tsv(
@@ -3,9 +3,10 @@
 
 High-level engine:
 - orchestrates per-chromosome workers
-- merges results
+- streams results back in header order (reorder buffer)
 - applies the global support filter
-- writes CSV + phased VCF
+- hands CSV + phased VCF output to the writers in ``_outputs`` (``_cohort``,
+  ``_batch`` for cohort and batch runs), one contig at a time
 
 Patched for stricter DEL/INS evidence plumbing:
 - passes size-consistency options into WorkerOpts
@@ -16,162 +17,649 @@ Patched for stricter DEL/INS evidence plumbing:
 
 from __future__ import annotations
 
+import contextlib
+import itertools
 import logging
-import math
 import multiprocessing as mp
+import queue
+import shutil
+import tempfile
+import threading
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from multiprocessing.pool import IMapIterator
 from pathlib import Path
-from typing import Any, TypedDict
+from typing import Any
 
+import numpy as np
 import pandas as pd
-from cyvcf2 import Reader
-
-from ._workers import _phase_chrom_worker
-from .types import GQBin, SVKey, SVKeyLegacy, WorkerOpts
-
-__all__ = ["phase_vcf"]
+from cyvcf2 import Reader, Variant
+
+from ._adaptive import ConcurrencyController, _adaptive_task, shard_rows, split_shards
+from ._batch import (
+    OPTION_PARSERS,
+    BatchEntry,
+    _BatchJob,
+    _phase_job_task,
+    load_batch_manifest,
+)
+from ._checkpoint import CheckpointStore, file_identity
+from ._cohort import (
+    _CohortOutputs,
+    _phase_sample_task,
+    load_sample_bams,
+    nonref_rows,
+    sample_columns,
+    task_key,
+)
+from ._filters import RecordFilter
+from ._incremental import PreviousRun, Reuse, evidence_digests, write_run_manifest
+from ._options import EvidenceOptions, evidence_options
+from ._outputs import (
+    _EMPTY_RESULT_COLUMNS,
+    _ensure_required_columns,
+    _iter_vcf_records,
+    _lookup_sources,
+    _PhasedOutputs,
+    _split_kept,
+)
+from ._preview import PreviewSample, summarize_preview, write_preview
+from ._regions import RecordSelection
+from ._resources import PARENT_BYTES_PER_SV, default_threads, detect_limits
+from ._results import ResultBatch, ResultBuilder, concat_batches, interleave_batches
+from ._scan import _phase_shared_task
+from ._schedule import (
+    CostModel,
+    _reads_estimate,
+    bam_read_stats,
+    contig_stats,
+    load_cost_model,
+    order_longest_first,
+    write_metrics,
+)
+from ._shards import (
+    ShardPlan,
+    load_shard_plan,
+    run_params,
+    shard_contig_ranges,
+    shard_stem,
+    write_shard_manifest,
+)
+from ._spill import BatchSpill, ParseSpill, parse_memory_size
+from ._svtable import (
+    SVTable,
+    SVTableRef,
+    _phase_table_task,
+    build_sv_table,
+    init_worker,
+    shared_table,
+)
+from .types import WorkerOpts
+
+__all__ = [
+    "iter_phase_records",
+    "phase_batch",
+    "phase_cohort",
+    "phase_records",
+    "phase_vcf",
+    "phase_vcfs",
+]
 
 logger = logging.getLogger(__name__)
 
 
-class VcfRec(TypedDict):
-    REF: str
-    ALT: str
-    QUAL: object
-    FILTER: str
-    INFO: dict[str, Any]
+TaskArgs = tuple[str, int, int, "SVTable | SVTableRef", Path, WorkerOpts]
+TaskResult = tuple[str, ResultBatch, float]
 
 
-def _is_missing_scalar(x: Any) -> bool:
-    """True for None / NaN / empty string."""
-    if x is None:
-        return True
-    if isinstance(x, float) and math.isnan(x):
-        return True
-    if isinstance(x, str) and x.strip() == "":
-        return True
-    return False
+def _try_task(
+    indexed: tuple[int, Callable[..., TaskResult], tuple[Any, ...]],
+) -> tuple[int, TaskResult | Exception]:
+    """Run one task, returning (not raising) its exception so it can be retried."""
+    i, task, args = indexed
+    try:
+        return i, task(*args)
+    except Exception as err:
+        return i, err
 
 
-def _normalize_vcf_id(value: Any) -> str:
-    """Normalize a VCF ID, mapping missing/blank values to '.'."""
-    if _is_missing_scalar(value):
-        return "."
-    return str(value).strip()
+class _Cancelled(Exception):
+    """Raised out of a run whose *cancel* event was set."""
 
 
-def _normalize_optional_int(value: Any) -> int | None:
-    """Normalize optional integer-like values from pandas/CSV."""
-    if _is_missing_scalar(value):
-        return None
-    return int(value)
+# How often a cancellable run checks its event while waiting on the pool.
+_CANCEL_POLL_S = 0.1
 
 
-def _normalize_optional_str(value: Any) -> str | None:
-    """Normalize optional string-like values from pandas/CSV."""
-    if _is_missing_scalar(value):
-        return None
-    return str(value).strip()
+def _until_cancelled(
+    outcomes: Iterable[tuple[int, TaskResult | Exception]], cancel: threading.Event
+) -> Iterator[tuple[int, TaskResult | Exception]]:
+    """Pass *outcomes* through until *cancel* is set, then raise :class:`_Cancelled`.
 
+    Pool results are awaited with a timeout so a set event is noticed while
+    tasks are still running; serial tasks are checked between tasks.
+    """
+    it = iter(outcomes)
+    while not cancel.is_set():
+        try:
+            if isinstance(it, IMapIterator):
+                outcome = it.next(timeout=_CANCEL_POLL_S)
+            else:
+                outcome = next(it)
+        except mp.TimeoutError:
+            continue
+        except StopIteration:
+            return
+        yield outcome
+    raise _Cancelled
 
-def _gq_label_from_bins(gq: Any, bins: list[GQBin]) -> str | None:
-    """Return label for first threshold satisfied (bins sorted desc)."""
-    if not bins:
-        return None
+
+def _pool_context() -> Any:
+    """fork where available (workers inherit the parent's imports), else spawn."""
     try:
-        gq_i = int(gq)
-    except Exception:
-        return None
-    for thr, lbl in bins:
-        if gq_i >= int(thr):
-            return str(lbl)
-    return None
+        return mp.get_context("fork")
+    except ValueError:
+        return mp.get_context("spawn")
 
 
-def _backfill_n1_n2(out: pd.DataFrame) -> None:
-    """n1/n2 are what the VCF writer uses (SVP_HP1/HP2)."""
-    if "n1" not in out.columns and "hp1" in out.columns:
-        out["n1"] = out["hp1"]
-    if "n2" not in out.columns and "hp2" in out.columns:
-        out["n2"] = out["hp2"]
+def _iter_task_results(
+    worker_args: Sequence[tuple[Any, ...]],
+    processes: int,
+    *,
+    retries: int = 0,
+    task: Callable[..., TaskResult] | None = None,
+    init_args: tuple[Path | None, SVTable | SVTableRef | None] | None = None,
+    cancel: threading.Event | None = None,
+) -> Iterator[TaskResult]:
+    """Yield (key, batch, seconds) as tasks complete (submission order in, any order out).
+
+    Each task runs ``task(*args)`` (default :func:`_phase_table_task`);
+    pool processes run :func:`init_worker` with *init_args* (default: the
+    first task's BAM and table).  Failed tasks are resubmitted up to
+    *retries* times; after that the last error of the first failing task is
+    re-raised.  Setting *cancel* raises :class:`_Cancelled`, which
+    terminates the pool on the way out.
+    """
+    task = task or _phase_table_task
+    with contextlib.ExitStack() as stack:
+        pool = None
+        if processes > 1:
+            ctx = _pool_context()
+            if init_args is None:
+                # One BAM open (and index load) plus one table attach per process.
+                _chrom, _lo, _hi, table, bam, _opts = worker_args[0]
+                init_args = (bam, table)
+            pool = stack.enter_context(
+                ctx.Pool(processes=processes, initializer=init_worker, initargs=init_args)
+            )
 
+        pending = [(i, task, args) for i, args in enumerate(worker_args)]
+        for attempt in range(1, retries + 2):
+            if pool is None:
+                outcomes: Iterable[tuple[int, TaskResult | Exception]] = map(_try_task, pending)
+            else:
+                outcomes = pool.imap_unordered(_try_task, pending, chunksize=1)
+            if cancel is not None:
+                outcomes = _until_cancelled(outcomes, cancel)
+
+            failed: list[tuple[int, Exception]] = []
+            for i, outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logger.warning(
+                        "chr %-6s ✘ attempt %d/%d failed: %s",
+                        worker_args[i][0],
+                        attempt,
+                        retries + 1,
+                        outcome,
+                    )
+                    failed.append((i, outcome))
+                else:
+                    yield outcome
+            if not failed:
+                return
+            pending = [(i, task, worker_args[i]) for i, _err in sorted(failed, key=lambda f: f[0])]
+
+        raise min(failed, key=lambda f: f[0])[1]
+
+
+def _run_shards(
+    shard_args: Sequence[TaskArgs],
+    controller: ConcurrencyController,
+    *,
+    retries: int = 0,
+    cancel: threading.Event | None = None,
+) -> Iterator[tuple[int, ResultBatch, float, float]]:
+    """Yield (shard index, batch, seconds, CPU seconds), ``controller.target`` in flight.
 
-def _backfill_tag_frac(out: pd.DataFrame) -> None:
-    """tag_frac is used in SVP_TAGFRAC; derive if totals exist."""
-    if "tag_frac" in out.columns:
-        return
-    if "tagged_total" not in out.columns or "support_total" not in out.columns:
-        return
+    A shard that still fails after *retries* resubmissions aborts the run.
+    """
+    ctx = _pool_context()
+    _chrom, _lo, _hi, table, bam, _opts = shard_args[0]
+    done: queue.SimpleQueue[tuple[int, Any]] = queue.SimpleQueue()
+    todo = deque(range(len(shard_args)))
+    attempts: Counter[int] = Counter()
+    in_flight = 0
+    with ctx.Pool(controller.max_workers, initializer=init_worker, initargs=(bam, table)) as pool:
+        while todo or in_flight:
+            if cancel is not None and cancel.is_set():
+                raise _Cancelled
+            while todo and in_flight < controller.target:
+                i = todo.popleft()
+                args = (i, _adaptive_task, (controller.hts_threads, *shard_args[i]))
+                pool.apply_async(
+                    _try_task,
+                    (args,),
+                    callback=done.put,
+                    error_callback=lambda err, i=i: done.put((i, err)),
+                )
+                in_flight += 1
+            try:
+                i, outcome = done.get(timeout=_CANCEL_POLL_S)
+            except queue.Empty:
+                continue
+            in_flight -= 1
+            if isinstance(outcome, BaseException):
+                attempts[i] += 1
+                logger.warning(
+                    "chr %-6s ✘ shard attempt %d/%d failed: %s",
+                    shard_args[i][0],
+                    attempts[i],
+                    retries + 1,
+                    outcome,
+                )
+                if attempts[i] > retries:
+                    raise outcome
+                todo.appendleft(i)
+                continue
+            _key, batch, seconds, cpu_seconds = outcome
+            yield i, batch, seconds, cpu_seconds
 
-    denom = pd.to_numeric(out["support_total"], errors="coerce").astype(float)
-    denom = denom.where(denom != 0.0, other=float("nan"))
-    numer = pd.to_numeric(out["tagged_total"], errors="coerce").astype(float)
-    out["tag_frac"] = numer / denom
 
+def _iter_adaptive_results(
+    worker_args: Sequence[TaskArgs],
+    controller: ConcurrencyController,
+    reads: dict[str, float],
+    *,
+    retries: int = 0,
+    cancel: threading.Event | None = None,
+) -> Iterator[TaskResult]:
+    """Run contig tasks as row shards; yield each contig once all its shards are done.
 
-def _backfill_gq_label(out: pd.DataFrame, *, bins: list[GQBin]) -> None:
-    """gq_label is optional but CLI advertises it; compute if missing."""
-    if not bins:
-        return
-    if "gq_label" in out.columns:
-        return
-    if "gq" not in out.columns:
-        return
-    out["gq_label"] = out["gq"].apply(lambda x: _gq_label_from_bins(x, bins))
-
-
-def _validate_required_columns(out: pd.DataFrame) -> None:
-    required = ["chrom", "pos", "id", "end", "svtype", "gt", "gq"]
-    missing = [c for c in required if c not in out.columns]
-    if missing:
-        raise RuntimeError(
-            "SvPhaser internal error: worker output is missing required columns "
-            f"{missing}. Refusing to write phased VCF/CSV because it would silently "
-            "degrade to './.' genotypes. Fix worker to emit gt/gq "
-            "(and ideally reason/delta)."
+    The contig's seconds are the sum of its shards'.  *reads* (estimated
+    reads per contig) feeds the controller's reads/s.
+    """
+    size = shard_rows(sum(hi - lo for _c, lo, hi, *_rest in worker_args), controller.max_workers)
+    rest = {args[0]: args[3:] for args in worker_args}
+    span = {c: max(1, hi - lo) for c, lo, hi, *_rest in worker_args}
+    shards = split_shards([args[:3] for args in worker_args], size)
+    shard_args: list[TaskArgs] = [(c, lo, hi, *rest[c]) for c, lo, hi, _k in shards]
+    parts: dict[str, dict[int, ResultBatch]] = {c: {} for c in rest}
+    n_parts = Counter(c for c, *_rest in shards)
+    seconds: dict[str, float] = dict.fromkeys(rest, 0.0)
+    logger.info(
+        "Adaptive: %d shards of ≤%d SVs, %d–%d workers, starting at %d",
+        len(shards),
+        size,
+        controller.min_workers,
+        controller.max_workers,
+        controller.target,
+    )
+    for i, batch, secs, cpu_secs in _run_shards(
+        shard_args, controller, retries=retries, cancel=cancel
+    ):
+        chrom, lo, hi, k = shards[i]
+        controller.observe(
+            len(batch), reads.get(chrom, 0.0) * (hi - lo) / span[chrom], secs, cpu_secs
         )
-
-
-def _normalize_gt_gq(out: pd.DataFrame) -> None:
-    """Normalize GT/GQ to safe writable types."""
-    out["gt"] = out["gt"].fillna("./.").astype(str)
-    out["gq"] = pd.to_numeric(out["gq"], errors="coerce").fillna(0).astype(int)
-
-
-def _warn_if_suspicious(out: pd.DataFrame) -> None:
-    """Warn loudly if output looks obviously wrong."""
-    if "tagged_total" not in out.columns:
+        parts[chrom][k] = batch
+        seconds[chrom] += secs
+        if len(parts[chrom]) == n_parts[chrom]:
+            got = parts.pop(chrom)
+            yield chrom, concat_batches([got[k] for k in range(len(got))]), seconds[chrom]
+    logger.info("Adaptive: finished at %d shards in flight", controller.target)
+
+
+def _with_checkpoints(
+    results: Iterable[TaskResult],
+    store: CheckpointStore | None,
+    args: dict[str, TaskArgs],
+) -> Iterator[TaskResult]:
+    """Persist each finished task before handing it on."""
+    for chrom, batch, seconds in results:
+        if store is not None:
+            store.save(store.task_key(*args[chrom][:3]), batch, seconds)
+        yield chrom, batch, seconds
+
+
+def _restore_checkpoints(
+    store: CheckpointStore | None,
+    submit_order: list[str],
+    ranges: dict[str, tuple[int, int]],
+) -> tuple[list[str], list[str]]:
+    """Split tasks into (chromosomes with a checkpoint, chromosomes still to run)."""
+    if store is None:
+        return [], submit_order
+    restored: list[str] = []
+    todo: list[str] = []
+    for chrom in submit_order:
+        has = store.has(store.task_key(chrom, *ranges[chrom]))
+        (restored if has else todo).append(chrom)
+    if restored:
+        logger.info(
+            "Resuming: %d of %d tasks restored from %s",
+            len(restored),
+            len(submit_order),
+            store.work_dir,
+        )
+    return restored, todo
+
+
+def _load_checkpoints(
+    store: CheckpointStore | None,
+    chroms: list[str],
+    args: dict[str, TaskArgs],
+) -> Iterator[TaskResult]:
+    """Load restored tasks one at a time; rerun in-process any that became unreadable."""
+    for chrom in chroms:
+        key = CheckpointStore.task_key(*args[chrom][:3])
+        hit = store.load(key) if store is not None else None
+        if hit is None:
+            logger.warning("Checkpoint for %s is unreadable; recomputing", chrom)
+            yield from _with_checkpoints([_phase_table_task(*args[chrom])], store, args)
+            continue
+        yield (chrom, *hit)
+
+
+def _with_reused(
+    results: Iterable[TaskResult], reuse: dict[str, Reuse], reused_only: list[str]
+) -> Iterator[TaskResult]:
+    """Merge previous-run results into each contig's batch, in table order."""
+    for chrom in reused_only:
+        yield chrom, reuse[chrom].batch, 0.0
+    for chrom, batch, seconds in results:
+        hit = reuse.get(chrom)
+        if hit is not None:
+            batch = interleave_batches(batch, hit.batch, hit.from_previous)
+        yield chrom, batch, seconds
+
+
+def _in_output_order(
+    results: Iterable[TaskResult],
+    order: list[str],
+    timings: dict[str, float],
+    spill: _SpillPlan | None = None,
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """Reorder buffer: release frames in *order* as soon as their turn comes."""
+    pending: dict[str, ResultBatch] | BatchSpill = {} if spill is None else spill.pending
+    chunk_rows = None if spill is None else spill.chunk_rows
+    next_i = 0
+    for chrom, batch, seconds in results:
+        timings[chrom] = seconds
+        logger.info("chr %-6s ✔ phased %5d SVs", chrom, len(batch))
+        pending[chrom] = batch
+        while next_i < len(order) and order[next_i] in pending:
+            ready = order[next_i]
+            next_i += 1
+            for df in pending.pop(ready).iter_frames(chunk_rows):
+                yield ready, df
+
+
+def _as_completed(
+    results: Iterable[TaskResult], timings: dict[str, float]
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """Frames in completion order, without a reorder buffer."""
+    for chrom, batch, seconds in results:
+        timings[chrom] = seconds
+        logger.info("chr %-6s ✔ phased %5d SVs", chrom, len(batch))
+        yield chrom, batch.to_frame()
+
+
+# Rough per-row cost of a result frame plus its CSV/VCF formatting copies.
+_ROW_BYTES = 2048
+_MIN_CHUNK_ROWS = 1_000
+
+
+@dataclass(slots=True)
+class _SpillPlan:
+    """Disk spilling used by a bounded-memory run."""
+
+    pending: BatchSpill
+    chunk_rows: int
+    parse: ParseSpill
+
+    def contig_records(self, chrom: str) -> Iterator[Variant]:
+        path = self.parse.contig_vcfs.get(chrom)
+        if path is not None:
+            yield from _iter_vcf_records(path)
+
+
+@contextlib.contextmanager
+def _bounded_memory(
+    max_memory: str | int | None, sv_vcf: Path, out_dir: Path
+) -> Iterator[_SpillPlan | None]:
+    """Set up (and finally remove) spill files for ``max_memory``; None if unbounded."""
+    if max_memory is None:
+        yield None
         return
+    budget = parse_memory_size(max_memory) if isinstance(max_memory, str) else int(max_memory)
+    spill_dir = Path(tempfile.mkdtemp(prefix=".svphaser-spill-", dir=out_dir))
     try:
-        frac_ambig = float((out["gt"] == "./.").mean())
-        med_tagged = float(pd.to_numeric(out["tagged_total"], errors="coerce").fillna(0).median())
-        if frac_ambig >= 0.95 and med_tagged >= 5:
-            logger.warning(
-                "Suspicious output: %.1f%% genotypes are './.' despite "
-                "median tagged_total=%.1f. This usually indicates a gt/gq "
-                "propagation bug or thresholds too strict.",
-                100.0 * frac_ambig,
-                med_tagged,
-            )
-    except Exception:
-        return
+        # Half the budget for finished contigs waiting on earlier ones, an
+        # eighth for the frame being written and a quarter for parsed sites
+        # not yet encoded; the rest is lookups.
+        rdr = Reader(str(sv_vcf))
+        header = rdr.raw_header
+        rdr.close()
+        plan = _SpillPlan(
+            pending=BatchSpill(budget // 2, spill_dir),
+            chunk_rows=max(_MIN_CHUNK_ROWS, budget // 8 // _ROW_BYTES),
+            parse=ParseSpill(
+                spill_dir / "parse",
+                max(_MIN_CHUNK_ROWS, budget // 4 // PARENT_BYTES_PER_SV),
+                header,
+            ),
+        )
+        logger.info(
+            "Bounded memory: budget %d MiB, writing %d-row chunks, spilling to %s",
+            budget // 2**20,
+            plan.chunk_rows,
+            spill_dir,
+        )
+        yield plan
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
 
+def _resolve_shard(
+    sv_vcf: Path, shard_plan: Path | None, shard: int | None
+) -> tuple[ShardPlan, int] | None:
+    if shard_plan is None and shard is None:
+        return None
+    if shard_plan is None or shard is None:
+        raise ValueError("Sharded runs need both a shard plan and a shard index.")
+    plan = load_shard_plan(shard_plan)
+    if not 0 <= shard < plan.n_shards:
+        raise ValueError(f"Shard {shard} is out of range for a {plan.n_shards}-shard plan.")
+    if plan.vcf != sv_vcf.name:
+        raise ValueError(f"Shard plan was made for {plan.vcf}, not {sv_vcf.name}.")
+    return plan, shard
+
+
+def _restrict_to_shard(table: SVTable, plan: ShardPlan, shard: int) -> None:
+    """Limit the table's per-contig row ranges to one shard of *plan*."""
+    if len(table) != plan.n_records:
+        raise ValueError(
+            f"Shard plan expects {plan.n_records} SV records but the VCF has {len(table)}; "
+            "re-run scatter."
+        )
+    table.contig_ranges = shard_contig_ranges(
+        table.arrays["pos"], table.contig_ranges, plan.shards[shard]
+    )
+    logger.info(
+        "Shard %d/%d: %d SVs",
+        shard,
+        plan.n_shards,
+        sum(hi - lo for lo, hi in table.contig_ranges.values()),
+    )
 
-def _ensure_required_columns(df: pd.DataFrame, *, bins: list[GQBin]) -> pd.DataFrame:
-    """Backfill columns the writer expects; then validate."""
-    if df.empty:
-        return df
 
-    out = df.copy()
+def _open_checkpoints(
+    work_dir: Path | None,
+    resume: bool,
+    sv_vcf: Path,
+    bam: Path,
+    params: str,
+    sharded: tuple[ShardPlan, int] | None,
+    selection: RecordSelection,
+    previous: Path | None,
+) -> CheckpointStore | None:
+    if work_dir is None:
+        if resume:
+            raise ValueError("resume=True needs a work directory.")
+        return None
+    fingerprint = {
+        "sv_vcf": file_identity(sv_vcf),
+        "bam": file_identity(bam),
+        "params_hash": params,
+        "shard": None if sharded is None else [sharded[0].plan_hash, sharded[1]],
+        "selection": selection.digest(),
+        "previous": None if previous is None else file_identity(previous),
+    }
+    return CheckpointStore(work_dir, fingerprint, resume=resume)
+
+
+def _parse_table(
+    sv_vcf: Path,
+    chroms: tuple[str, ...],
+    opts: WorkerOpts,
+    *,
+    shard: tuple[ShardPlan, int] | None,
+    spill: _SpillPlan | None,
+    selection: RecordSelection | None,
+    record_filter: RecordFilter | None,
+    sample: PreviewSample | None,
+) -> SVTable:
+    """Parse *sv_vcf* into the table this run phases (its shard or sample)."""
+    table = build_sv_table(
+        sv_vcf,
+        chroms,
+        opts,
+        selection=selection,
+        record_filter=record_filter,
+        spill=None if spill is None else spill.parse,
+    )
+    if shard is not None:
+        _restrict_to_shard(table, *shard)
+    if sample is not None:
+        table = sample.apply(table)
+    return table
 
-    _backfill_n1_n2(out)
-    _backfill_tag_frac(out)
-    _backfill_gq_label(out, bins=bins)
 
-    _validate_required_columns(out)
-    _normalize_gt_gq(out)
-    _warn_if_suspicious(out)
+def _iter_phased_contigs(
+    sv_vcf: Path,
+    bam: Path,
+    chroms: tuple[str, ...],
+    opts: WorkerOpts,
+    *,
+    threads: int,
+    metrics_tsv: Path | None,
+    cost_model: Path | None,
+    shard: tuple[ShardPlan, int] | None = None,
+    store: CheckpointStore | None = None,
+    retries: int = 0,
+    spill: _SpillPlan | None = None,
+    selection: RecordSelection | None = None,
+    record_filter: RecordFilter | None = None,
+    sample: PreviewSample | None = None,
+    previous: PreviousRun | None = None,
+    digests: dict[str, str | None] | None = None,
+    ordered: bool = True,
+    cancel: threading.Event | None = None,
+    controller: ConcurrencyController | None = None,
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """Parse, schedule and run the per-contig workers; yield frames in header order.
+
+    With ``ordered=False`` each contig is yielded as soon as it completes.
+    With a *controller*, contigs run as row shards with adaptive concurrency.
+    A *digests* dict is filled with the parsed records' evidence digests.
+    """
+    # The VCF is parsed exactly once; workers read the shared columnar table.
+    table = _parse_table(
+        sv_vcf,
+        chroms,
+        opts,
+        shard=shard,
+        spill=spill,
+        selection=selection,
+        record_filter=record_filter,
+        sample=sample,
+    )
+    if digests is not None:
+        digests.update(evidence_digests(table))
+
+    # Only contigs that carry SV records are dispatched; decoys, alts and
+    # unplaced scaffolds would otherwise each become an empty task.
+    out_chroms = [chrom for chrom in chroms if chrom in table.contig_ranges]
+    if len(out_chroms) < len(chroms):
+        logger.info(
+            "Skipping %d of %d contigs with no SV records",
+            len(chroms) - len(out_chroms),
+            len(chroms),
+        )
+    reuse: dict[str, Reuse] = {}
+    if previous is not None:
+        table, reuse = previous.split(table)
+    stats = contig_stats(table)
+    sv_chroms = [chrom for chrom in out_chroms if chrom in stats]
+
+    read_stats = bam_read_stats(bam)
+    model = load_cost_model(cost_model) if cost_model is not None else CostModel()
+    costs = {
+        chrom: model.estimate(stats.get(chrom), *read_stats.get(chrom, (0, 0)))
+        for chrom in sv_chroms
+    }
+    submit_order = order_longest_first(sv_chroms, costs)
+    ranges = table.contig_ranges
+    restored, todo = _restore_checkpoints(store, submit_order, ranges)
+    if controller is not None and (controller.max_workers < 2 or not todo):
+        controller = None
+    processes = min(threads, len(todo)) if controller is None else controller.max_workers
+
+    timings: dict[str, float] = {}
+    with contextlib.ExitStack() as stack:
+        handle: SVTable | SVTableRef = table
+        if processes > 1:
+            handle = stack.enter_context(shared_table(table))
+        local_args: dict[str, TaskArgs] = {
+            c: (c, *ranges[c], table, bam, opts) for c in submit_order
+        }
+        worker_args: list[TaskArgs] = [(c, *ranges[c], handle, bam, opts) for c in todo]
+        computed: Iterable[TaskResult]
+        if controller is None:
+            computed = _iter_task_results(worker_args, processes, retries=retries, cancel=cancel)
+        else:
+            reads = {c: _reads_estimate(stats[c], *read_stats.get(c, (0, 0))) for c in todo}
+            computed = _iter_adaptive_results(
+                worker_args, controller, reads, retries=retries, cancel=cancel
+            )
+        results: Iterable[TaskResult] = itertools.chain(
+            _load_checkpoints(store, restored, local_args),
+            _with_checkpoints(computed, store, local_args),
+        )
+        if reuse:
+            results = _with_reused(results, reuse, [c for c in out_chroms if c not in stats])
+        if ordered:
+            # Outputs stay in VCF header order regardless of submission order.
+            yield from _in_output_order(results, out_chroms, timings, spill)
+        else:
+            yield from _as_completed(results, timings)
 
-    return out
+    if sample is not None:
+        sample.timings.update(timings)
+    if metrics_tsv is not None:
+        write_metrics(metrics_tsv, timings, stats, read_stats)
+        logger.info("Metrics → %s", metrics_tsv)
 
 
 def phase_vcf(
@@ -179,20 +667,29 @@ def phase_vcf(
     bam: Path,
     *,
     out_dir: Path,
-    min_support: int = 10,
-    min_tagged_support: int = 3,
-    major_delta: float = 0.60,
-    equal_delta: float = 0.10,
-    gq_bins: str = "0:LOW,20:MED,50:HIGH",
-    support_mode: str = "hybrid",
-    bp_window: int = 100,
-    dynamic_window: bool = True,
-    tie_to_hom_alt: bool = True,
+    evidence: EvidenceOptions | None = None,
     svp_info: bool = True,
     threads: int | None = None,
-    size_match_required: bool = True,
-    size_tol_abs: int = 10,
-    size_tol_frac: float = 0.0,
+    metrics_tsv: Path | None = None,
+    cost_model: Path | None = None,
+    shard_plan: Path | None = None,
+    shard: int | None = None,
+    work_dir: Path | None = None,
+    resume: bool = False,
+    retries: int = 0,
+    max_memory: str | int | None = None,
+    regions: str | Path | None = None,
+    exclude_regions: str | Path | None = None,
+    chroms: Sequence[str] | None = None,
+    include: str | None = None,
+    filtered: str = "drop",
+    sample_fraction: float | None = None,
+    sample_n: int | None = None,
+    previous: Path | None = None,
+    write_manifest: bool = False,
+    adaptive: bool = False,
+    min_threads: int = 1,
+    **overrides: Any,
 ) -> None:
     """Phase *sv_vcf* against *bam* and write outputs to *out_dir*.
 
@@ -200,526 +697,539 @@ def phase_vcf(
       - *_phased.vcf
       - *_phased.csv
       - *_dropped_svs.csv
+      - *metrics_tsv* (optional): per-task timings and cost features
+
+    *evidence* holds the evidence options (see :class:`EvidenceOptions`);
+    each of its fields may also be given as a keyword (``min_support=5``),
+    which overrides *evidence*.
+
+    Tasks are submitted longest-first according to a cost model; pass a
+    metrics TSV from an earlier run as *cost_model* to calibrate it.
+
+    With *shard_plan* (from ``svphaser scatter``) and *shard*, only that
+    shard's records are phased; outputs are named ``<stem>.shard-NNNN_*``
+    plus a JSON manifest, ready for ``svphaser gather``.
+
+    With *work_dir*, each finished task is checkpointed there; *resume*
+    reuses checkpoints from an interrupted run with the same inputs and
+    parameters.  Failed tasks are retried *retries* times before aborting.
+
+    *max_memory* (bytes, or a size such as ``"4G"``) bounds the parent's
+    working set: the VCF is parsed in chunks into a file-backed SV table,
+    finished contigs waiting for earlier ones spill to disk, outputs are
+    written in row chunks and the phased-VCF writer loads input INFO fields
+    one contig at a time.
+
+    *regions* / *exclude_regions* (BED paths or ``chrom:start-end`` lists)
+    and *chroms* restrict which records are phased; with an indexed VCF only
+    the selected records are read, and only their BAM windows are fetched.
+
+    *include* is a record filter expression (e.g. ``"FILTER=='PASS' &&
+    abs(SVLEN)>=50"``) checked before any BAM work; records failing it are
+    dropped from all outputs (*filtered* ``"drop"``) or written unphased with
+    reason ``FILTERED`` (*filtered* ``"pass"``).
+
+    *sample_fraction* or *sample_n* turns the run into a preview: only a
+    deterministic, stratified subset of SVs is phased and, instead of the
+    usual files, ``<stem>_preview.json`` reports reason codes, tag_frac and
+    the estimated cost of the full run.
+
+    *write_manifest* also writes ``<stem>_run.json``: the parameter hash,
+    the BAM fingerprint and per-record evidence digests.  *previous* (the
+    ``<stem>_phased.csv`` of such a run) reuses that run's results for
+    records whose SV key and evidence inputs are unchanged, provided the
+    parameters and the BAM fingerprint match; a run with *previous* writes
+    its own manifest too, so incremental runs chain.
+
+    *adaptive* runs contigs as row shards and tunes how many are in flight
+    (between *min_threads* and *threads*) from throughput and I/O wait as
+    shards complete; outputs are unchanged.
     """
     out_dir.mkdir(parents=True, exist_ok=True)
+    sharded = _resolve_shard(sv_vcf, shard_plan, shard)
+    selection = RecordSelection.from_options(regions, exclude_regions, chroms)
+    if sharded is not None and selection.restricted:
+        raise ValueError("Region or contig restriction cannot be combined with a shard plan.")
+    sample = None
+    if sample_fraction is not None or sample_n is not None:
+        if sharded is not None:
+            raise ValueError("Preview sampling cannot be combined with a shard plan.")
+        if work_dir is not None or previous is not None or max_memory is not None:
+            raise ValueError(
+                "Preview sampling cannot be combined with a work dir, a previous run "
+                "or a memory limit."
+            )
+        sample = PreviewSample(fraction=sample_fraction, n=sample_n)
+    record_filter = None if include is None else RecordFilter(include, action=filtered)
 
-    bins: list[GQBin] = []
-    if gq_bins.strip():
-        for part in gq_bins.split(","):
-            thr_lbl = part.strip()
-            if not thr_lbl:
-                continue
-            try:
-                thr_s, lbl = thr_lbl.split(":")
-            except ValueError as err:
-                raise ValueError(
-                    f"Invalid gq-bin specifier: '{thr_lbl}'. " "Use '30:High,10:Moderate'."
-                ) from err
-            bins.append((int(thr_s), lbl))
-        bins.sort(key=lambda x: x[0], reverse=True)
-
-    opts = WorkerOpts(
-        min_support=min_support,
-        min_tagged_support=min_tagged_support,
-        major_delta=major_delta,
-        equal_delta=equal_delta,
-        tie_to_hom_alt=tie_to_hom_alt,
-        support_mode=support_mode,
-        bp_window=bp_window,
-        dynamic_window=dynamic_window,
-        size_match_required=size_match_required,
-        size_tol_abs=size_tol_abs,
-        size_tol_frac=size_tol_frac,
-        gq_bins=bins,
-    )
+    opts = evidence_options(evidence, **overrides).worker_opts()
+    bins = opts.gq_bins
 
     rdr = Reader(str(sv_vcf))
-    chroms: tuple[str, ...] = tuple(rdr.seqnames)
+    contigs = selection.filter_contigs(rdr.seqnames)
     rdr.close()
 
-    worker_args: list[tuple[str, Path, Path, WorkerOpts]] = [
-        (chrom, sv_vcf, bam, opts) for chrom in chroms
-    ]
-
-    threads = threads or mp.cpu_count() or 1
+    threads = threads or default_threads()
     logger.info("SvPhaser ▶ workers: %d", threads)
+    controller = None
+    if adaptive:
+        controller = ConcurrencyController(min_threads, threads, cores=detect_limits().cores)
 
-    dataframes: list[pd.DataFrame] = []
+    stem = sv_vcf.name.removesuffix(".vcf.gz").removesuffix(".vcf")
+    if sample is not None:
+        frames = [
+            df
+            for _chrom, df in _iter_phased_contigs(
+                sv_vcf,
+                bam,
+                contigs,
+                opts,
+                threads=threads,
+                metrics_tsv=metrics_tsv,
+                cost_model=cost_model,
+                selection=selection,
+                record_filter=record_filter,
+                sample=sample,
+                controller=controller,
+            )
+        ]
+        report = summarize_preview(frames, sample, threads=threads, min_support=opts.min_support)
+        write_preview(out_dir / f"{stem}_preview.json", report)
+        return
 
-    try:
-        ctx = mp.get_context("fork")
-    except ValueError:
-        ctx = mp.get_context("spawn")
-
-    if threads == 1:
-        for args in worker_args:
-            df = _phase_chrom_worker(*args)
-            dataframes.append(df)
-            chrom = df.iloc[0]["chrom"] if not df.empty else "?"
-            logger.info("chr %-6s ✔ phased %5d SVs", chrom, len(df))
-    else:
-        with ctx.Pool(processes=threads) as pool:
-            for df in pool.starmap(_phase_chrom_worker, worker_args, chunksize=1):
-                dataframes.append(df)
-                chrom = df.iloc[0]["chrom"] if not df.empty else "?"
-                logger.info("chr %-6s ✔ phased %5d SVs", chrom, len(df))
-
-    if dataframes:
-        merged = pd.concat(dataframes, ignore_index=True)
-    else:
-        merged = pd.DataFrame(
-            columns=[
-                "chrom",
-                "pos",
-                "end",
-                "id",
-                "alt",
-                "svtype",
-                "n1",
-                "n2",
-                "gt",
-                "gq",
-                "gq_label",
-            ]
+    params = run_params(opts, svp_info, record_filter)
+    store = _open_checkpoints(work_dir, resume, sv_vcf, bam, params, sharded, selection, previous)
+    # Read before any output (possibly the same files) is truncated.
+    prev_run = None if previous is None else PreviousRun.load(previous, params=params, bam=bam)
+    if sharded is not None:
+        stem = shard_stem(stem, sharded[1])
+    digests: dict[str, str | None] = {}
+    with _bounded_memory(max_memory, sv_vcf, out_dir) as spill:
+        outputs = _PhasedOutputs(
+            out_dir=out_dir,
+            stem=stem,
+            in_vcf=sv_vcf,
+            bins=bins,
+            min_support=opts.min_support,
+            svp_info=svp_info,
+            passthrough_filtered=record_filter is not None and record_filter.passthrough,
+            **_lookup_sources(
+                sv_vcf, contigs, selection, None if spill is None else spill.contig_records
+            ),
         )
-
-    merged = _ensure_required_columns(merged, bins=bins)
-
-    pre = len(merged)
-    if "support_total" in merged.columns:
-        total_support = (
-            pd.to_numeric(merged["support_total"], errors="coerce").fillna(0).astype(int)
+        with outputs:
+            for _chrom, df in _iter_phased_contigs(
+                sv_vcf,
+                bam,
+                contigs,
+                opts,
+                threads=threads,
+                metrics_tsv=metrics_tsv,
+                cost_model=cost_model,
+                shard=sharded,
+                store=store,
+                retries=retries,
+                spill=spill,
+                selection=selection,
+                record_filter=record_filter,
+                previous=prev_run,
+                digests=digests,
+                controller=controller,
+            ):
+                outputs.write(df)
+    outputs.log_summary()
+    if write_manifest or previous is not None:
+        write_run_manifest(out_dir, stem, params=params, bam=bam, evidence=digests)
+
+    if sharded is not None:
+        plan, index = sharded
+        write_shard_manifest(
+            out_dir,
+            plan,
+            index,
+            params=params,
+            n_kept=outputs.n_kept,
+            n_dropped=outputs.n_dropped,
         )
-    else:
-        n1 = pd.to_numeric(merged["n1"], errors="coerce").fillna(0).astype(int)
-        n2 = pd.to_numeric(merged["n2"], errors="coerce").fillna(0).astype(int)
-        total_support = n1 + n2
 
-    keep = total_support >= int(min_support)
 
-    stem = sv_vcf.name.removesuffix(".vcf.gz").removesuffix(".vcf")
-
-    dropped_csv = out_dir / f"{stem}_dropped_svs.csv"
-    merged.loc[~keep].to_csv(dropped_csv, index=False)
-    logger.info("Dropped SVs → %s (%d SVs)", dropped_csv, int((~keep).sum()))
-
-    kept = merged.loc[keep].reset_index(drop=True)
-    dropped = pre - len(kept)
-    if dropped:
-        logger.info("Support filter removed %d SVs", dropped)
-
-    out_csv = out_dir / f"{stem}_phased.csv"
-    kept.to_csv(out_csv, index=False)
-    logger.info("CSV → %s (%d SVs)", out_csv, len(kept))
+def iter_phase_records(
+    sv_vcf: Path,
+    bam: Path,
+    *,
+    evidence: EvidenceOptions | None = None,
+    threads: int | None = None,
+    retries: int = 0,
+    regions: str | Path | None = None,
+    exclude_regions: str | Path | None = None,
+    chroms: Sequence[str] | None = None,
+    include: str | None = None,
+    filtered: str = "drop",
+    ordered: bool = True,
+    cancel: threading.Event | None = None,
+    **overrides: Any,
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """Phase *sv_vcf* against *bam* in memory; yield ``(contig, frame)`` per contig.
+
+    Nothing is written to disk.  Each frame has the columns of
+    ``<stem>_phased.csv`` plus a boolean ``kept`` column: rows with
+    ``kept=False`` are the ones a file run writes to ``_dropped_svs.csv``.
+    Frames come in VCF header order, or with ``ordered=False`` as each
+    contig completes.  Options are those of :func:`phase_vcf`.
+
+    Setting *cancel* (from any thread) stops the run: the worker pool is
+    terminated and the iterator ends without yielding further contigs.
+    """
+    record_filter = None if include is None else RecordFilter(include, action=filtered)
+    passthrough = record_filter is not None and record_filter.passthrough
+    selection = RecordSelection.from_options(regions, exclude_regions, chroms)
+    opts = evidence_options(evidence, **overrides).worker_opts()
+    rdr = Reader(str(sv_vcf))
+    contigs = selection.filter_contigs(rdr.seqnames)
+    rdr.close()
 
-    out_vcf = out_dir / f"{stem}_phased.vcf"
-    _write_phased_vcf(
-        out_vcf,
-        sv_vcf,
-        kept,
-        gqbin_in_header=bool(bins),
-        svp_info_in_header=svp_info,
-        svp_info=svp_info,
+    frames = _iter_phased_contigs(
+        Path(sv_vcf),
+        Path(bam),
+        contigs,
+        opts,
+        threads=threads or default_threads(),
+        metrics_tsv=None,
+        cost_model=None,
+        retries=retries,
+        selection=selection,
+        record_filter=record_filter,
+        ordered=ordered,
+        cancel=cancel,
     )
-    logger.info("VCF → %s", out_vcf)
-
-
-def _vcf_info_lookup(
-    in_vcf: Path,
-) -> tuple[dict[SVKey, VcfRec], dict[SVKeyLegacy, list[SVKey]], list[str], str]:
-    """Scan input VCF once."""
-    rdr = Reader(str(in_vcf))
-    raw_header_lines = rdr.raw_header.strip().splitlines()
-    sample_name = rdr.samples[0] if rdr.samples else "SAMPLE"
-
-    full_lookup: dict[SVKey, VcfRec] = {}
-    legacy_index: dict[SVKeyLegacy, list[SVKey]] = {}
-
-    for rec in rdr:
-        chrom = rec.CHROM
-        pos = int(rec.POS)
-        vid = _normalize_vcf_id(rec.ID)
-        end = int(rec.end) if getattr(rec, "end", None) is not None else int(pos)
-        alt = ",".join(rec.ALT) if rec.ALT else "<N>"
-
-        info_dict: dict[str, Any] = {}
-        for k in rec.INFO:
-            info_key = k[0] if isinstance(k, tuple) else k
-            v = rec.INFO.get(info_key)
-            if v is not None:
-                info_dict[info_key] = v
-
-        fkey: SVKey = (chrom, pos, vid, end, alt)
-        lkey: SVKeyLegacy = (chrom, pos, vid)
-
-        full_lookup[fkey] = {
-            "REF": rec.REF,
-            "ALT": alt,
-            "QUAL": rec.QUAL if rec.QUAL is not None else ".",
-            "FILTER": rec.FILTER if rec.FILTER else "PASS",
-            "INFO": info_dict,
-        }
-        legacy_index.setdefault(lkey, []).append(fkey)
+    try:
+        for chrom, df in frames:
+            if df.empty:
+                continue
+            out = _ensure_required_columns(df, bins=opts.gq_bins, warn=False, copy=False)
+            out, keep, _phased = _split_kept(out, opts.min_support, passthrough)
+            yield chrom, out.assign(kept=keep.to_numpy()).reset_index(drop=True)
+    except _Cancelled:
+        logger.info("SvPhaser ▶ run cancelled; workers terminated")
 
-    rdr.close()
-    return full_lookup, legacy_index, raw_header_lines, sample_name
 
+def phase_records(sv_vcf: Path, bam: Path, **options: Any) -> pd.DataFrame:
+    """Phase *sv_vcf* against *bam* in memory and return one result table.
 
-def _write_headers(
-    out,
-    raw_header_lines: list[str],
-    sample_name: str,
-    *,
-    gqbin_in_header: bool,
-    svp_info_in_header: bool,
-) -> None:
-    """Write preserved meta headers + ensure GT/GQ/GQBIN, then column header."""
-    have_gt = any("##FORMAT=<ID=GT" in ln for ln in raw_header_lines)
-    have_gq = any("##FORMAT=<ID=GQ" in ln for ln in raw_header_lines)
-    have_gqbin = any("##INFO=<ID=GQBIN" in ln for ln in raw_header_lines)
-    have_svp_hp1 = any("##INFO=<ID=SVP_HP1" in ln for ln in raw_header_lines)
-
-    for line in raw_header_lines:
-        if line.startswith("##"):
-            out.write(line.rstrip() + "\n")
-
-    if not have_gt:
-        out.write('##FORMAT=<ID=GT,Number=1,Type=String,Description="Phased genotype">\n')
-    if not have_gq:
-        out.write(
-            "##FORMAT=<ID=GQ,Number=1,Type=Integer," 'Description="Genotype Quality (Phred)">\n'
-        )
-    if gqbin_in_header and not have_gqbin:
-        out.write(
-            "##INFO=<ID=GQBIN,Number=1,Type=String," 'Description="GQ bin label from SvPhaser">\n'
-        )
+    The table holds every contig's rows in VCF order, as yielded by
+    :func:`iter_phase_records` (which takes the same *options*).
+    """
+    return _records_table([df for _chrom, df in iter_phase_records(sv_vcf, bam, **options)])
 
-    if svp_info_in_header and not have_svp_hp1:
-        info_lines = [
-            (
-                "SVP_MODE",
-                "String",
-                "SvPhaser: evidence mode used " "(RNAMES_VALIDATED/HEURISTIC/RNAMES)",
-            ),
-            ("SVP_HP1", "Integer", "SvPhaser: HP=1 supporting reads"),
-            ("SVP_HP2", "Integer", "SvPhaser: HP=2 supporting reads"),
-            ("SVP_NOHP", "Integer", "SvPhaser: supporting reads without HP tag"),
-            (
-                "SVP_SUPPORT",
-                "Integer",
-                "SvPhaser: total supporting reads (HP1+HP2+NO_HP)",
-            ),
-            (
-                "SVP_TAGGED",
-                "Integer",
-                "SvPhaser: supporting reads with HP tag (HP1+HP2)",
-            ),
-            (
-                "SVP_TAGFRAC",
-                "Float",
-                "SvPhaser: fraction of supporting reads that are HP-tagged",
-            ),
-            (
-                "SVP_DELTA",
-                "Float",
-                "SvPhaser: |HP1-HP2|/(HP1+HP2) on tagged support",
-            ),
-            ("SVP_REASON", "String", "SvPhaser: decision reason code"),
-            (
-                "SVP_FETCHW",
-                "Integer",
-                "SvPhaser: fetch window (bp) used around breakpoints",
-            ),
-            (
-                "SVP_BPWIN",
-                "Integer",
-                "SvPhaser: breakpoint tolerance window (bp) " "used in evidence checks",
-            ),
-            (
-                "SVP_RNAMES_TOTAL",
-                "Integer",
-                "SvPhaser: RNAMES count in input VCF (if present)",
-            ),
-            (
-                "SVP_RNAMES_FOUND",
-                "Integer",
-                "SvPhaser: RNAMES found in BAM fetch window",
-            ),
-        ]
-        for info_id, info_type, desc in info_lines:
-            out.write(f"##INFO=<ID={info_id},Number=1,Type={info_type}," f'Description="{desc}">\n')
 
-    out.write("#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\t" + sample_name + "\n")
+def _records_table(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    if not frames:
+        return pd.DataFrame(columns=[*_EMPTY_RESULT_COLUMNS, "kept"])
+    return pd.concat(frames, ignore_index=True)
 
 
-def _vcf_safe_value(v: Any) -> str:
-    """Serialize a Python value into a VCF-compliant INFO value string.
+def _iter_cohort_contigs(
+    table: SVTable,
+    samples: Sequence[str],
+    columns: Sequence[int],
+    sample_bams: dict[str, Path],
+    opts: WorkerOpts,
+    *,
+    threads: int,
+    retries: int = 0,
+) -> Iterator[tuple[str, int, int, list[ResultBatch]]]:
+    """Run (sample, contig) tasks on one pool; yield each contig's batches in header order.
 
-    Handles tuples, lists, numpy arrays, floats, and scalars.
-    Sequences are joined with commas (no spaces, no brackets).
+    Only the mapped *columns* of *samples* get tasks; the others' batches stay empty.
     """
-    if isinstance(v, (tuple, list)):
-        return ",".join(_vcf_safe_value(x) for x in v)
-    if hasattr(v, "tolist"):
-        return ",".join(_vcf_safe_value(x) for x in v.tolist())
-    if isinstance(v, float):
-        return f"{v:g}"
-    return str(v)
-
-
-def _compose_info_str(
-    orig_info: dict[str, Any],
-    svtype: Any,
-    gq_label: Any,
-    svp_fields: dict[str, Any] | None,
-) -> str:
-    """Compose INFO with SVTYPE first, proper FLAG handling, then SvPhaser fields."""
-    items: list[str] = []
-
-    if svtype:
-        items.append(f"SVTYPE={svtype}")
-
-    for k, v in orig_info.items():
-        if k == "SVTYPE":
-            continue
-        if v is None:
-            continue
-        if v is True:
-            items.append(str(k))
-        else:
-            items.append(f"{k}={_vcf_safe_value(v)}")
-
-    if not _is_missing_scalar(gq_label):
-        items.append(f"GQBIN={gq_label}")
-
-    if svp_fields:
-        order = [
-            "SVP_MODE",
-            "SVP_HP1",
-            "SVP_HP2",
-            "SVP_NOHP",
-            "SVP_SUPPORT",
-            "SVP_TAGGED",
-            "SVP_TAGFRAC",
-            "SVP_DELTA",
-            "SVP_REASON",
-            "SVP_FETCHW",
-            "SVP_BPWIN",
-            "SVP_RNAMES_TOTAL",
-            "SVP_RNAMES_FOUND",
-        ]
-        for k in order:
-            if k not in svp_fields:
-                continue
-            v = svp_fields[k]
-            if v is None:
+    stats = contig_stats(table)
+    model = CostModel()
+    task_args: dict[str, tuple[str, int, str, int, int, SVTable, Path, WorkerOpts]] = {}
+    costs: dict[str, float] = {}
+    remaining = dict.fromkeys(table.contig_ranges, 0)
+    for j in columns:
+        sample = samples[j]
+        read_stats = bam_read_stats(sample_bams[sample])
+        for chrom, (lo, hi) in table.contig_ranges.items():
+            n = len(nonref_rows(table, j, lo, hi))
+            if n == 0:
                 continue
-            if isinstance(v, float):
-                items.append(f"{k}={v:.6g}")
-            else:
-                items.append(f"{k}={v}")
-
-    return ";".join(items) if items else "."
-
-
-def _match_full_key(
-    full_lookup: dict[SVKey, VcfRec],
-    *,
-    chrom: str,
-    pos: int,
-    vid: str,
-    end: int | None,
-    alt: str | None,
-) -> VcfRec | None:
-    """Try exact full-key lookup."""
-    if end is None or alt is None:
-        return None
-    return full_lookup.get((chrom, pos, vid, end, alt))
-
-
-def _match_legacy_key(
-    full_lookup: dict[SVKey, VcfRec],
-    legacy_index: dict[SVKeyLegacy, list[SVKey]],
+            key = task_key(sample, chrom)
+            full = model.estimate(stats[chrom], *read_stats.get(chrom, (0, 0)))
+            costs[key] = full * n / (hi - lo)
+            task_args[key] = (key, j, chrom, lo, hi, table, sample_bams[sample], opts)
+            remaining[chrom] += 1
+    submit_order = order_longest_first(task_args, costs)
+    processes = min(threads, len(submit_order))
+    logger.info("Cohort: %d sample×contig tasks on %d workers", len(submit_order), processes)
+
+    order = list(table.contig_ranges)
+    empty = ResultBuilder(0).finish()
+    pending = {chrom: [empty] * len(samples) for chrom in order}
+    with contextlib.ExitStack() as stack:
+        handle: SVTable | SVTableRef = table
+        if processes > 1:
+            handle = stack.enter_context(shared_table(table))
+        worker_args = [(*task_args[k][:5], handle, *task_args[k][6:]) for k in submit_order]
+        results = _iter_task_results(
+            worker_args,
+            processes,
+            retries=retries,
+            task=_phase_sample_task,
+            init_args=(None, handle),
+        )
+        next_i = 0
+        # The leading None releases contigs without tasks before any result arrives.
+        done: Iterable[TaskResult | None] = itertools.chain([None], results)
+        for result in done:
+            if result is not None:
+                key, batch, _seconds = result
+                _key, j, chrom, *_rest = task_args[key]
+                logger.info("%s ✔ phased %5d SVs", key, len(batch))
+                pending[chrom][j] = batch
+                remaining[chrom] -= 1
+            while next_i < len(order) and remaining[order[next_i]] == 0:
+                chrom = order[next_i]
+                next_i += 1
+                yield (chrom, *table.contig_ranges[chrom], pending.pop(chrom))
+
+
+def phase_cohort(
+    sv_vcf: Path,
+    sample_bams: Path | Mapping[str, str | Path],
     *,
-    chrom: str,
-    pos: int,
-    vid: str,
-    end: int | None,
-) -> VcfRec | None:
-    """Try legacy lookup by (chrom, pos, vid), optionally narrowing by end."""
-    candidates = legacy_index.get((chrom, pos, vid), [])
-    if not candidates:
-        return None
-
-    if len(candidates) == 1:
-        return full_lookup[candidates[0]]
-
-    if end is None:
-        return None
-
-    end_matches = [key for key in candidates if key[3] == end]
-    if len(end_matches) == 1:
-        return full_lookup[end_matches[0]]
-
-    return None
+    out_dir: Path,
+    evidence: EvidenceOptions | None = None,
+    svp_info: bool = True,
+    threads: int | None = None,
+    retries: int = 0,
+    regions: str | Path | None = None,
+    exclude_regions: str | Path | None = None,
+    chroms: Sequence[str] | None = None,
+    include: str | None = None,
+    filtered: str = "drop",
+    **overrides: Any,
+) -> None:
+    """Phase every sample of a multi-sample *sv_vcf* against its own BAM.
 
+    *sample_bams* maps sample names to BAMs: a ``sample<TAB>bam`` file or a
+    mapping.  The VCF is parsed once; each sample is evaluated only at
+    records where its input genotype carries an ALT allele, and all
+    (sample, contig) tasks share one pool.  Options mean the same as for
+    :func:`phase_vcf`.
 
-def _match_missing_id_fallback(
-    full_lookup: dict[SVKey, VcfRec],
-    *,
-    chrom: str,
-    pos: int,
-    end: int | None,
-    alt: str | None,
-) -> VcfRec | None:
-    """Fallback for callers that omit IDs: match by chrom/pos/end/alt only."""
-    if end is None or alt is None:
-        return None
+    Files:
+      - *_phased.vcf: input records kept for at least one sample, one
+        ``GT:GQ[:GQBIN][:SVP_*]`` column per VCF sample; samples without a
+        BAM keep their input genotype
+      - *_phased.csv / *_dropped_svs.csv: one row per evaluated sample call,
+        with a leading ``sample`` column
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    bams = load_sample_bams(sample_bams)
+    selection = RecordSelection.from_options(regions, exclude_regions, chroms)
+    record_filter = None if include is None else RecordFilter(include, action=filtered)
+    if record_filter is not None:
+        record_filter.check_cohort()
+    opts = evidence_options(evidence, **overrides).worker_opts()
+    bins = opts.gq_bins
 
-    matches = [
-        rec
-        for (f_chrom, f_pos, _f_vid, f_end, f_alt), rec in full_lookup.items()
-        if f_chrom == chrom and f_pos == pos and f_end == end and f_alt == alt
-    ]
-    if len(matches) == 1:
-        return matches[0]
-    return None
+    rdr = Reader(str(sv_vcf))
+    contigs = selection.filter_contigs(rdr.seqnames)
+    vcf_samples = list(rdr.samples)
+    rdr.close()
+    columns = sample_columns(vcf_samples, bams)
 
+    threads = threads or default_threads()
+    logger.info("SvPhaser ▶ cohort of %d samples, workers: %d", len(columns), threads)
 
-def _select_info_record(
-    full_lookup: dict[SVKey, VcfRec],
-    legacy_index: dict[SVKeyLegacy, list[SVKey]],
-    *,
-    chrom: str,
-    pos: int,
-    vid: str,
-    end: int | None,
-    alt: str | None,
-) -> VcfRec | None:
-    """Pick the best matching input VCF record for this phased row."""
-    hit = _match_full_key(
-        full_lookup,
-        chrom=chrom,
-        pos=pos,
-        vid=vid,
-        end=end,
-        alt=alt,
+    table = build_sv_table(
+        sv_vcf,
+        contigs,
+        opts,
+        selection=selection,
+        record_filter=record_filter,
+        samples=list(range(len(vcf_samples))),
     )
-    if hit is not None:
-        return hit
-
-    hit = _match_legacy_key(
-        full_lookup,
-        legacy_index,
-        chrom=chrom,
-        pos=pos,
-        vid=vid,
-        end=end,
+    stem = sv_vcf.name.removesuffix(".vcf.gz").removesuffix(".vcf")
+    outputs = _CohortOutputs(
+        out_dir=out_dir,
+        stem=stem,
+        in_vcf=sv_vcf,
+        samples=vcf_samples,
+        bins=bins,
+        min_support=opts.min_support,
+        svp_info=svp_info,
+        passthrough_filtered=record_filter is not None and record_filter.passthrough,
+        **_lookup_sources(sv_vcf, contigs, selection),
     )
-    if hit is not None:
-        return hit
-
-    if vid == ".":
-        return _match_missing_id_fallback(
-            full_lookup,
-            chrom=chrom,
-            pos=pos,
-            end=end,
-            alt=alt,
-        )
+    with outputs:
+        for chrom, lo, hi, batches in _iter_cohort_contigs(
+            table, vcf_samples, columns, bams, opts, threads=threads, retries=retries
+        ):
+            outputs.write(chrom, table, lo, hi, batches)
+    outputs.log_summary()
 
-    return None
 
+def phase_batch(
+    manifest: Path,
+    *,
+    evidence: EvidenceOptions | None = None,
+    threads: int | None = None,
+    retries: int = 0,
+    **defaults: Any,
+) -> None:
+    """Phase every (VCF, BAM) row of a batch *manifest* on one shared pool.
+
+    Each row is parsed up front; the contig tasks of all rows are then
+    ordered longest-first and run on a single pool, and a row's outputs
+    (the same files :func:`phase_vcf` writes) are finalized as soon as its
+    last task completes.  *evidence* and *defaults* (:func:`phase_vcf`
+    keyword options) apply to every row; manifest columns override them
+    per row.
+    """
+    entries = load_batch_manifest(manifest)
+    unknown = sorted(set(defaults) - set(OPTION_PARSERS))
+    if unknown:
+        raise TypeError(f"Unknown batch options: {', '.join(unknown)}")
+    jobs = [_BatchJob.prepare(entry, evidence, {**defaults, **entry.options}) for entry in entries]
+
+    model = CostModel()
+    owner: dict[str, tuple[int, str]] = {}
+    costs: dict[str, float] = {}
+    for i, job in enumerate(jobs):
+        stats = contig_stats(job.table)
+        read_stats = bam_read_stats(job.entry.bam)
+        for chrom in job.out_chroms:
+            key = f"{job.entry.name}:{chrom}"
+            costs[key] = model.estimate(stats[chrom], *read_stats.get(chrom, (0, 0)))
+            owner[key] = (i, chrom)
+    submit_order = order_longest_first(owner, costs)
+    threads = threads or default_threads()
+    processes = min(threads, len(submit_order))
+    logger.info(
+        "SvPhaser ▶ batch of %d runs, %d tasks, workers: %d", len(jobs), len(submit_order), threads
+    )
 
-def _write_phased_vcf(
-    out_vcf: Path,
-    in_vcf: Path,
-    df: pd.DataFrame,
+    with contextlib.ExitStack() as stack:
+        # Every row's table is shared once; tasks attach to their row's block.
+        handles: list[SVTable | SVTableRef] = [
+            stack.enter_context(shared_table(job.table)) if processes > 1 else job.table
+            for job in jobs
+        ]
+        worker_args = []
+        for key in submit_order:
+            i, chrom = owner[key]
+            job = jobs[i]
+            lo, hi = job.table.contig_ranges[chrom]
+            worker_args.append((key, chrom, lo, hi, handles[i], job.entry.bam, job.opts))
+        for job in jobs:
+            if job.remaining == 0:
+                job.finish()
+        for key, batch, _seconds in _iter_task_results(
+            worker_args,
+            processes,
+            retries=retries,
+            task=_phase_job_task,
+            init_args=(None, None),
+        ):
+            i, chrom = owner[key]
+            job = jobs[i]
+            logger.info("%s ✔ phased %5d SVs", key, len(batch))
+            job.batches[chrom] = batch
+            job.remaining -= 1
+            if job.remaining == 0:
+                job.finish()
+
+
+def phase_vcfs(
+    sv_vcfs: Sequence[Path],
+    bam_path: Path,
     *,
-    gqbin_in_header: bool,
-    svp_info_in_header: bool,
-    svp_info: bool,
+    out_dir: Path,
+    evidence: EvidenceOptions | None = None,
+    threads: int | None = None,
+    retries: int = 0,
+    **options: Any,
 ) -> None:
-    """Write a phased VCF with ensured GT/GQ and optional SvPhaser INFO."""
-    full_lookup, legacy_index, raw_header_lines, sample_name = _vcf_info_lookup(in_vcf)
-
-    with open(out_vcf, "w", newline="") as out:
-        _write_headers(
-            out,
-            raw_header_lines,
-            sample_name,
-            gqbin_in_header=gqbin_in_header,
-            svp_info_in_header=svp_info_in_header,
+    """Phase several SV VCFs against one BAM with a single shared read scan.
+
+    Each contig is one task covering the records of every VCF: overlapping
+    fetch windows are merged and each BAM read is decoded once
+    (:class:`~svphaser.phasing._scan.ReadScan`).  Every VCF gets the
+    outputs :func:`phase_vcf` would write, in *out_dir*.  *options* are the
+    :func:`phase_vcf` keyword options that apply to all inputs (evidence
+    options, ``svp_info``, region selection, ``include``/``filtered``), as
+    is *evidence*.
+    """
+    unknown = sorted(set(options) - set(OPTION_PARSERS))
+    if unknown:
+        raise TypeError(f"Unknown options for phase_vcfs: {', '.join(unknown)}")
+    entries = [
+        BatchEntry(
+            name=Path(vcf).name.removesuffix(".vcf.gz").removesuffix(".vcf"),
+            vcf=Path(vcf),
+            bam=Path(bam_path),
+            out_dir=Path(out_dir),
         )
+        for vcf in sv_vcfs
+    ]
+    duplicated = sorted(n for n, k in Counter(e.name for e in entries).items() if k > 1)
+    if duplicated:
+        raise ValueError(f"VCFs share an output stem: {', '.join(duplicated)}")
+    jobs = [_BatchJob.prepare(entry, evidence, options) for entry in entries]
+
+    # Contig → the jobs that have records on it, in input order.
+    owners: dict[str, list[int]] = {}
+    for i, job in enumerate(jobs):
+        for chrom in job.out_chroms:
+            owners.setdefault(chrom, []).append(i)
+    model = CostModel()
+    read_stats = bam_read_stats(Path(bam_path))
+    stats = [contig_stats(job.table) for job in jobs]
+    costs = {
+        chrom: sum(model.estimate(stats[i][chrom], *read_stats.get(chrom, (0, 0))) for i in owned)
+        for chrom, owned in owners.items()
+    }
+    submit_order = order_longest_first(owners, costs)
+    threads = threads or default_threads()
+    processes = min(threads, len(submit_order))
+    logger.info(
+        "SvPhaser ▶ %d VCFs, %d contigs, one read scan, workers: %d",
+        len(jobs),
+        len(submit_order),
+        threads,
+    )
 
-        for row in df.itertuples(index=False):
-            chrom = str(getattr(row, "chrom", ".")).strip()
-            pos = int(getattr(row, "pos", 0))
-
-            raw_vid = getattr(row, "id", ".")
-            vid = _normalize_vcf_id(raw_vid)
-
-            raw_end = getattr(row, "end", None)
-            end = _normalize_optional_int(raw_end)
-
-            raw_alt = getattr(row, "alt", None)
-            alt = _normalize_optional_str(raw_alt)
-
-            gt = str(getattr(row, "gt", "./."))
-            gq = str(getattr(row, "gq", "0"))
-            svtype = getattr(row, "svtype", None)
-            gq_label = getattr(row, "gq_label", None)
-
-            info = _select_info_record(
-                full_lookup,
-                legacy_index,
-                chrom=chrom,
-                pos=pos,
-                vid=vid,
-                end=end,
-                alt=alt,
-            )
-            if info is None:
-                logger.warning(
-                    "Could not uniquely match VCF record for " "%s:%s id=%s end=%s alt=%s",
-                    chrom,
-                    pos,
-                    vid,
-                    end,
-                    alt,
-                )
-                continue
-
-            svp_fields = None
-            if svp_info:
-                svp_fields = {
-                    "SVP_MODE": getattr(row, "mode", None),
-                    "SVP_HP1": int(getattr(row, "n1", 0) or 0),
-                    "SVP_HP2": int(getattr(row, "n2", 0) or 0),
-                    "SVP_NOHP": int(getattr(row, "nohp", 0) or 0),
-                    "SVP_SUPPORT": int(getattr(row, "support_total", 0) or 0),
-                    "SVP_TAGGED": int(getattr(row, "tagged_total", 0) or 0),
-                    "SVP_TAGFRAC": float(getattr(row, "tag_frac", 0.0) or 0.0),
-                    "SVP_DELTA": float(getattr(row, "delta", 0.0) or 0.0),
-                    "SVP_REASON": getattr(row, "reason", None),
-                    "SVP_FETCHW": int(getattr(row, "fetch_w", 0) or 0),
-                    "SVP_BPWIN": int(getattr(row, "bp_tol", getattr(row, "bp_window", 0)) or 0),
-                    "SVP_RNAMES_TOTAL": int(getattr(row, "rnames_total", 0) or 0),
-                    "SVP_RNAMES_FOUND": int(getattr(row, "rnames_found", 0) or 0),
-                }
-
-            info_str = _compose_info_str(info["INFO"], svtype, gq_label, svp_fields)
-
-            fields = [
-                chrom,
-                str(pos),
-                vid,
-                str(info["REF"]),
-                str(info["ALT"]),
-                str(info["QUAL"]),
-                str(info["FILTER"]),
-                info_str,
-                "GT:GQ",
-                f"{gt}:{gq}",
+    with contextlib.ExitStack() as stack:
+        handles: list[SVTable | SVTableRef] = [
+            stack.enter_context(shared_table(job.table)) if processes > 1 else job.table
+            for job in jobs
+        ]
+        worker_args = []
+        for chrom in submit_order:
+            parts = [
+                (*jobs[i].table.contig_ranges[chrom], handles[i], jobs[i].opts)
+                for i in owners[chrom]
             ]
-            out.write("\t".join(fields) + "\n")
+            worker_args.append((chrom, parts, Path(bam_path)))
+        for job in jobs:
+            if job.remaining == 0:
+                job.finish()
+        for chrom, batch, _seconds in _iter_task_results(
+            worker_args,
+            processes,
+            retries=retries,
+            task=_phase_shared_task,
+            init_args=(Path(bam_path), None),
+        ):
+            logger.info("chr %-6s ✔ phased %5d SVs", chrom, len(batch))
+            offset = 0
+            for i in owners[chrom]:
+                job = jobs[i]
+                lo, hi = job.table.contig_ranges[chrom]
+                job.batches[chrom] = batch.take(np.arange(offset, offset + hi - lo))
+                offset += hi - lo
+                job.remaining -= 1
+                if job.remaining == 0:
+                    job.finish()
@@ -0,0 +1,109 @@
+"""Shared fixtures: a tiny synthetic HP-tagged BAM and matching SV VCF."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import pysam
+import pytest
+
+from svphaser.phasing.types import WorkerOpts
+
+CONTIGS = [("chr1", 60_000), ("chr2", 40_000), ("chrUn_decoy", 5_000)]
+
+# (chrom, pos1, svtype, svlen, hp tags of supporting reads, with RNAMES)
+SVS = [
+    ("chr1", 10_001, "DEL", 400, [1] * 9 + [2] + [None] * 2, True),
+    ("chr1", 20_001, "INS", 300, [2] * 10 + [1] * 2, False),
+    ("chr1", 30_001, "DEL", 1_200, [1] * 6 + [2] * 6, True),
+    ("chr1", 40_001, "INS", 150, [1, 2, None], False),
+    ("chr2", 10_001, "INS", 500, [1] * 12, True),
+    ("chr2", 20_001, "DEL", 800, [2] * 8 + [None] * 4, False),
+    ("chr2", 30_001, "INS", 200, [None] * 11, False),
+]
+
+
+@dataclass(frozen=True)
+class SvDataset:
+    vcf: Path
+    bam: Path
+
+
+def _write_bam(path: Path) -> None:
+    header = {
+        "HD": {"VN": "1.6", "SO": "coordinate"},
+        "SQ": [{"SN": c, "LN": n} for c, n in CONTIGS],
+    }
+    tid = {c: i for i, (c, _n) in enumerate(CONTIGS)}
+    reads = []
+    for chrom, pos1, svtype, svlen, hps, _rn in SVS:
+        for k, hp in enumerate(hps):
+            op = 2 if svtype == "DEL" else 1
+            reads.append((chrom, pos1 - 1 - 600, [(0, 600), (op, svlen), (0, 600)], hp, k))
+    reads.sort(key=lambda r: (tid[r[0]], r[1]))
+
+    unsorted = path.with_suffix(".unsorted.bam")
+    with pysam.AlignmentFile(str(unsorted), "wb", header=header) as fh:
+        for chrom, start0, cigar, hp, k in reads:
+            seg = pysam.AlignedSegment(fh.header)
+            seg.query_name = f"{chrom}_{start0}_{k}"
+            qlen = sum(n for op, n in cigar if op in (0, 1, 4))
+            seg.query_sequence = "A" * qlen
+            seg.reference_id = tid[chrom]
+            seg.reference_start = start0
+            seg.mapping_quality = 60
+            seg.cigartuples = cigar
+            if hp is not None:
+                seg.set_tag("HP", hp)
+            fh.write(seg)
+    pysam.sort("-o", str(path), str(unsorted))
+    unsorted.unlink()
+    pysam.index(str(path))
+
+
+def _write_vcf(path: Path) -> None:
+    lines = ["##fileformat=VCFv4.2"]
+    lines += [f"##contig=<ID={c},length={n}>" for c, n in CONTIGS]
+    for key, num, typ in [("SVTYPE", 1, "String"), ("SVLEN", 1, "Integer"), ("END", 1, "Integer")]:
+        lines.append(f'##INFO=<ID={key},Number={num},Type={typ},Description="{key}">')
+    lines.append('##INFO=<ID=RNAMES,Number=.,Type=String,Description="Supporting reads">')
+    lines.append('##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">')
+    lines.append("#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tSAMPLE")
+    for i, (chrom, pos1, svtype, svlen, hps, with_rnames) in enumerate(SVS):
+        end = pos1 + svlen if svtype == "DEL" else pos1
+        signed = -svlen if svtype == "DEL" else svlen
+        info = f"SVTYPE={svtype};SVLEN={signed};END={end}"
+        if with_rnames:
+            start0 = pos1 - 1 - 600
+            info += ";RNAMES=" + ",".join(f"{chrom}_{start0}_{k}" for k in range(len(hps)))
+        lines.append(f"{chrom}\t{pos1}\tsv{i}\tN\t<{svtype}>\t60\tPASS\t{info}\tGT\t0/1")
+    path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture(scope="session")
+def sv_dataset(tmp_path_factory: pytest.TempPathFactory) -> SvDataset:
+    root = tmp_path_factory.mktemp("svdata")
+    bam = root / "reads.bam"
+    vcf = root / "calls.vcf"
+    _write_bam(bam)
+    _write_vcf(vcf)
+    return SvDataset(vcf=vcf, bam=bam)
+
+
+@pytest.fixture
+def worker_opts() -> WorkerOpts:
+    return WorkerOpts(
+        min_support=10,
+        min_tagged_support=3,
+        major_delta=0.6,
+        equal_delta=0.1,
+        tie_to_hom_alt=True,
+        support_mode="hybrid",
+        bp_window=100,
+        dynamic_window=True,
+        size_match_required=True,
+        size_tol_abs=10,
+        size_tol_frac=0.0,
+        gq_bins=[],
+    )
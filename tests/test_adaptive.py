@@ -0,0 +1,72 @@
+"""Tests for svphaser.phasing._adaptive — adaptive worker concurrency."""
+
+import logging
+
+import pytest
+
+from svphaser.phasing import _adaptive
+from svphaser.phasing._adaptive import ConcurrencyController, split_shards
+from svphaser.phasing.io import phase_vcf
+
+
+def _round(ctl, now, *, svs, cpu_fraction):
+    """Finish one round of shards, *svs* SVs in total, one second of task time each."""
+    n = max(2, ctl.target)
+    for _ in range(n):
+        ctl.observe(svs // n, 0.0, 1.0, cpu_fraction, now=now)
+
+
+def test_controller_adapts_to_io_wait_and_cpu_load():
+    ctl = ConcurrencyController(min_workers=1, max_workers=6, cores=2, _started=0.0)
+    assert ctl.target == 2
+    # Waiting on I/O: more shards in flight while throughput keeps up.
+    _round(ctl, 1.0, svs=100, cpu_fraction=0.2)
+    assert ctl.target == 3
+    _round(ctl, 2.0, svs=150, cpu_fraction=0.2)
+    assert ctl.target == 4
+    # Throughput fell after the last step: undo it, then hold for a round.
+    _round(ctl, 3.0, svs=80, cpu_fraction=0.2)
+    assert ctl.target == 3
+    _round(ctl, 4.0, svs=150, cpu_fraction=0.2)
+    assert ctl.target == 3
+    # CPU-bound: back towards one shard per core, never below the bound.
+    _round(ctl, 5.0, svs=150, cpu_fraction=0.95)
+    _round(ctl, 6.0, svs=150, cpu_fraction=0.95)
+    assert ctl.target == 2
+    assert [h[0] for h in ctl.history] == [2, 3, 4, 3, 3, 2]
+    # Idle cores become htslib decompression threads.
+    assert ConcurrencyController(1, 8, cores=8, target=2).hts_threads == 4
+
+    with pytest.raises(ValueError, match="Adaptive bounds"):
+        ConcurrencyController(min_workers=4, max_workers=2, cores=8)
+
+
+def test_split_shards_covers_each_contig_in_order():
+    shards = split_shards([("chr1", 0, 5), ("chr2", 5, 7)], 2)
+    assert shards == [
+        ("chr1", 0, 2, 0),
+        ("chr1", 2, 4, 1),
+        ("chr1", 4, 5, 2),
+        ("chr2", 5, 7, 0),
+    ]
+
+
+def test_adaptive_run_matches_fixed_threads(sv_dataset, tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(_adaptive, "MIN_SHARD_SVS", 2)
+    phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path / "fixed", threads=1)
+    with caplog.at_level(logging.INFO, logger="svphaser.phasing.io"):
+        phase_vcf(
+            sv_dataset.vcf,
+            sv_dataset.bam,
+            out_dir=tmp_path / "adaptive",
+            threads=3,
+            adaptive=True,
+            metrics_tsv=tmp_path / "m.tsv",
+        )
+    assert "Adaptive: 4 shards of ≤2 SVs" in caplog.text
+    for name in ("calls_phased.csv", "calls_dropped_svs.csv", "calls_phased.vcf"):
+        fixed = (tmp_path / "fixed" / name).read_bytes()
+        assert (tmp_path / "adaptive" / name).read_bytes() == fixed
+    # Metrics stay per contig, with the shards' seconds summed.
+    rows = (tmp_path / "m.tsv").read_text().splitlines()[1:]
+    assert sorted(ln.split("\t")[0] for ln in rows) == ["chr1", "chr2"]
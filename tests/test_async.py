@@ -0,0 +1,45 @@
+"""Tests for the asyncio entry points."""
+
+import asyncio
+import multiprocessing as mp
+import time
+
+from svphaser.phasing import aiter_phase_records, aphase_records, phase_records
+from svphaser.phasing import io as phasing_io
+
+
+def test_aphase_records_matches_sync(sv_dataset):
+    async def run():
+        chroms = [c async for c, _df in aiter_phase_records(sv_dataset.vcf, sv_dataset.bam)]
+        df = await aphase_records(sv_dataset.vcf, sv_dataset.bam, threads=2)
+        return chroms, df
+
+    chroms, df = asyncio.run(run())
+    assert chroms == ["chr1", "chr2"]
+    assert df.equals(phase_records(sv_dataset.vcf, sv_dataset.bam, threads=1))
+
+
+def _stuck_task(*args):
+    time.sleep(60)
+
+
+def test_cancellation_terminates_workers(sv_dataset, monkeypatch):
+    monkeypatch.setattr(phasing_io, "_phase_table_task", _stuck_task)
+
+    async def run():
+        async def consume():
+            async for _item in aiter_phase_records(sv_dataset.vcf, sv_dataset.bam, threads=2):
+                pass
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.5)
+        t0 = time.perf_counter()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return time.perf_counter() - t0
+        raise AssertionError("not cancelled")
+
+    assert asyncio.run(run()) < 5
+    assert mp.active_children() == []
@@ -0,0 +1,57 @@
+"""Tests for manifest-driven batch runs sharing one worker pool."""
+
+import pytest
+
+from svphaser.phasing._batch import load_batch_manifest
+from svphaser.phasing.io import phase_batch, phase_vcf
+
+OUTPUTS = ("calls_phased.csv", "calls_dropped_svs.csv", "calls_phased.vcf")
+
+
+def test_batch_matches_separate_runs(sv_dataset, tmp_path):
+    manifest = tmp_path / "batch.tsv"
+    manifest.write_text(
+        "name\tvcf\tbam\tout_dir\tmin-support\tinclude\twrite_manifest\n"
+        f"a\t{sv_dataset.vcf}\t{sv_dataset.bam}\tout/a\t\t\t\n"
+        f"b\t{sv_dataset.vcf}\t{sv_dataset.bam}\tout/b\t3\tSVTYPE=='DEL'\ttrue\n"
+    )
+    phase_batch(manifest, threads=3)
+
+    phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path / "ref_a", threads=1)
+    phase_vcf(
+        sv_dataset.vcf,
+        sv_dataset.bam,
+        out_dir=tmp_path / "ref_b",
+        threads=1,
+        min_support=3,
+        include="SVTYPE=='DEL'",
+        write_manifest=True,
+    )
+    assert not (tmp_path / "out" / "a" / "calls_run.json").exists()
+    for row, outputs in (("a", OUTPUTS), ("b", (*OUTPUTS, "calls_run.json"))):
+        for name in outputs:
+            got = (tmp_path / "out" / row / name).read_bytes()
+            assert got == (tmp_path / f"ref_{row}" / name).read_bytes(), (row, name)
+
+
+def test_manifest_validation(sv_dataset, tmp_path):
+    manifest = tmp_path / "batch.tsv"
+    manifest.write_text(
+        f"vcf\tbam\tout_dir\tmin_suport\n{sv_dataset.vcf}\t{sv_dataset.bam}\to\t3\n"
+    )
+    with pytest.raises(ValueError, match="unknown column.*min_suport"):
+        load_batch_manifest(manifest)
+
+    manifest.write_text(
+        "vcf\tbam\tout_dir\n"
+        f"{sv_dataset.vcf}\t{sv_dataset.bam}\to1\n"
+        f"{sv_dataset.vcf}\t{sv_dataset.bam}\to2\n"
+    )
+    with pytest.raises(ValueError, match="duplicate row names calls"):
+        load_batch_manifest(manifest)
+
+    manifest.write_text(
+        f"vcf\tbam\tout_dir\tdynamic_window\ncalls.vcf\t{sv_dataset.bam}\to\tmaybe\n"
+    )
+    with pytest.raises(ValueError, match="dynamic_window: expected a boolean"):
+        load_batch_manifest(manifest)
@@ -0,0 +1,73 @@
+"""Tests for checkpointed, resumable and retried phasing runs."""
+
+import pytest
+
+import svphaser.phasing.io as io_mod
+
+OUTPUTS = ("calls_phased.csv", "calls_dropped_svs.csv", "calls_phased.vcf")
+
+
+def _spy(monkeypatch, *, fail_first=()):
+    real = io_mod._phase_table_task
+    calls = []
+
+    def spy(chrom, *args):
+        calls.append(chrom)
+        if chrom in fail_first and calls.count(chrom) == 1:
+            raise OSError(f"transient failure on {chrom}")
+        return real(chrom, *args)
+
+    monkeypatch.setattr(io_mod, "_phase_table_task", spy)
+    return calls
+
+
+def test_resume_skips_checkpointed_tasks(sv_dataset, tmp_path, monkeypatch):
+    work = tmp_path / "work"
+    io_mod.phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path / "a", work_dir=work)
+    checkpoints = sorted((work / "tasks").iterdir())
+    assert len(checkpoints) == 2
+
+    # Lose one contig's checkpoint: only that contig is recomputed.
+    checkpoints[0].unlink()
+    calls = _spy(monkeypatch)
+    io_mod.phase_vcf(
+        sv_dataset.vcf,
+        sv_dataset.bam,
+        out_dir=tmp_path / "b",
+        threads=1,
+        work_dir=work,
+        resume=True,
+    )
+    assert len(calls) == 1
+    for name in OUTPUTS:
+        assert (tmp_path / "b" / name).read_bytes() == (tmp_path / "a" / name).read_bytes()
+
+
+def test_resume_refuses_checkpoints_from_other_parameters(sv_dataset, tmp_path):
+    work = tmp_path / "work"
+    io_mod.phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path, threads=1, work_dir=work)
+    with pytest.raises(ValueError, match="different inputs or parameters"):
+        io_mod.phase_vcf(
+            sv_dataset.vcf,
+            sv_dataset.bam,
+            out_dir=tmp_path,
+            threads=1,
+            min_support=3,
+            work_dir=work,
+            resume=True,
+        )
+
+
+def test_failed_task_is_retried(sv_dataset, tmp_path, monkeypatch):
+    calls = _spy(monkeypatch, fail_first={"chr2"})
+    io_mod.phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path, threads=1, retries=1)
+    assert calls.count("chr2") == 2
+
+
+def test_run_aborts_when_retries_are_exhausted(sv_dataset, tmp_path, monkeypatch):
+    work = tmp_path / "work"
+    _spy(monkeypatch, fail_first={"chr2"})
+    with pytest.raises(OSError, match="transient failure on chr2"):
+        io_mod.phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path, threads=1, work_dir=work)
+    # chr1 finished before the abort and is kept for --resume.
+    assert len(list((work / "tasks").iterdir())) == 1
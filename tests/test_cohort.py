@@ -0,0 +1,112 @@
+"""Tests for cohort mode: one multi-sample VCF phased against per-sample BAMs."""
+
+import pytest
+
+from svphaser.phasing._cohort import load_sample_bams
+from svphaser.phasing.io import phase_cohort, phase_vcf
+
+# Second sample's input genotypes, per record of the shared dataset.
+S2_GTS = ["0/0", "1/1", "./.", "0|1", "0/0", "1/0", "0/0"]
+
+
+@pytest.fixture(scope="module")
+def cohort(sv_dataset, tmp_path_factory):
+    root = tmp_path_factory.mktemp("cohort")
+    lines = sv_dataset.vcf.read_text().splitlines()
+    out, k = [], 0
+    for line in lines:
+        if line.startswith("#CHROM"):
+            line += "\tS2"
+        elif not line.startswith("#"):
+            line += "\t" + S2_GTS[k]
+            k += 1
+        out.append(line)
+    vcf = root / "calls.vcf"
+    vcf.write_text("\n".join(out) + "\n")
+    sample_map = root / "samples.tsv"
+    sample_map.write_text(f"# sample\tbam\nS2\t{sv_dataset.bam}\nSAMPLE\t{sv_dataset.bam}\n")
+    return vcf, sample_map
+
+
+def _body(path):
+    return [ln.split("\t") for ln in path.read_text().splitlines() if not ln.startswith("#")]
+
+
+def test_each_sample_matches_a_single_sample_run(sv_dataset, cohort, tmp_path):
+    vcf, sample_map = cohort
+    phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path / "single", threads=1)
+    phase_cohort(vcf, sample_map, out_dir=tmp_path / "cohort", threads=3)
+
+    # Every input GT of SAMPLE is 0/1, so its calls are exactly the single-sample ones.
+    for name in ("calls_phased.csv", "calls_dropped_svs.csv"):
+        single = (tmp_path / "single" / name).read_text().splitlines()
+        rows = (tmp_path / "cohort" / name).read_text().splitlines()
+        assert rows[0] == "sample," + single[0]
+        assert [r.split(",", 1)[1] for r in rows[1:] if r.startswith("SAMPLE,")] == single[1:]
+
+    single_gt = {
+        (f[0], f[1]): f[9].split(":")[:2] for f in _body(tmp_path / "single" / "calls_phased.vcf")
+    }
+    header = (tmp_path / "cohort" / "calls_phased.vcf").read_text()
+    assert "\tFORMAT\tSAMPLE\tS2\n" in header
+    for f in _body(tmp_path / "cohort" / "calls_phased.vcf"):
+        assert f[8] == "GT:GQ:GQBIN:SVP_HP1:SVP_HP2:SVP_NOHP:SVP_REASON"
+        if (f[0], f[1]) in single_gt:
+            assert f[9].split(":")[:2] == single_gt[(f[0], f[1])]
+
+
+def test_reference_genotypes_are_not_evaluated(cohort, tmp_path):
+    vcf, sample_map = cohort
+    phase_cohort(vcf, sample_map, out_dir=tmp_path, threads=1)
+    rows = [
+        r.split(",")
+        for name in ("calls_phased.csv", "calls_dropped_svs.csv")
+        for r in (tmp_path / name).read_text().splitlines()[1:]
+    ]
+    assert sorted(r[3] for r in rows if r[0] == "S2") == ["sv1", "sv3", "sv5"]
+
+    # Unevaluated samples keep their input GT with missing fields.
+    for f in _body(tmp_path / "calls_phased.vcf"):
+        if f[2] in {"sv0", "sv2", "sv4", "sv6"}:
+            assert f[10] == S2_GTS[int(f[2][2:])] + ":.:.:.:.:.:."
+
+
+def test_unmapped_samples_keep_their_input_genotypes(sv_dataset, cohort, tmp_path, caplog):
+    vcf, _sample_map = cohort
+    with caplog.at_level("WARNING"):
+        phase_cohort(vcf, {"S2": sv_dataset.bam}, out_dir=tmp_path, threads=1)
+    assert "1 of 2 VCF samples have no BAM" in caplog.text
+
+    rows = (tmp_path / "calls_phased.csv").read_text().splitlines()[1:]
+    assert rows and all(r.startswith("S2,") for r in rows)
+    assert "\tFORMAT\tSAMPLE\tS2\n" in (tmp_path / "calls_phased.vcf").read_text()
+    body = _body(tmp_path / "calls_phased.vcf")
+    assert body and all(f[9] == "0/1:.:.:.:.:.:." for f in body)
+
+
+def test_threads_do_not_change_outputs(cohort, tmp_path):
+    vcf, sample_map = cohort
+    for threads in (1, 4):
+        phase_cohort(vcf, sample_map, out_dir=tmp_path / str(threads), threads=threads)
+    for name in ("calls_phased.csv", "calls_dropped_svs.csv", "calls_phased.vcf"):
+        assert (tmp_path / "1" / name).read_bytes() == (tmp_path / "4" / name).read_bytes()
+
+
+def test_sample_map_validation(sv_dataset, cohort, tmp_path):
+    vcf, _sample_map = cohort
+    with pytest.raises(ValueError, match="not found"):
+        load_sample_bams({"S2": tmp_path / "missing.bam"})
+    bad = tmp_path / "dup.tsv"
+    bad.write_text(f"S2\t{sv_dataset.bam}\nS2\t{sv_dataset.bam}\n")
+    with pytest.raises(ValueError, match="mapped twice"):
+        load_sample_bams(bad)
+    with pytest.raises(ValueError, match="not in the VCF: S9"):
+        phase_cohort(vcf, {"S9": sv_dataset.bam}, out_dir=tmp_path)
+
+
+def test_genotype_filters_are_rejected(cohort, tmp_path):
+    vcf, sample_map = cohort
+    with pytest.raises(ValueError, match="uses GT, which differs per sample"):
+        phase_cohort(vcf, sample_map, out_dir=tmp_path, include="GT!='0/0'")
+    phase_cohort(vcf, sample_map, out_dir=tmp_path, threads=1, include="SVTYPE=='DEL'")
+    assert (tmp_path / "calls_phased.vcf").exists()
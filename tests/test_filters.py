@@ -0,0 +1,78 @@
+"""Tests for svphaser.phasing._filters — --include record filter expressions."""
+
+import pandas as pd
+import pytest
+from cyvcf2 import Reader
+
+from svphaser.phasing._filters import RecordFilter
+from svphaser.phasing._workers import _site_from_record
+from svphaser.phasing.io import phase_vcf
+
+
+def _matching_ids(sv_dataset, worker_opts, expression):
+    flt = RecordFilter(expression)
+    return [
+        rec.ID
+        for rec in Reader(str(sv_dataset.vcf))
+        if flt(rec, _site_from_record(rec, opts=worker_opts))
+    ]
+
+
+def test_expressions_see_record_fields(sv_dataset, worker_opts):
+    assert _matching_ids(sv_dataset, worker_opts, "SVTYPE=='DEL' && abs(SVLEN)>=800") == [
+        "sv2",
+        "sv5",
+    ]
+    assert _matching_ids(sv_dataset, worker_opts, "CHROM='chr2' || !(POS<40001)") == [
+        "sv3",
+        "sv4",
+        "sv5",
+        "sv6",
+    ]
+    assert len(_matching_ids(sv_dataset, worker_opts, "FILTER=='PASS' && GT!='0/0'")) == 7
+    # Missing INFO values never match instead of raising.
+    assert _matching_ids(sv_dataset, worker_opts, "RNAMES!=None && len(RNAMES)>0") == [
+        "sv0",
+        "sv2",
+        "sv4",
+    ]
+    assert _matching_ids(sv_dataset, worker_opts, "MISSING>3") == []
+    # So does min()/max() of an empty sequence.
+    assert _matching_ids(sv_dataset, worker_opts, "max(RNAMES or ())>''") == ["sv0", "sv2", "sv4"]
+    assert _matching_ids(sv_dataset, worker_opts, "min([])>0") == []
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["__import__('os')", "SVLEN.real > 0", "ID[0]=='s'", "lambda: 1", "SVLEN >"],
+)
+def test_unsafe_or_invalid_expressions_are_rejected(expression):
+    with pytest.raises(ValueError):
+        RecordFilter(expression)
+
+
+@pytest.mark.parametrize("action", ["drop", "pass"])
+def test_filtered_records_skip_phasing(sv_dataset, tmp_path, action):
+    phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path / "full", threads=1)
+    phase_vcf(
+        sv_dataset.vcf,
+        sv_dataset.bam,
+        out_dir=tmp_path / "part",
+        threads=2,
+        include="SVTYPE=='INS'",
+        filtered=action,
+    )
+    full = pd.read_csv(tmp_path / "full" / "calls_phased.csv")
+    part = pd.read_csv(tmp_path / "part" / "calls_phased.csv")
+    phased = part[part["reason"] != "FILTERED"]
+    expected = full[full["svtype"] == "INS"].reset_index(drop=True)
+    pd.testing.assert_frame_equal(phased.reset_index(drop=True), expected)
+
+    filtered = part[part["reason"] == "FILTERED"]
+    if action == "drop":
+        assert filtered.empty
+    else:
+        assert list(filtered["id"]) == ["sv0", "sv2", "sv5"]
+        assert (filtered["gt"] == "./.").all() and (filtered["support_total"] == 0).all()
+        vcf = (tmp_path / "part" / "calls_phased.vcf").read_text()
+        assert vcf.count("SVP_REASON=FILTERED") == 3
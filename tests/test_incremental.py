@@ -0,0 +1,136 @@
+"""Tests for incremental re-phasing against a previous run (``--previous``)."""
+
+import numpy as np
+import pytest
+
+import svphaser.phasing.io as io_mod
+from svphaser.phasing._incremental import _read_results
+from svphaser.phasing._results import ResultBatch, interleave_batches
+
+OUTPUTS = ("calls_phased.csv", "calls_dropped_svs.csv", "calls_phased.vcf")
+
+
+def _spy(monkeypatch):
+    real = io_mod._phase_table_task
+    calls = []
+
+    def spy(chrom, *args):
+        calls.append(chrom)
+        return real(chrom, *args)
+
+    monkeypatch.setattr(io_mod, "_phase_table_task", spy)
+    return calls
+
+
+def _first_run(sv_dataset, out_dir):
+    io_mod.phase_vcf(
+        sv_dataset.vcf, sv_dataset.bam, out_dir=out_dir, threads=1, write_manifest=True
+    )
+
+
+def test_rerun_reuses_every_result(sv_dataset, tmp_path, monkeypatch):
+    _first_run(sv_dataset, tmp_path / "a")
+    assert (tmp_path / "a" / "calls_run.json").exists()
+    io_mod.phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path / "plain", threads=1)
+    assert not (tmp_path / "plain" / "calls_run.json").exists()
+
+    calls = _spy(monkeypatch)
+    io_mod.phase_vcf(
+        sv_dataset.vcf,
+        sv_dataset.bam,
+        out_dir=tmp_path / "b",
+        threads=2,
+        previous=tmp_path / "a" / "calls_phased.csv",
+    )
+    assert calls == []
+    for name in OUTPUTS:
+        assert (tmp_path / "b" / name).read_bytes() == (tmp_path / "a" / name).read_bytes()
+
+
+def test_changed_records_are_rephased(sv_dataset, tmp_path, monkeypatch):
+    _first_run(sv_dataset, tmp_path / "a")
+
+    # Move one chr2 SV: only chr2 has work left, and the result matches a full run.
+    edited = tmp_path / "calls.vcf"
+    edited.write_text(sv_dataset.vcf.read_text().replace("chr2\t30001\t", "chr2\t30011\t"))
+    io_mod.phase_vcf(edited, sv_dataset.bam, out_dir=tmp_path / "full", threads=1)
+
+    calls = _spy(monkeypatch)
+    io_mod.phase_vcf(
+        edited,
+        sv_dataset.bam,
+        out_dir=tmp_path / "b",
+        threads=1,
+        previous=tmp_path / "a" / "calls_phased.csv",
+    )
+    assert calls == ["chr2"]
+    for name in OUTPUTS:
+        assert (tmp_path / "b" / name).read_bytes() == (tmp_path / "full" / name).read_bytes()
+
+
+def test_changed_rnames_are_rephased(sv_dataset, tmp_path, monkeypatch):
+    _first_run(sv_dataset, tmp_path / "a")
+
+    # Only the RNAMES of one chr1 SV change; its key and windows stay the same.
+    lines = sv_dataset.vcf.read_text().splitlines(keepends=True)
+    edited = tmp_path / "calls.vcf"
+    edited.write_text(
+        "".join(
+            (
+                line.replace("RNAMES=", "RNAMES=other_read,")
+                if line.startswith("chr1\t30001\t")
+                else line
+            )
+            for line in lines
+        )
+    )
+    io_mod.phase_vcf(edited, sv_dataset.bam, out_dir=tmp_path / "full", threads=1)
+
+    calls = _spy(monkeypatch)
+    io_mod.phase_vcf(
+        edited,
+        sv_dataset.bam,
+        out_dir=tmp_path / "b",
+        threads=1,
+        previous=tmp_path / "a" / "calls_phased.csv",
+    )
+    assert calls == ["chr1"]
+    for name in OUTPUTS:
+        assert (tmp_path / "b" / name).read_bytes() == (tmp_path / "full" / name).read_bytes()
+
+
+def test_other_parameters_rephase_everything(sv_dataset, tmp_path, monkeypatch):
+    _first_run(sv_dataset, tmp_path / "a")
+    calls = _spy(monkeypatch)
+    io_mod.phase_vcf(
+        sv_dataset.vcf,
+        sv_dataset.bam,
+        out_dir=tmp_path / "b",
+        threads=1,
+        min_support=3,
+        previous=tmp_path / "a" / "calls_phased.csv",
+    )
+    assert sorted(calls) == ["chr1", "chr2"]
+
+
+def test_previous_needs_a_run_manifest(sv_dataset, tmp_path):
+    _first_run(sv_dataset, tmp_path / "a")
+    (tmp_path / "a" / "calls_run.json").unlink()
+    with pytest.raises(ValueError, match="no run manifest"):
+        io_mod.phase_vcf(
+            sv_dataset.vcf,
+            sv_dataset.bam,
+            out_dir=tmp_path / "b",
+            previous=tmp_path / "a" / "calls_phased.csv",
+        )
+
+
+def test_interleave_batches_round_trips_frames(sv_dataset, tmp_path):
+    io_mod.phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path, threads=1)
+    frame = _read_results(tmp_path / "calls_phased.csv")
+    batch = ResultBatch.from_frame(frame)
+    odd = np.arange(len(frame)) % 2 == 1
+    merged = interleave_batches(
+        batch.take(np.flatnonzero(~odd)), batch.take(np.flatnonzero(odd)), odd
+    )
+    assert merged.to_frame().equals(batch.to_frame())
@@ -1,6 +1,6 @@
-"""Tests for _compose_info_str and _vcf_safe_value in svphaser.phasing.io."""
+"""Tests for the output writers in svphaser.phasing._outputs and the io engine."""
 
-from svphaser.phasing.io import _compose_info_str, _vcf_safe_value
+from svphaser.phasing._outputs import _compose_info_str, _vcf_safe_value
 
 
 class TestVcfSafeValue:
@@ -91,3 +91,108 @@ class TestComposeInfoStr:
     def test_empty_info(self):
         result = _compose_info_str({}, None, None, None)
         assert result == "."
+
+
+class TestPhaseVcfDispatch:
+    def test_contigs_without_svs_are_not_dispatched(
+        self, sv_dataset, tmp_path, monkeypatch, caplog
+    ):
+        import svphaser.phasing.io as io_mod
+
+        seen = []
+        real = io_mod._phase_table_task
+
+        def spy(chrom, *args):
+            seen.append(chrom)
+            return real(chrom, *args)
+
+        monkeypatch.setattr(io_mod, "_phase_table_task", spy)
+        with caplog.at_level("INFO"):
+            io_mod.phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path, threads=1)
+
+        assert sorted(seen) == ["chr1", "chr2"]
+        assert "Skipping 1 of 3 contigs with no SV records" in caplog.text
+
+
+class TestStreamingOutput:
+    def test_reorder_buffer_releases_in_header_order(self):
+        from svphaser.phasing._results import ResultBuilder
+        from svphaser.phasing.io import _in_output_order
+
+        frames = {c: ResultBuilder().finish() for c in ("chr1", "chr2", "chr3")}
+        released = []
+
+        def completions():
+            for chrom in ("chr3", "chr1", "chr2"):
+                yield chrom, frames[chrom], 0.5
+                released.append(f"done:{chrom}")
+
+        timings: dict[str, float] = {}
+        order = []
+        for chrom, _df in _in_output_order(completions(), ["chr1", "chr2", "chr3"], timings):
+            order.append(chrom)
+            released.append(chrom)
+
+        assert order == ["chr1", "chr2", "chr3"]
+        # chr1 is written as soon as it arrives, before chr2 completes.
+        assert released[:3] == ["done:chr3", "chr1", "done:chr1"]
+        assert set(timings) == {"chr1", "chr2", "chr3"}
+
+    def test_streamed_outputs_match_single_frame_write(self, sv_dataset, tmp_path):
+        import pandas as pd
+
+        from svphaser.phasing._outputs import _write_phased_vcf
+        from svphaser.phasing.io import phase_vcf
+
+        phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path, threads=2, min_support=1)
+        stem = sv_dataset.vcf.name.removesuffix(".vcf.gz").removesuffix(".vcf")
+        kept = pd.read_csv(tmp_path / f"{stem}_phased.csv")
+        assert list(kept["chrom"].unique()) == ["chr1", "chr2"]
+
+        ref_vcf = tmp_path / "ref.vcf"
+        _write_phased_vcf(
+            ref_vcf,
+            sv_dataset.vcf,
+            kept,
+            gqbin_in_header=True,
+            svp_info_in_header=True,
+            svp_info=True,
+        )
+        assert (tmp_path / f"{stem}_phased.vcf").read_text() == ref_vcf.read_text()
+
+
+class TestCompactNormalization:
+    def test_vectorized_gq_label_matches_scalar_rule(self):
+        import pandas as pd
+
+        from svphaser.phasing._options import parse_gq_bins
+        from svphaser.phasing._outputs import _backfill_gq_label, _gq_label_from_bins
+
+        bins = parse_gq_bins("30:High,10:Moderate,0:Low")
+        gqs = [0, 5, 9, 10, 29, 30, 99, None]
+        df = pd.DataFrame({"gq": gqs})
+        _backfill_gq_label(df, bins=bins)
+
+        assert isinstance(df["gq_label"].dtype, pd.CategoricalDtype)
+        expected = [_gq_label_from_bins(g, bins) if g is not None else None for g in gqs]
+        got = [None if pd.isna(v) else v for v in df["gq_label"]]
+        assert got == expected
+
+    def test_engine_normalizes_in_place_and_keeps_compact_dtypes(self):
+        import pandas as pd
+
+        from svphaser.phasing._options import parse_gq_bins
+        from svphaser.phasing._outputs import _ensure_required_columns
+        from svphaser.phasing._results import RESULT_COLUMNS, ResultBuilder
+
+        row = dict.fromkeys(RESULT_COLUMNS, 1)
+        row.update(chrom="chr1", svtype="DEL", gt="0|1", reason="R", mode="HEURISTIC", alt=None)
+        builder = ResultBuilder()
+        builder.append(**row)
+        df = builder.finish().to_frame()
+
+        out = _ensure_required_columns(df, bins=parse_gq_bins("30:High"), warn=False, copy=False)
+        assert out is df
+        assert isinstance(out["gt"].dtype, pd.CategoricalDtype)
+        assert out["gq"].dtype == "int32"
+        assert out["alt"].isna().all()
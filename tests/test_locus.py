@@ -0,0 +1,60 @@
+"""Tests for svphaser.phasing._locus — single-locus evaluation."""
+
+import math
+import threading
+
+import pysam
+import pytest
+from conftest import SVS
+
+from svphaser import phase_records
+from svphaser.phasing import LocusEvaluator, evaluate_locus
+
+
+def _args(chrom, pos1, svtype, svlen, hps, with_rnames):
+    end = pos1 + svlen if svtype == "DEL" else pos1
+    rnames = [f"{chrom}_{pos1 - 1 - 600}_{k}" for k in range(len(hps))] if with_rnames else None
+    return chrom, pos1, end, svtype, -svlen if svtype == "DEL" else svlen, rnames
+
+
+def test_evaluator_matches_phase_records(sv_dataset):
+    expected = phase_records(sv_dataset.vcf, sv_dataset.bam, threads=1)
+    with LocusEvaluator() as evaluator:
+        calls = [evaluator.evaluate(sv_dataset.bam, *_args(*sv)) for sv in SVS]
+    assert len(calls) == len(expected)
+    fields = ("pos", "end", "svlen", "hp1", "hp2", "nohp", "support_total", "gt", "gq")
+    for call, row in zip(calls, expected.itertuples()):
+        assert {f: getattr(call, f) for f in fields} == {f: getattr(row, f) for f in fields}
+        assert (call.reason, call.mode, call.kept) == (row.reason, row.mode, row.kept)
+        assert call.tag_frac == pytest.approx(row.tag_frac)
+        label = row.gq_label if isinstance(row.gq_label, str) else None
+        assert call.gq_label == label
+
+    one_off = evaluate_locus(sv_dataset.bam, *_args(*SVS[0]))
+    with pysam.AlignmentFile(str(sv_dataset.bam), "rb") as bam:
+        assert evaluate_locus(bam, *_args(*SVS[0])) == one_off == calls[0]
+    assert (one_off.gt, one_off.reason) == ("1|0", "MAJOR_HP1")
+
+
+def test_evaluator_pools_handles_across_threads(sv_dataset):
+    evaluator = LocusEvaluator(max_handles=2)
+    results = []
+
+    def work():
+        results.extend(evaluator.evaluate(sv_dataset.bam, *_args(*sv)).gt for sv in SVS * 5)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 4 * 5 * len(SVS)
+    assert len(evaluator._pools[str(sv_dataset.bam)].idle) <= 2
+    evaluator.close()
+    assert not evaluator._pools
+
+    missing = evaluate_locus(sv_dataset.bam, "chr1", 55_000, None, "INS", 300)
+    assert (missing.support_total, missing.reason) == (0, "NO_SUPPORT")
+    assert not missing.kept and math.isclose(missing.delta, 1.0)
+    with pytest.raises(ValueError, match="max_handles"):
+        LocusEvaluator(max_handles=0)
@@ -0,0 +1,46 @@
+"""Tests for svphaser.phasing._options — the shared evidence options."""
+
+import dataclasses
+
+import pandas as pd
+import pytest
+
+from svphaser.phasing._batch import OPTION_PARSERS
+from svphaser.phasing._options import EVIDENCE_FIELDS, EvidenceOptions, evidence_options
+from svphaser.phasing.io import phase_records
+from svphaser.phasing.types import WorkerOpts
+
+
+def test_evidence_fields_cover_worker_opts_and_manifest_columns():
+    assert set(EVIDENCE_FIELDS) == {f.name for f in dataclasses.fields(WorkerOpts)}
+    assert set(EVIDENCE_FIELDS) <= set(OPTION_PARSERS)
+
+
+def test_overrides_apply_on_top_of_base_options():
+    base = EvidenceOptions(min_support=5, gq_bins="30:High")
+    opts = evidence_options(base, min_support=2)
+
+    assert opts == EvidenceOptions(min_support=2, gq_bins="30:High")
+    assert evidence_options(base) is base
+    assert evidence_options() == EvidenceOptions()
+
+
+def test_unknown_option_is_rejected():
+    with pytest.raises(TypeError, match="Unknown options: min_suport"):
+        evidence_options(min_suport=2)
+
+
+def test_pick_ignores_other_keys_and_worker_opts_parses_bins():
+    evidence = EvidenceOptions.pick({"min_support": 4, "gq_bins": "10:Low,30:High", "threads": 2})
+
+    assert evidence == EvidenceOptions(min_support=4, gq_bins="10:Low,30:High")
+    assert evidence.worker_opts().gq_bins == [(30, "High"), (10, "Low")]
+
+
+def test_evidence_object_and_keywords_phase_alike(sv_dataset):
+    by_object = phase_records(
+        sv_dataset.vcf, sv_dataset.bam, evidence=EvidenceOptions(min_support=1), threads=1
+    )
+    by_keyword = phase_records(sv_dataset.vcf, sv_dataset.bam, min_support=1, threads=1)
+
+    pd.testing.assert_frame_equal(by_object, by_keyword)
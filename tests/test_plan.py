@@ -0,0 +1,58 @@
+"""Tests for the ``svphaser plan`` dry-run estimator."""
+
+import json
+
+from typer.testing import CliRunner
+
+from svphaser.cli import app
+from svphaser.phasing._plan import make_plan
+from svphaser.phasing._resources import ResourceLimits
+
+
+def test_plan_reports_workload_and_recommendation(sv_dataset):
+    plan = make_plan(
+        sv_dataset.vcf, sv_dataset.bam, threads=8, limits=ResourceLimits(affinity_cpus=4)
+    )
+
+    assert [r["chrom"] for r in plan["contigs"]] == ["chr1", "chr2"]
+    assert [r["n_svs"] for r in plan["contigs"]] == [4, 3]
+    assert plan["totals"]["n_svs"] == 7
+    assert plan["totals"]["filtered_svs"] == 0
+    assert plan["totals"]["reads_est"] > 0
+    # Two contig tasks: no point asking for more than two processes.
+    assert plan["estimate"]["processes"] == 2
+    assert 1 <= plan["recommendation"]["processes"] <= 2
+    assert plan["recommendation"]["wall_seconds"] <= plan["estimate"]["wall_seconds"] * 1.05
+
+    # One core: extra processes only time-share it.
+    assert (
+        make_plan(
+            sv_dataset.vcf, sv_dataset.bam, threads=8, limits=ResourceLimits(affinity_cpus=1)
+        )["recommendation"]["processes"]
+        == 1
+    )
+
+
+def test_plan_cli_json_and_include(sv_dataset, tmp_path):
+    out = tmp_path / "plan.json"
+    result = CliRunner().invoke(
+        app,
+        [
+            "plan",
+            str(sv_dataset.vcf),
+            str(sv_dataset.bam),
+            "-t",
+            "2",
+            "--json",
+            str(out),
+            "--include",
+            "CHROM == 'chr2'",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "recommended:" in result.output
+
+    plan = json.loads(out.read_text())
+    assert plan["totals"]["n_svs"] == 3
+    assert plan["totals"]["filtered_svs"] == 4
+    assert [r["chrom"] for r in plan["contigs"]] == ["chr2"]
@@ -0,0 +1,92 @@
+"""Tests for svphaser.phasing._preview — sampled preview runs."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from svphaser.cli import app
+from svphaser.phasing._preview import PreviewSample, _allocate, summarize_preview
+from svphaser.phasing._svtable import build_sv_table
+from svphaser.phasing.io import phase_vcf
+
+
+def test_allocation_is_proportional_and_exact():
+    assert _allocate([10, 5, 5], 4) == [2, 1, 1]
+    assert sum(_allocate([3, 3, 3], 5)) == 5
+    assert _allocate([2, 1], 10) == [2, 1]
+
+
+def test_sample_is_deterministic_and_stratified(sv_dataset, worker_opts):
+    table = build_sv_table(sv_dataset.vcf, ["chr1", "chr2"], worker_opts)
+    rows = PreviewSample(n=4).rows(table)
+    assert np.array_equal(rows, PreviewSample(n=4).rows(table))
+    assert len(rows) == 4 and np.all(np.diff(rows) > 0)
+
+    # Two rows from each contig; both SVTYPEs of chr1 are represented.
+    sampled = table.take(rows)
+    assert {c: hi - lo for c, (lo, hi) in sampled.contig_ranges.items()} == {"chr1": 2, "chr2": 2}
+    chr1_types = {sampled.site(i).svtype for i in range(*sampled.contig_ranges["chr1"])}
+    assert chr1_types == {"DEL", "INS"}
+    for new, old in enumerate(rows):
+        assert sampled.site(new) == table.site(int(old))
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"fraction": 0.5, "n": 3}, {"fraction": 1.5}])
+def test_sample_size_must_be_given_once(kwargs):
+    with pytest.raises(ValueError):
+        PreviewSample(**kwargs)
+
+
+def test_preview_reports_on_the_sampled_svs(sv_dataset, tmp_path):
+    phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path / "full", threads=1)
+    phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path / "preview", threads=2, sample_n=7)
+    assert sorted(p.name for p in (tmp_path / "preview").iterdir()) == ["calls_preview.json"]
+    report = json.loads((tmp_path / "preview" / "calls_preview.json").read_text())
+
+    full = pd.concat(
+        pd.read_csv(tmp_path / "full" / name)
+        for name in ("calls_phased.csv", "calls_dropped_svs.csv")
+    )
+    assert report["sample"] == {"fraction": None, "n": 7, "sampled_svs": 7, "total_svs": 7}
+    assert {k: v["n"] for k, v in report["reason"].items()} == full[
+        "reason"
+    ].value_counts().to_dict()
+    assert report["kept_svs"] == (full["support_total"] >= 10).sum()
+    assert report["cost"]["est_full_task_seconds"] > 0
+
+
+def test_unsampled_contigs_use_the_overall_rate():
+    sample = PreviewSample(
+        n=10,
+        totals={"chr1": 100, "chr2": 50},
+        sampled={"chr1": 10, "chr2": 0},
+        timings={"chr1": 2.0},
+    )
+    report = summarize_preview([], sample, threads=2, min_support=10)
+    # chr1: 2 s for 10 of 100 SVs; chr2: 50 SVs at the sample's 0.2 s per SV.
+    assert report["cost"]["est_full_task_seconds"] == 30.0
+    assert report["cost"]["est_full_wall_seconds"] == 20.0
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [["--work-dir", "wd"], ["--max-memory", "1G"], ["--write-manifest"]],
+)
+def test_preview_refuses_full_run_options(sv_dataset, tmp_path, extra):
+    args = [
+        "phase",
+        str(sv_dataset.vcf),
+        str(sv_dataset.bam),
+        "-o",
+        str(tmp_path),
+        "--sample-n",
+        "3",
+    ]
+    result = CliRunner().invoke(app, args + extra, env={"COLUMNS": "200"})
+    assert result.exit_code == 2
+    assert "cannot be combined with --sample-fraction/--sample-n" in result.output
+    with pytest.raises(ValueError, match="Preview sampling cannot be combined"):
+        phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path, sample_n=3, max_memory="1G")
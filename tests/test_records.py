@@ -0,0 +1,31 @@
+"""Tests for the in-memory phasing API."""
+
+import svphaser
+
+
+def test_phase_records_matches_written_csvs(sv_dataset, tmp_path):
+    out_vcf, out_csv = svphaser.phase(
+        sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path, threads=1, min_support=5
+    )
+    df = svphaser.phase_records(sv_dataset.vcf, sv_dataset.bam, threads=2, min_support=5)
+
+    assert list(df["id"]) == [f"sv{i}" for i in range(7)]
+    kept = df[df["kept"]].drop(columns="kept")
+    dropped = df[~df["kept"]].drop(columns="kept")
+    assert kept.to_csv(index=False) == out_csv.read_text()
+    assert dropped.to_csv(index=False) == (tmp_path / "calls_dropped_svs.csv").read_text()
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [out_vcf.name, out_csv.name, "calls_dropped_svs.csv"]
+    )
+
+
+def test_iter_phase_records_yields_each_contig(sv_dataset):
+    ordered = list(svphaser.iter_phase_records(sv_dataset.vcf, sv_dataset.bam, threads=1))
+    assert [chrom for chrom, _df in ordered] == ["chr1", "chr2"]
+    assert [len(df) for _chrom, df in ordered] == [4, 3]
+
+    done = dict(
+        svphaser.iter_phase_records(sv_dataset.vcf, sv_dataset.bam, threads=2, ordered=False)
+    )
+    for chrom, df in ordered:
+        assert done[chrom].equals(df)
@@ -0,0 +1,82 @@
+"""Tests for svphaser.phasing._regions — region parsing and record selection."""
+
+import shutil
+from pathlib import Path
+
+import pysam
+import pytest
+
+from svphaser.phasing._regions import RecordSelection, parse_regions
+from svphaser.phasing.io import phase_vcf
+
+OUTPUTS = ("calls_phased.csv", "calls_dropped_svs.csv")
+
+
+@pytest.fixture(scope="module")
+def indexed_vcf(sv_dataset, tmp_path_factory):
+    copy = tmp_path_factory.mktemp("indexed") / "calls.vcf"
+    shutil.copy(sv_dataset.vcf, copy)
+    return Path(pysam.tabix_index(str(copy), preset="vcf"))
+
+
+def _ids(selection, vcf, chroms=("chr1", "chr2", "chrUn_decoy")):
+    return [rec.ID for rec in selection.records(vcf, chroms)]
+
+
+def test_parse_region_list_and_bed(tmp_path):
+    regions = parse_regions("chr1:101-200, chr1:150-300 chr2")
+    assert regions.intervals("chr1") == [(100, 300)]
+    assert regions.contains("chr2", 39_999)
+    assert not regions.contains("chr1", 300)
+
+    bed = tmp_path / "panel.bed"
+    bed.write_text("track name=panel\nchr1\t100\t300\nchr1\t500\t600\n")
+    assert parse_regions(bed).intervals("chr1") == [(100, 300), (500, 600)]
+
+    with pytest.raises(ValueError, match="Invalid region"):
+        parse_regions("chr1:0-10")
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_selection_pushdown_matches_scan(sv_dataset, indexed_vcf, indexed):
+    vcf = indexed_vcf if indexed else sv_dataset.vcf
+    # Both regions fall inside sv2 (chr1:30001-31201); it must be reported once.
+    include = parse_regions("chr1:30100-30200,chr1:30500-30600,chr1:10001-10001,chr2:20001-20001")
+    exclude = parse_regions("chr2:20801-20801")
+    assert _ids(RecordSelection(include=include), vcf) == ["sv0", "sv2", "sv5"]
+    assert _ids(RecordSelection(include=include, exclude=exclude), vcf) == ["sv0", "sv2"]
+    assert _ids(RecordSelection(chroms=("chr2",)), vcf, ["chr2"]) == ["sv4", "sv5", "sv6"]
+
+
+def test_filter_contigs_rejects_unknown_names():
+    selection = RecordSelection(chroms=("chr2", "chrX"))
+    with pytest.raises(ValueError, match="chrX"):
+        selection.filter_contigs(["chr1", "chr2"])
+    assert RecordSelection(include=parse_regions("chr2")).filter_contigs(["chr1", "chr2"]) == (
+        "chr2",
+    )
+
+
+def test_restricted_run_is_a_subset_of_the_full_run(sv_dataset, indexed_vcf, tmp_path):
+    phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path / "full", threads=1)
+    phase_vcf(
+        indexed_vcf,
+        sv_dataset.bam,
+        out_dir=tmp_path / "part",
+        threads=2,
+        regions="chr1:20001-30001",
+        exclude_regions="chr1:30001-30001",
+        chroms=["chr1"],
+    )
+    for name in OUTPUTS:
+        full = (tmp_path / "full" / name).read_text().splitlines()
+        part = (tmp_path / "part" / name).read_text().splitlines()
+        expected = [full[0]] + [line for line in full[1:] if line.startswith("chr1,20001,")]
+        assert part == expected, name
+
+    body = [
+        line
+        for line in (tmp_path / "part" / "calls_phased.vcf").read_text().splitlines()
+        if not line.startswith("#")
+    ]
+    assert all(line.startswith("chr1\t20001\t") for line in body)
@@ -0,0 +1,52 @@
+"""Tests for svphaser.phasing._resources — cgroup-aware default worker count."""
+
+import logging
+
+from svphaser.phasing._resources import ResourceLimits, default_threads, detect_limits
+
+GIB = 1 << 30
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text + "\n")
+
+
+def test_cgroup_v2_limits_walk_ancestors(tmp_path):
+    root = tmp_path / "cgroup"
+    _write(root / "cgroup.controllers", "cpu memory")
+    _write(root / "kubepods" / "cpu.max", "1600000 100000")
+    _write(root / "kubepods" / "memory.max", "max")
+    _write(root / "kubepods" / "pod1" / "cpu.max", "max 100000")
+    _write(root / "kubepods" / "pod1" / "memory.max", str(4 * GIB))
+    proc = tmp_path / "proc_cgroup"
+    _write(proc, "0::/kubepods/pod1")
+
+    limits = detect_limits(root, proc)
+    assert limits.cpu_quota == 16
+    assert limits.memory_bytes == 4 * GIB
+
+
+def test_cgroup_v1_and_namespaced_paths(tmp_path):
+    root = tmp_path / "cgroup"
+    _write(root / "cpu" / "cpu.cfs_quota_us", "250000")
+    _write(root / "cpu" / "cpu.cfs_period_us", "100000")
+    _write(root / "memory" / "memory.limit_in_bytes", "9223372036854771712")
+    proc = tmp_path / "proc_cgroup"
+    # Paths recorded for the host hierarchy that are not visible in the mount.
+    _write(proc, "4:memory:/slurm/job1\n2:cpu,cpuacct:/slurm/job1")
+
+    limits = detect_limits(root, proc)
+    assert limits.cpu_quota == 2.5
+    assert limits.memory_bytes is None
+
+
+def test_default_threads_caps_by_quota_and_memory(caplog):
+    assert ResourceLimits(affinity_cpus=128).workers() == 128
+    assert ResourceLimits(affinity_cpus=128, cpu_quota=16).workers() == 16
+    assert ResourceLimits(affinity_cpus=128, cpu_quota=0.5).workers() == 1
+    # 2 GiB: the parent's share, then 160 MiB per worker.
+    limits = ResourceLimits(affinity_cpus=128, cpu_quota=16, memory_bytes=2 * GIB)
+    with caplog.at_level(logging.INFO, logger="svphaser.phasing._resources"):
+        assert default_threads(limits) == 11
+    assert "cgroup CPU quota 16 CPUs, memory limit 2048 MiB" in caplog.text
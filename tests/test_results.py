@@ -0,0 +1,73 @@
+"""Tests for the typed worker result buffers in svphaser.phasing._results."""
+
+import pickle
+
+import numpy as np
+
+from svphaser.phasing._results import RESULT_COLUMNS, ResultBuilder
+
+
+def _row(i, gt="0|1", svtype="DEL"):
+    return {
+        "chrom": "chr1",
+        "pos": 1000 + i,
+        "id": f"sv{i}" if i % 2 else None,
+        "svtype": svtype,
+        "svlen": 50,
+        "end": 1050 + i,
+        "alt": "<DEL>",
+        "in_gt": None,
+        "hp1": 3,
+        "hp2": 0,
+        "nohp": 1,
+        "tagged_total": 3,
+        "support_total": 4,
+        "n1": 3,
+        "n2": 0,
+        "gt": gt,
+        "gq": 12,
+        "reason": "MAJOR_HP1",
+        "delta": 0.699999988079071,
+        "tag_frac": 0.75,
+        "mode": "HEURISTIC",
+        "fetch_w": 100,
+        "bp_tol": 100,
+        "rnames_total": 0,
+        "rnames_found": 0,
+    }
+
+
+def test_builder_grows_and_keeps_schema():
+    builder = ResultBuilder(capacity=1)
+    rows = [_row(i, gt="1|0" if i == 2 else "0|1", svtype="INS" if i else "DEL") for i in range(5)]
+    for row in rows:
+        builder.append(**row)
+
+    batch = builder.finish()
+    assert len(batch) == 5
+    assert batch.columns["pos"].dtype == np.int64
+    assert batch.columns["hp1"].dtype == np.int32
+    assert batch.columns["delta"].dtype == np.float64
+    assert batch.categories["gt"] == ("0|1", "1|0")
+
+    df = batch.to_frame()
+    assert list(df.columns) == list(RESULT_COLUMNS)
+    assert df["svtype"].tolist() == ["DEL", "INS", "INS", "INS", "INS"]
+    assert df["gt"].tolist()[2] == "1|0"
+    assert df["id"].isna().tolist() == [True, False, True, False, True]
+    assert df["id"].dropna().tolist() == ["sv1", "sv3"]
+    assert df["delta"].iloc[0] == 0.699999988079071
+
+
+def test_batch_round_trips_through_pickle():
+    builder = ResultBuilder(capacity=3)
+    for i in range(3):
+        builder.append(**_row(i))
+    batch = pickle.loads(pickle.dumps(builder.finish()))
+    assert batch.to_frame()["pos"].tolist() == [1000, 1001, 1002]
+
+
+def test_empty_batch_has_full_schema():
+    df = ResultBuilder().finish().to_frame()
+    assert df.empty
+    assert list(df.columns) == list(RESULT_COLUMNS)
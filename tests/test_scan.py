@@ -0,0 +1,65 @@
+"""Tests for phasing several VCFs against one BAM with a shared read scan."""
+
+import pysam
+import pytest
+
+from svphaser.phasing._scan import ReadScan
+from svphaser.phasing.io import phase_vcf, phase_vcfs
+
+WINDOWS = [(8_000, 9_500), (9_000, 9_500), (9_399, 9_401), (19_000, 21_000), (50_000, 60_000)]
+
+
+def _names(reads):
+    return [r.query_name for r in reads if not (r.is_unmapped or r.is_secondary)]
+
+
+def test_read_scan_matches_direct_fetch(sv_dataset):
+    with pysam.AlignmentFile(str(sv_dataset.bam)) as bam:
+        scan = ReadScan(bam, "chr1", [[w] for w in WINDOWS])
+        for k, (start, stop) in enumerate(WINDOWS):
+            assert _names(scan.fetch("chr1", start, stop)) == _names(bam.fetch("chr1", start, stop))
+            scan.done(k)
+        # The first three windows merge into one interval, decoded once.
+        assert scan.reads_decoded == len(_names(bam.fetch("chr1", 8_000, 9_500))) + len(
+            _names(bam.fetch("chr1", 19_000, 21_000))
+        )
+
+
+def test_read_scan_caps_merged_intervals_on_a_dense_contig(sv_dataset):
+    # Overlapping windows tile the whole contig; merged, they would be one interval.
+    windows = [(start, start + 1_500) for start in range(0, 60_000, 250)]
+    with pysam.AlignmentFile(str(sv_dataset.bam)) as bam:
+        scan = ReadScan(bam, "chr1", [[w] for w in windows], max_span=4_000)
+        assert len(scan._spans) > 1
+        assert max(stop - start for start, stop in scan._spans) <= 4_000
+        assert all(scan._interval(*w) is not None for w in windows)
+        cached = 0
+        for k, (start, stop) in enumerate(windows):
+            assert _names(scan.fetch("chr1", start, stop)) == _names(bam.fetch("chr1", start, stop))
+            cached = max(cached, len(scan._cache))
+            scan.done(k)
+        assert cached == 1 and not scan._cache
+
+
+def test_phase_vcfs_matches_separate_runs(sv_dataset, tmp_path):
+    # A second "caller": the same SVs shifted a few bases, chr2 only.
+    other = tmp_path / "other.vcf"
+    lines = sv_dataset.vcf.read_text().splitlines()
+    shifted = [ln for ln in lines if ln.startswith("#")]
+    for ln in lines:
+        if ln.startswith("chr2"):
+            fields = ln.split("\t")
+            fields[1] = str(int(fields[1]) + 7)
+            shifted.append("\t".join(fields))
+    other.write_text("\n".join(shifted) + "\n")
+
+    phase_vcfs([sv_dataset.vcf, other], sv_dataset.bam, out_dir=tmp_path / "out", threads=2)
+    for vcf in (sv_dataset.vcf, other):
+        phase_vcf(vcf, sv_dataset.bam, out_dir=tmp_path / "ref", threads=1)
+    for stem in ("calls", "other"):
+        for suffix in ("_phased.csv", "_dropped_svs.csv", "_phased.vcf"):
+            name = stem + suffix
+            assert (tmp_path / "out" / name).read_bytes() == (tmp_path / "ref" / name).read_bytes()
+
+    with pytest.raises(ValueError, match="share an output stem"):
+        phase_vcfs([sv_dataset.vcf, sv_dataset.vcf], sv_dataset.bam, out_dir=tmp_path / "x")
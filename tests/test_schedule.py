@@ -0,0 +1,70 @@
+"""Tests for svphaser.phasing._schedule — cost model and longest-first ordering."""
+
+from svphaser.phasing._schedule import (
+    ContigStats,
+    CostModel,
+    load_cost_model,
+    order_longest_first,
+    write_metrics,
+)
+
+
+def _stats(chrom, **counts):
+    n_svs = sum(counts.values())
+    return ContigStats(chrom, n_svs=n_svs, window_bp=1000 * n_svs, svtype_counts=counts)
+
+
+def test_order_longest_first_sorts_by_cost_and_keeps_ties_stable():
+    costs = {"chr1": 5.0, "chr2": 9.0, "chr3": 5.0, "chrM": 0.0}
+    assert order_longest_first(["chr1", "chr2", "chr3", "chrM"], costs) == [
+        "chr2",
+        "chr1",
+        "chr3",
+        "chrM",
+    ]
+
+
+def test_estimate_zero_for_empty_contig():
+    model = CostModel()
+    assert model.estimate(None) == 0.0
+    assert model.estimate(ContigStats("chrUn")) == 0.0
+
+
+def test_estimate_uses_per_type_coefficients_and_read_depth():
+    model = CostModel(per_sv={"DEL": 1.0, "INS": 0.1}, per_window_bp=0.0, per_read=0.0)
+    assert model.estimate(_stats("chr1", DEL=2, INS=10)) == 3.0
+
+    deep = CostModel(per_sv={}, default_per_sv=0.0, per_window_bp=0.0, per_read=1.0)
+    st = _stats("chr1", DEL=1)  # 1000 bp of windows on a 10 kb contig
+    assert deep.estimate(st, mapped=500, length=10_000) == 50.0
+
+
+def test_cost_model_learned_from_metrics_roundtrip(tmp_path):
+    stats = {
+        "chr1": _stats("chr1", DEL=10, INS=0),
+        "chr2": _stats("chr2", DEL=0, INS=10),
+        "chr3": _stats("chr3", DEL=5, INS=5),
+    }
+    # DEL costs 1 s per SV, INS 0.1 s per SV
+    timings = {"chr1": 10.0, "chr2": 1.0, "chr3": 5.5}
+    path = tmp_path / "metrics.tsv"
+    write_metrics(path, timings, stats, read_stats={})
+
+    model = load_cost_model(path)
+    assert abs(model.per_sv["DEL"] - 1.0) < 1e-6
+    assert abs(model.per_sv["INS"] - 0.1) < 1e-6
+    assert model.estimate(stats["chr1"]) > model.estimate(stats["chr2"])
+
+
+def test_contig_stats_from_table(sv_dataset, worker_opts):
+    from svphaser.phasing._schedule import contig_stats
+    from svphaser.phasing._svtable import build_sv_table
+
+    table = build_sv_table(sv_dataset.vcf, ["chr1", "chr2", "chrUn_decoy"], worker_opts)
+    stats = contig_stats(table)
+
+    assert sorted(stats) == ["chr1", "chr2"]
+    assert stats["chr1"].svtype_counts == {"DEL": 2, "INS": 2}
+    assert stats["chr2"].n_svs == 3
+    # DEL with distinct END fetches two windows, INS one.
+    assert stats["chr1"].window_bp > stats["chr2"].window_bp
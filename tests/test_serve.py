@@ -0,0 +1,115 @@
+"""Tests for svphaser.phasing._serve — the local phasing daemon."""
+
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+from conftest import SVS
+
+from svphaser import DEFAULT_GQ_BINS, phase_records
+from svphaser.phasing._options import EvidenceOptions
+from svphaser.phasing._serve import PhasingService, make_server
+
+
+def _locus(i, chrom, pos1, svtype, svlen, hps, with_rnames):
+    locus = {
+        "chrom": chrom,
+        "pos": pos1,
+        "id": f"sv{i}",
+        "svtype": svtype,
+        "svlen": -svlen if svtype == "DEL" else svlen,
+        "end": pos1 + svlen if svtype == "DEL" else pos1,
+        "gt": "0/1",
+    }
+    if with_rnames:
+        locus["rnames"] = [f"{chrom}_{pos1 - 1 - 600}_{k}" for k in range(len(hps))]
+    return locus
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost")
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self._path)
+
+
+def _request(conn, method, path, payload=None):
+    body = None if payload is None else json.dumps(payload)
+    conn.request(method, path, body=body, headers={"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    return resp.status, json.loads(resp.read())
+
+
+@pytest.fixture
+def service(sv_dataset):
+    svc = PhasingService(
+        {"s1": sv_dataset.bam}, EvidenceOptions(gq_bins=DEFAULT_GQ_BINS).worker_opts()
+    )
+    yield svc
+    svc.close()
+
+
+def _serving(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_phase_endpoint_matches_phase_records(sv_dataset, service):
+    server = make_server(service, port=0)
+    _serving(server)
+    try:
+        conn = http.client.HTTPConnection(*server.server_address)
+        status, health = _request(conn, "GET", "/health")
+        assert status == 200 and health["bams"] == {"s1": str(sv_dataset.bam)}
+
+        loci = [_locus(i, *sv) for i, sv in enumerate(SVS)]
+        status, reply = _request(conn, "POST", "/phase", {"bam": "s1", "loci": loci})
+        assert status == 200
+        expected = phase_records(sv_dataset.vcf, sv_dataset.bam, threads=1)
+        got = reply["results"]
+        for col in ("id", "gt", "gq", "n1", "n2", "support_total", "reason", "mode", "kept"):
+            assert [row[col] for row in got] == expected[col].tolist(), col
+
+        status, reply = _request(conn, "POST", "/phase", {"bam": "nope", "loci": loci[:1]})
+        assert status == 400 and "Unknown BAM 'nope'" in reply["error"]
+        status, reply = _request(conn, "POST", "/phase", {"bam": "s1", "loci": [{"pos": 1}]})
+        assert status == 400 and "missing chrom, svtype" in reply["error"]
+        status, _reply = _request(conn, "GET", "/nowhere")
+        assert status == 404
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_unix_socket_server_replaces_stale_socket(tmp_path, service):
+    path = tmp_path / "svphaser.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+
+    server = make_server(service, socket_path=path)
+    _serving(server)
+    try:
+        assert oct(path.stat().st_mode & 0o777) == "0o600"
+        conn = _UnixConnection(str(path))
+        loci = [_locus(0, *SVS[0])]
+        status, reply = _request(conn, "POST", "/phase", {"bam": "s1", "loci": loci})
+        assert status == 200 and reply["results"][0]["gt"] == "1|0"
+        conn.close()
+        with pytest.raises(FileExistsError, match="in use by a running daemon"):
+            make_server(service, socket_path=path)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not path.exists()
+
+    path.write_text("not a socket")
+    with pytest.raises(FileExistsError):
+        make_server(service, socket_path=path)
@@ -0,0 +1,92 @@
+"""Tests for svphaser.phasing._shards — scatter plans and gathering partial outputs."""
+
+import json
+
+import pytest
+
+from svphaser.phasing._shards import gather_shards, load_shard_plan, make_shard_plan
+from svphaser.phasing.io import phase_vcf
+
+OUTPUTS = ("calls_phased.csv", "calls_dropped_svs.csv", "calls_phased.vcf")
+
+
+def _scatter(sv_dataset, tmp_path, n):
+    plan = make_shard_plan(sv_dataset.vcf, n)
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text(plan.to_json())
+    return plan, plan_path
+
+
+def test_plan_is_deterministic_and_covers_every_record(sv_dataset, tmp_path):
+    plan, plan_path = _scatter(sv_dataset, tmp_path, 3)
+    again = make_shard_plan(sv_dataset.vcf, 3)
+
+    assert again == plan
+    assert load_shard_plan(plan_path) == plan
+    assert plan.n_records == 7
+    # 4 chr1 + 3 chr2 records split 2/3/2 at record boundaries.
+    assert [[r[0] for r in regions] for regions in plan.shards] == [
+        ["chr1"],
+        ["chr1", "chr2"],
+        ["chr2"],
+    ]
+
+
+@pytest.mark.parametrize("n_shards", [1, 3, 10])
+def test_gather_matches_single_node_run(sv_dataset, tmp_path, n_shards):
+    single = tmp_path / "single"
+    phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=single, threads=1, min_support=2)
+
+    plan, plan_path = _scatter(sv_dataset, tmp_path, n_shards)
+    partials = tmp_path / "partials"
+    for shard in range(plan.n_shards):
+        phase_vcf(
+            sv_dataset.vcf,
+            sv_dataset.bam,
+            out_dir=partials,
+            threads=1,
+            min_support=2,
+            shard_plan=plan_path,
+            shard=shard,
+        )
+
+    merged = tmp_path / "merged"
+    gather_shards(plan_path, merged, [partials])
+    for name in OUTPUTS:
+        assert (merged / name).read_bytes() == (single / name).read_bytes(), name
+
+
+def test_gather_rejects_incomplete_or_inconsistent_shards(sv_dataset, tmp_path):
+    plan, plan_path = _scatter(sv_dataset, tmp_path, 2)
+    partials = tmp_path / "partials"
+    phase_vcf(
+        sv_dataset.vcf,
+        sv_dataset.bam,
+        out_dir=partials,
+        threads=1,
+        shard_plan=plan_path,
+        shard=0,
+    )
+    with pytest.raises(FileNotFoundError, match=r"\[1\]"):
+        gather_shards(plan_path, tmp_path / "merged", [partials])
+
+    phase_vcf(
+        sv_dataset.vcf,
+        sv_dataset.bam,
+        out_dir=partials,
+        threads=1,
+        min_support=3,
+        shard_plan=plan_path,
+        shard=1,
+    )
+    with pytest.raises(ValueError, match="different parameters"):
+        gather_shards(plan_path, tmp_path / "merged", [partials])
+
+
+def test_tampered_plan_is_rejected(sv_dataset, tmp_path):
+    _plan, plan_path = _scatter(sv_dataset, tmp_path, 2)
+    doc = json.loads(plan_path.read_text())
+    doc["shards"][0][0][2] += 1
+    plan_path.write_text(json.dumps(doc))
+    with pytest.raises(ValueError, match="corrupt"):
+        load_shard_plan(plan_path)
@@ -0,0 +1,127 @@
+"""Tests for bounded-memory runs (svphaser.phasing._spill and --max-memory)."""
+
+import tracemalloc
+
+import pytest
+from cyvcf2 import Reader
+
+import svphaser.phasing.io as io_mod
+from svphaser.phasing._options import EvidenceOptions
+from svphaser.phasing._results import RESULT_COLUMNS, ResultBuilder
+from svphaser.phasing._spill import BatchSpill, ParseSpill, parse_memory_size
+from svphaser.phasing._svtable import attach_table, build_sv_table, shared_table
+
+OUTPUTS = ("calls_phased.csv", "calls_dropped_svs.csv", "calls_phased.vcf")
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [("512", 512), ("4K", 4096), ("1.5G", 3 * 2**29), ("2GiB", 2**31), ("8mb", 8 * 2**20)],
+)
+def test_parse_memory_size(text, expected):
+    assert parse_memory_size(text) == expected
+
+
+def test_parse_memory_size_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_memory_size("lots")
+
+
+def test_batch_spill_keeps_memory_under_budget(tmp_path):
+    row = dict.fromkeys(RESULT_COLUMNS, 0)
+    row.update(chrom="chr1", svtype="DEL", gt="0|1", reason="MAJOR_HP1", mode="HEURISTIC")
+    builder = ResultBuilder()
+    builder.append(**row)
+    batch = builder.finish()
+    spill = BatchSpill(budget=batch.nbytes, spill_dir=tmp_path)
+    spill["chr1"] = batch
+    spill["chr2"] = batch
+    assert len(list(tmp_path.iterdir())) == 1
+    assert "chr1" in spill and "chr2" in spill
+    assert spill.pop("chr2").to_frame().equals(batch.to_frame())
+    assert not list(tmp_path.iterdir())
+
+
+def _parse_spill(vcf, directory, chunk_rows):
+    rdr = Reader(str(vcf))
+    header = rdr.raw_header
+    rdr.close()
+    return ParseSpill(directory, chunk_rows, header)
+
+
+def test_spilled_parse_matches_in_memory_table(sv_dataset, tmp_path):
+    opts = EvidenceOptions().worker_opts()
+    expected = build_sv_table(sv_dataset.vcf, ["chr2", "chr1"], opts)
+    spill = _parse_spill(sv_dataset.vcf, tmp_path, chunk_rows=2)
+    table = build_sv_table(sv_dataset.vcf, ["chr2", "chr1"], opts, spill=spill)
+
+    assert table.contig_ranges == expected.contig_ranges == {"chr2": (0, 3), "chr1": (3, 7)}
+    assert [table.site(i) for i in range(7)] == [expected.site(i) for i in range(7)]
+    # Workers map the table file itself; no chunk files are left behind.
+    with shared_table(table) as ref:
+        assert ref.path == str(spill.table_path)
+        assert attach_table(ref).site(4) == expected.site(4)
+    assert not list(tmp_path.glob("table-*"))
+
+    # The same pass copied each contig's records verbatim for the VCF writer.
+    original = sv_dataset.vcf.read_text().splitlines(keepends=True)
+    assert list(spill.contig_vcfs) == ["chr1", "chr2"]
+    for chrom, path in spill.contig_vcfs.items():
+        records = [ln for ln in original if ln.startswith(f"{chrom}\t")]
+        assert path.read_text() == spill.header + "".join(records)
+
+
+def _write_dense_vcf(path, n, n_rnames):
+    lines = ["##fileformat=VCFv4.2", "##contig=<ID=chr1,length=100000000>"]
+    for key, typ in [("SVTYPE", "String"), ("SVLEN", "Integer"), ("END", "Integer")]:
+        lines.append(f'##INFO=<ID={key},Number=1,Type={typ},Description="{key}">')
+    lines.append('##INFO=<ID=RNAMES,Number=.,Type=String,Description="Supporting reads">')
+    lines.append("#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO")
+    for i in range(n):
+        pos = 1_000 + 100 * i
+        rnames = ",".join(f"m64011_190830_220126/{i}/{k}/ccs" for k in range(n_rnames))
+        info = f"SVTYPE=DEL;SVLEN=-50;END={pos + 50};RNAMES={rnames}"
+        lines.append(f"chr1\t{pos}\tsv{i}\tN\t<DEL>\t60\tPASS\t{info}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_spilled_parse_peak_memory_stays_under_budget(tmp_path):
+    vcf = tmp_path / "dense.vcf"
+    _write_dense_vcf(vcf, n=4_000, n_rnames=40)
+    opts = EvidenceOptions().worker_opts()
+    budget = 2 * 2**20
+
+    def peak(**kwargs):
+        tracemalloc.start()
+        try:
+            table = build_sv_table(vcf, ["chr1"], opts, **kwargs)
+            return table, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    table, bounded = peak(spill=_parse_spill(vcf, tmp_path / "spill", chunk_rows=100))
+    assert table.file_ref is not None
+    assert table.arrays["rnames_data"].nbytes > 2 * budget
+    assert bounded < budget
+    # Unbounded, the same parse holds every site (and its RNAMES) at once.
+    _table, unbounded = peak()
+    assert unbounded > 4 * budget
+
+
+def test_bounded_memory_run_matches_default(sv_dataset, tmp_path, monkeypatch):
+    io_mod.phase_vcf(sv_dataset.vcf, sv_dataset.bam, out_dir=tmp_path / "a", min_support=2)
+
+    # Tiny budget and 2-row chunks exercise spilling and chunked writing.
+    monkeypatch.setattr(io_mod, "_MIN_CHUNK_ROWS", 2)
+    io_mod.phase_vcf(
+        sv_dataset.vcf,
+        sv_dataset.bam,
+        out_dir=tmp_path / "b",
+        min_support=2,
+        threads=2,
+        max_memory="1K",
+    )
+    for name in OUTPUTS:
+        assert (tmp_path / "b" / name).read_bytes() == (tmp_path / "a" / name).read_bytes()
+    # Spill files are gone; only the outputs remain.
+    assert sorted(p.name for p in (tmp_path / "b").iterdir()) == sorted(OUTPUTS)
@@ -0,0 +1,77 @@
+"""Tests for svphaser.phasing._svtable — columnar SV table and shared memory."""
+
+from cyvcf2 import Reader
+
+from svphaser.phasing import _svtable
+from svphaser.phasing._svtable import attach_table, build_sv_table, shared_table
+from svphaser.phasing._workers import _site_from_record
+
+CHROMS = ["chr1", "chr2", "chrUn_decoy"]
+
+
+def test_table_rows_match_record_parsing(sv_dataset, worker_opts):
+    table = build_sv_table(sv_dataset.vcf, CHROMS, worker_opts)
+    expected = [_site_from_record(rec, opts=worker_opts) for rec in Reader(str(sv_dataset.vcf))]
+
+    assert len(table) == len(expected)
+    assert [table.site(i) for i in range(len(table))] == expected
+    assert table.contig_ranges == {"chr1": (0, 4), "chr2": (4, 7)}
+
+
+def test_rnames_dropped_in_heuristic_mode(sv_dataset, worker_opts):
+    from dataclasses import replace
+
+    opts = replace(worker_opts, support_mode="heuristic")
+    table = build_sv_table(sv_dataset.vcf, CHROMS, opts)
+    assert all(not table.site(i).rnames for i in range(len(table)))
+
+
+def test_shared_table_attach_gives_identical_zero_copy_views(sv_dataset, worker_opts):
+    table = build_sv_table(sv_dataset.vcf, CHROMS, worker_opts)
+
+    with shared_table(table) as ref:
+        attached = attach_table(ref)
+        assert attach_table(ref) is attached  # cached per process
+        assert [attached.site(i) for i in range(len(table))] == [
+            table.site(i) for i in range(len(table))
+        ]
+        assert not attached.arrays["pos"].flags.owndata
+
+        shm, _tbl = _svtable._ATTACHED.pop(ref.shm_name)
+        del attached, _tbl
+        shm.close()
+
+
+class _BrokenBam:
+    is_open = True
+
+    def fetch(self, *args, **kwargs):
+        raise OSError("truncated file")
+
+    def close(self):
+        self.is_open = False
+
+
+def test_worker_handles_are_reused_and_reopened(sv_dataset, worker_opts):
+    import os
+
+    from svphaser.phasing import _workers
+
+    table = build_sv_table(sv_dataset.vcf, CHROMS, worker_opts)
+    lo, hi = table.contig_ranges["chr1"]
+    key = (os.getpid(), str(sv_dataset.bam))
+    try:
+        _svtable.init_worker(sv_dataset.bam, table)
+        bam = _workers._BAM_HANDLES[key]
+        _, first, _ = _svtable._phase_table_task("chr1", lo, hi, table, sv_dataset.bam, worker_opts)
+        _svtable._phase_table_task("chr1", lo, hi, table, sv_dataset.bam, worker_opts)
+        assert _workers._BAM_HANDLES[key] is bam and bam.is_open
+
+        # A broken cached handle is discarded and the task retried on a fresh one.
+        _workers._BAM_HANDLES[key] = _BrokenBam()
+        _, again, _ = _svtable._phase_table_task("chr1", lo, hi, table, sv_dataset.bam, worker_opts)
+        assert isinstance(_workers._BAM_HANDLES[key], type(bam))
+        assert again.to_frame().equals(first.to_frame())
+    finally:
+        _workers.discard_worker_bam(sv_dataset.bam)
+    assert key not in _workers._BAM_HANDLES